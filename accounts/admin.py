@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, EmployeeProfile, CustomerProfile, Payroll, Attendance
-from .forms import CustomUserCreationForm, CustomUserChangeForm
+from .models import User, EmployeeProfile, CustomerProfile, Payroll, Attendance, OutboxEmail
+from .forms import CustomAdminPasswordChangeForm, CustomUserCreationForm, CustomUserChangeForm
 
 class EmployeeProfileInline(admin.StackedInline):
     model = EmployeeProfile
@@ -16,6 +16,7 @@ class CustomerProfileInline(admin.StackedInline):
 class CustomUserAdmin(UserAdmin):
     add_form = CustomUserCreationForm
     form = CustomUserChangeForm
+    change_password_form = CustomAdminPasswordChangeForm
     model = User
     
     list_display = ('email', 'username', 'role', 'is_staff', 'is_active')
@@ -49,4 +50,9 @@ class PayrollAdmin(admin.ModelAdmin):
 
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
-    list_display = ('employee', 'date', 'check_in', 'check_out', 'is_late')
\ No newline at end of file
+    list_display = ('employee', 'date', 'check_in', 'check_out', 'is_late')
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
\ No newline at end of file
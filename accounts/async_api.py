@@ -0,0 +1,78 @@
+"""
+Native async GET handlers for the hot read endpoints.
+
+DRF's APIView dispatch is synchronous, so under ASGI an APIView holds a worker
+thread for its whole request. AsyncReadApi is a plain Django view that keeps
+the API contract for GET/HEAD (CachedJWTAuthentication, DRF JSON rendering and
+error bodies) while awaiting the cache and the async ORM. Every other method
+is handed to the DRF view for the same route (`api_class`), which also
+supplies the Swagger docs and routing flags such as `replica_reads`.
+
+urls.py mounts these through `read_view()`: the async variant is only served
+when settings.ASYNC_READ_VIEWS is on (ASYNC_READ_VIEWS=True in the environment
+of ASGI workers); under WSGI it would pay an event loop per request, so the DRF
+view is served unchanged.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import CachedJWTAuthentication
+
+READ_METHODS = ('GET', 'HEAD')
+
+def read_view(async_class):
+    """URL callback for a hot read route: async under ASGI, the DRF view otherwise."""
+    if settings.ASYNC_READ_VIEWS:
+        return async_class.as_view()
+    return async_class.api_class.as_view()
+
+class AsyncReadApi(View):
+    api_class = None  # DRF view for the same route
+    login_required = False  # Mirrors IsAuthenticated on api_class
+    delegate = None  # api_class run in a worker thread; set by as_view()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(delegate=sync_to_async(cls.api_class.as_view()), **initkwargs)
+        # Read by drf_yasg and ReplicaRoutingMiddleware.process_view
+        view.cls = cls.api_class
+        view.initkwargs = {}
+        view.csrf_exempt = True  # As APIView: JWT requests carry no CSRF token
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in READ_METHODS:
+            return await self.delegate(request, *args, **kwargs)
+
+        request = Request(request)
+        try:
+            await self.authenticate(request)
+            return await self.get(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+    async def authenticate(self, request):
+        result = await CachedJWTAuthentication().aauthenticate(request._request)
+        if result is None:
+            if self.login_required:
+                raise exceptions.NotAuthenticated()
+            request.user, request.auth = AnonymousUser(), None
+        else:
+            request.user, request.auth = result
+
+    def render(self, data, status=200):
+        return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+    def handle_exception(self, request, exc):
+        """Same status and body as DRF's exception handler."""
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response['WWW-Authenticate'] = CachedJWTAuthentication().authenticate_header(request)
+        return response
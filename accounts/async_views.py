@@ -0,0 +1,25 @@
+from .async_api import AsyncReadApi
+from .directory import aget_directory
+from .pagination import StandardPagination
+from .responses import cached_json_response
+from .views import EmployeeListCreateApi, employee_listing
+
+class AsyncEmployeeListApi(AsyncReadApi):
+    api_class = EmployeeListCreateApi
+
+    async def get(self, request):
+        paginator = StandardPagination()
+        listing = employee_listing(request, paginator)
+        if listing is None:
+            body, etag = (await aget_directory())['list']
+            return cached_json_response(request, body, etag)
+
+        serializer_class, queryset = listing
+        if paginator.is_requested(request):
+            page = await paginator.apaginate_queryset(queryset, request)
+            serializer = serializer_class(page, many=True)
+            response = paginator.get_paginated_response(serializer.data)
+            return self.render(response.data)
+
+        profiles = [profile async for profile in queryset]
+        return self.render(serializer_class(profiles, many=True).data)
@@ -0,0 +1,100 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance, EmployeeProfile
+from .payroll import bump_preview_version
+from .serializers import AttendanceEventSerializer
+
+def derive_day(punches, shift_start):
+    """First punch is the check-in, last distinct punch the check-out."""
+    check_in = min(punches)
+    check_out = max(punches)
+    return {
+        'check_in': check_in,
+        'check_out': check_out if check_out > check_in else None,
+        'is_late': bool(shift_start and check_in > shift_start),
+    }
+
+def ingest_punches(events):
+    """
+    Upsert a biometric device log of {employee, timestamp} punches.
+    - Validates each row on its own and reports per-row results.
+    - Duplicate punches (same employee and second) are ignored.
+    - Punches are merged with the stored day, so re-uploading a log is a no-op.
+    - All days are written with one bulk upsert inside one transaction.
+    """
+    results = [None] * len(events)
+    day_punches = defaultdict(set)  # (employee_id, date) -> {time}
+    day_rows = defaultdict(list)  # (employee_id, date) -> [row index]
+    seen = set()
+
+    for index, event in enumerate(events):
+        serializer = AttendanceEventSerializer(data=event)
+        if not serializer.is_valid():
+            results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+            continue
+
+        employee_id = serializer.validated_data['employee']
+        punched_at = timezone.localtime(serializer.validated_data['timestamp']).replace(microsecond=0)
+        if (employee_id, punched_at) in seen:
+            results[index] = {'index': index, 'status': 'duplicate'}
+            continue
+        seen.add((employee_id, punched_at))
+
+        key = (employee_id, punched_at.date())
+        day_punches[key].add(punched_at.time())
+        day_rows[key].append(index)
+
+    summary = {'created': 0, 'updated': 0, 'unchanged': 0}
+    employee_ids = {employee_id for employee_id, _ in day_punches}
+    dates = {day for _, day in day_punches}
+
+    with transaction.atomic():
+        shift_starts = dict(
+            EmployeeProfile.objects.filter(id__in=employee_ids).values_list('id', 'shift_start')
+        )
+        existing = {
+            (row.employee_id, row.date): row
+            for row in Attendance.objects.select_for_update().filter(
+                employee_id__in=employee_ids, date__in=dates
+            )
+        }
+
+        upserts = []
+        for key, punches in day_punches.items():
+            employee_id, day = key
+            if employee_id not in shift_starts:
+                for index in day_rows[key]:
+                    results[index] = {'index': index, 'status': 'error', 'errors': {'employee': ['Unknown employee.']}}
+                continue
+
+            current = existing.get(key)
+            if current:
+                punches = punches | {current.check_in} | ({current.check_out} if current.check_out else set())
+            values = derive_day(punches, shift_starts[employee_id])
+
+            if current is None:
+                outcome = 'created'
+            elif (current.check_in, current.check_out, current.is_late) == (values['check_in'], values['check_out'], values['is_late']):
+                outcome = 'unchanged'
+            else:
+                outcome = 'updated'
+            summary[outcome] += 1
+
+            for index in day_rows[key]:
+                results[index] = {'index': index, 'status': 'ok', 'employee': employee_id, 'date': day, 'day': outcome}
+            if outcome != 'unchanged':
+                upserts.append(Attendance(employee_id=employee_id, date=day, **values))
+
+        Attendance.objects.bulk_create(
+            upserts,
+            update_conflicts=True,
+            unique_fields=['employee', 'date'],
+            update_fields=['check_in', 'check_out', 'is_late'],
+        )
+        if upserts:
+            transaction.on_commit(bump_preview_version)  # bulk_create skips signals
+
+    return {**summary, 'results': results}
@@ -0,0 +1,94 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from saloon_core.db_router import anote_authenticated_user, note_authenticated_user, primary_db
+
+from .tokens import TOKEN_VERSION_CLAIM
+
+User = get_user_model()
+
+AUTH_USER_CACHE_KEY = 'auth_user:{user_id}'
+
+def auth_user_cache_key(user_id):
+    return AUTH_USER_CACHE_KEY.format(user_id=user_id)
+
+def invalidate_cached_user(user_id):
+    cache.delete(auth_user_cache_key(user_id))
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves users from a short-TTL cache.
+    - The user is loaded once with employee_profile and customer_profile joined,
+      so cached hits cost no DB queries for auth or profile lookups.
+      The password hash is deferred, so it is never written to the cache.
+    - The token's `ver` claim must match User.token_version (bumped by
+      User.change_password); tokens without the claim count as version 0.
+    - accounts.signals drops the entry whenever the user or a profile is saved.
+    - Reports the user to saloon_core.db_router for read-your-writes pinning.
+    """
+
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        key = auth_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # Primary: a user who just registered may not have replicated yet
+            with primary_db():
+                user = self._load_user(user_id)
+            cache.set(key, user, timeout=getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60))
+
+        self._check_user(user, validated_token)
+        note_authenticated_user(user.pk)
+        return user
+
+    async def aget_user(self, validated_token):
+        """get_user for async views (see accounts.async_api)."""
+        user_id = self._user_id(validated_token)
+        key = auth_user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            with primary_db():
+                user = await sync_to_async(self._load_user)(user_id)
+            await cache.aset(key, user, timeout=getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60))
+
+        self._check_user(user, validated_token)
+        await anote_authenticated_user(user.pk)
+        return user
+
+    async def aauthenticate(self, request):
+        """authenticate() for plain Django async views: (user, token) or None."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def _load_user(self, user_id):
+        try:
+            # The row is cached in the shared cache: leave the password hash out
+            return User.objects.select_related('employee_profile', 'customer_profile').defer('password').get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def _check_user(self, user, validated_token):
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token.get(TOKEN_VERSION_CLAIM, 0) != user.token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
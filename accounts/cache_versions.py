@@ -0,0 +1,17 @@
+from django.core.cache import cache
+
+def get_version(key):
+    """Current value of a cache version counter (starts at 1)."""
+    return cache.get_or_set(key, 1, timeout=None)
+
+def bump_version(key):
+    """Invalidate every entry keyed under the current version."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key evicted or never set: any fresh value invalidates old entries
+        cache.set(key, get_version(key) + 1, timeout=None)
+
+async def aget_version(key):
+    """get_version for async views."""
+    return await cache.aget_or_set(key, 1, timeout=None)
@@ -0,0 +1,65 @@
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+
+from saloon_core.db_router import primary_db
+
+from .cache_versions import get_version, aget_version, bump_version
+from .responses import render_json
+
+# Public stylist directory, rendered once to JSON bytes per version.
+# The version is bumped by accounts.signals whenever a stylist changes,
+# which orphans the old entry instead of deleting it.
+DIRECTORY_VERSION_KEY = 'stylist_directory_version'
+DIRECTORY_TIMEOUT = 60 * 60 * 24
+
+# Fields that, when saved, change what the public directory shows
+PUBLIC_USER_FIELDS = {'username', 'profile_picture', 'profile_picture_variants', 'role'}
+PUBLIC_PROFILE_FIELDS = {
+    'job_title', 'years_of_experience', 'expertise', 'bio', 'rating',
+    'review_count', 'is_available', 'shift_start', 'shift_end',
+}
+
+STAFF_ROLES = ('ADMIN', 'MANAGER', 'EMPLOYEE')
+
+def is_staff_request(request):
+    user = request.user
+    return user.is_authenticated and user.role in STAFF_ROLES
+
+def get_directory_version():
+    return get_version(DIRECTORY_VERSION_KEY)
+
+def bump_directory_version():
+    bump_version(DIRECTORY_VERSION_KEY)
+
+def build_directory():
+    from .models import EmployeeProfile
+    from .serializers import PublicEmployeeSerializer
+
+    profiles = EmployeeProfile.objects.select_related('user').order_by('id')
+    data = PublicEmployeeSerializer(profiles, many=True).data
+    return {
+        'list': render_json(data),
+        'items': {item['id']: render_json(item) for item in data},
+    }
+
+def get_directory():
+    """
+    Returns {'list': (body, etag), 'items': {pk: (body, etag)}}.
+    Cache hits do no database work.
+    """
+    key = f'stylist_directory:{get_directory_version()}'
+    directory = cache.get(key)
+    if directory is None:
+        # A lagging replica must not be snapshotted under the new version
+        with primary_db():
+            directory = build_directory()
+        cache.set(key, directory, timeout=DIRECTORY_TIMEOUT)
+    return directory
+
+async def aget_directory():
+    """get_directory for async views; only a cache miss leaves the event loop."""
+    directory = await cache.aget(f'stylist_directory:{await aget_version(DIRECTORY_VERSION_KEY)}')
+    if directory is None:
+        directory = await sync_to_async(get_directory)()
+    return directory
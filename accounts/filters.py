@@ -0,0 +1,17 @@
+import django_filters
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+class UserFilter(django_filters.FilterSet):
+    """
+    Admin user list filters.
+    ?role=CUSTOMER&verified=true&joined_after=2025-01-01&joined_before=2025-12-31
+    """
+    verified = django_filters.BooleanFilter(field_name='is_email_verified')
+    joined_after = django_filters.DateFilter(field_name='date_joined', lookup_expr='date__gte')
+    joined_before = django_filters.DateFilter(field_name='date_joined', lookup_expr='date__lte')
+
+    class Meta:
+        model = User
+        fields = ['role']
@@ -1,5 +1,5 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm, UserChangeForm
+from django.contrib.auth.forms import AdminPasswordChangeForm, UserCreationForm, UserChangeForm
 from .models import User
 
 class CustomUserCreationForm(UserCreationForm):
@@ -24,4 +24,12 @@ class CustomUserCreationForm(UserCreationForm):
 class CustomUserChangeForm(UserChangeForm):
     class Meta:
         model = User
-        fields = ('email', 'username', 'role', 'phone_number')
\ No newline at end of file
+        fields = ('email', 'username', 'role', 'phone_number')
+class CustomAdminPasswordChangeForm(AdminPasswordChangeForm):
+    """Admin password reset that also revokes the user's issued tokens."""
+
+    def save(self, commit=True):
+        user = super().save(commit=False)
+        if commit:
+            user.save_password()
+        return user
@@ -0,0 +1,117 @@
+import json
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from django.utils.module_loading import import_string
+from google.auth import exceptions, transport
+from google.auth.transport import requests as google_requests
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_OAUTH2_CERTS_URL = 'https://www.googleapis.com/oauth2/v1/certs'
+CERTS_CACHE_KEY = 'google_oauth2_certs'
+REFRESH_LOCK_KEY = 'google_oauth2_certs_refreshing'
+DEFAULT_MAX_AGE = 3600
+REFRESH_MARGIN = 300  # Refresh in the background this many seconds before expiry
+MIN_MAX_AGE = 2 * REFRESH_MARGIN  # Floor for a short or zero max-age, so logins don't refetch every time
+
+def parse_max_age(cache_control):
+    match = re.search(r'max-age=(\d+)', cache_control or '')
+    return int(match.group(1)) if match else DEFAULT_MAX_AGE
+
+def fetch_google_certs(url):
+    """Default fetcher: GET the certs over HTTP. Returns (certs, max_age_seconds)."""
+    response = google_requests.Request()(url, method='GET')
+    if response.status != 200:
+        raise exceptions.TransportError(f"Could not fetch certificates at {url}")
+    certs = json.loads(response.data.decode('utf-8'))
+    return certs, parse_max_age(response.headers.get('cache-control'))
+
+class GoogleCertCache:
+    """
+    Google's signing certificates, shared across workers via the Django cache.
+    - Entries live for the Cache-Control max-age Google sends, but at least
+      MIN_MAX_AGE.
+    - Within REFRESH_MARGIN of expiry, one worker refreshes in the background
+      while everyone keeps serving the cached set.
+    - `fetcher(url) -> (certs, max_age)` is pluggable for tests and local stand-ins.
+    """
+
+    def __init__(self, fetcher=None, cache=default_cache, url=GOOGLE_OAUTH2_CERTS_URL):
+        self.fetcher = fetcher or fetch_google_certs
+        self.cache = cache
+        self.url = url
+        self._refresh_thread = None
+
+    def refresh(self):
+        certs, max_age = self.fetcher(self.url)
+        max_age = max(max_age, MIN_MAX_AGE)
+        entry = {'certs': certs, 'expires_at': time.time() + max_age}
+        self.cache.set(CERTS_CACHE_KEY, entry, timeout=max_age)
+        return certs
+
+    def get_certs(self):
+        entry = self.cache.get(CERTS_CACHE_KEY)
+        now = time.time()
+        if entry is None or entry['expires_at'] <= now:
+            return self.refresh()
+        if entry['expires_at'] - now < REFRESH_MARGIN:
+            self._refresh_in_background()
+        return entry['certs']
+
+    def _refresh_in_background(self):
+        # cache.add is atomic, so only one worker wins the refresh
+        if not self.cache.add(REFRESH_LOCK_KEY, 1, timeout=REFRESH_MARGIN):
+            return
+        self._refresh_thread = threading.Thread(target=self._safe_refresh, daemon=True)
+        self._refresh_thread.start()
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("Background refresh of Google certs failed: %s", e)
+        finally:
+            self.cache.delete(REFRESH_LOCK_KEY)
+
+class _CertsResponse(transport.Response):
+    def __init__(self, certs):
+        self._data = json.dumps(certs).encode('utf-8')
+
+    @property
+    def status(self):
+        return 200
+
+    @property
+    def headers(self):
+        return {'content-type': 'application/json'}
+
+    @property
+    def data(self):
+        return self._data
+
+class CachedCertsRequest(transport.Request):
+    """
+    google-auth transport that answers the certs URL from a GoogleCertCache,
+    so `id_token.verify_oauth2_token` keeps doing all claim checks without
+    an HTTP round trip per login. Other URLs go to the real transport.
+    """
+
+    def __init__(self, cert_cache):
+        self.cert_cache = cert_cache
+
+    def __call__(self, url, method='GET', body=None, headers=None, timeout=None, **kwargs):
+        if method == 'GET' and url == self.cert_cache.url:
+            return _CertsResponse(self.cert_cache.get_certs())
+        return google_requests.Request()(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+def _default_fetcher():
+    path = getattr(settings, 'GOOGLE_CERTS_FETCHER', None)
+    return import_string(path) if path else None
+
+google_cert_cache = GoogleCertCache(fetcher=_default_fetcher())
+google_certs_request = CachedCertsRequest(google_cert_cache)
@@ -0,0 +1,173 @@
+import logging
+import os
+from datetime import timedelta
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+from .models import ImageVariantJob
+
+logger = logging.getLogger(__name__)
+
+# name -> (width, height, crop). Cropped variants fill the box exactly;
+# the others fit inside it and are never upscaled.
+VARIANTS = {
+    'thumb': (128, 128, True),
+    'small': (320, 320, False),
+    'medium': (800, 800, False),
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30
+
+def variants_field(field_name):
+    return f'{field_name}_variants'
+
+def queue_image_variants(instance, field_name, update_fields=None):
+    """
+    Called from post_save: queue a resize job when `field_name` holds an
+    upload whose variants haven't been rendered yet. No query otherwise.
+    """
+    if update_fields is not None and field_name not in update_fields:
+        return
+    image = getattr(instance, field_name)
+    if not image or getattr(instance, variants_field(field_name)).get('source') == image.name:
+        return
+    ImageVariantJob.objects.get_or_create(
+        model_label=instance._meta.label_lower,
+        object_id=instance.pk,
+        field_name=field_name,
+        source=image.name,
+    )
+
+def variant_name(source, variant, extension):
+    directory, filename = os.path.split(source)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}_{variant}.{extension}')
+
+def render_variants(storage, source):
+    """Write every size/format of `source` to storage; returns the variants map."""
+    with storage.open(source) as f:
+        original = ImageOps.exif_transpose(Image.open(f))
+        original.load()
+
+    rendered = {'source': source}
+    for variant, (width, height, crop) in VARIANTS.items():
+        if crop:
+            image = ImageOps.fit(original, (width, height), Image.Resampling.LANCZOS)
+        else:
+            image = original.copy()
+            image.thumbnail((width, height), Image.Resampling.LANCZOS)
+
+        rendered[variant] = {}
+        for extension, (pil_format, options) in FORMATS.items():
+            converted = image.convert('RGBA' if pil_format == 'WEBP' and 'A' in image.getbands() else 'RGB')
+            buffer = BytesIO()
+            converted.save(buffer, pil_format, **options)
+            name = variant_name(source, variant, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            rendered[variant][extension] = storage.save(name, ContentFile(buffer.getvalue()))
+    return rendered
+
+def delete_variants(storage, rendered):
+    for variant, files in rendered.items():
+        if variant != 'source':
+            for name in files.values():
+                storage.delete(name)
+
+def _is_current(model, job):
+    source = model.objects.filter(pk=job.object_id).values_list(job.field_name, flat=True).first()
+    return source == job.source
+
+def _process(job):
+    model = apps.get_model(job.model_label)
+    storage = model._meta.get_field(job.field_name).storage
+    if not _is_current(model, job):
+        return  # Deleted or re-uploaded since queued; a newer job covers it
+    rendered = render_variants(storage, job.source)
+
+    instance = model.objects.select_for_update().filter(pk=job.object_id).first()
+    if instance is None or getattr(instance, job.field_name).name != job.source:
+        # Replaced while rendering: nothing will reference these files
+        delete_variants(storage, rendered)
+        return
+    setattr(instance, variants_field(job.field_name), rendered)
+    # A regular save so the model's signals drop any cached copies
+    instance.save(update_fields=[variants_field(job.field_name)])
+
+def process_image_batch(batch_size=10):
+    """
+    Render up to `batch_size` due jobs.
+    Rows are claimed with SKIP LOCKED so several workers can run side by side.
+    Returns (done, failed) counts for this batch.
+    """
+    now = timezone.now()
+    done = failed = 0
+
+    with transaction.atomic():
+        batch = list(
+            ImageVariantJob.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        for job in batch:
+            try:
+                with transaction.atomic():
+                    _process(job)
+                job.status = 'DONE'
+                job.processed_at = timezone.now()
+                done += 1
+            except Exception as e:
+                logger.warning("Images: job #%s failed: %s", job.pk, e)
+                job.attempts += 1
+                job.last_error = str(e)
+                if job.attempts >= MAX_ATTEMPTS:
+                    job.status = 'FAILED'
+                else:
+                    job.next_attempt_at = now + timedelta(seconds=BACKOFF_BASE_SECONDS * 2 ** (job.attempts - 1))
+                failed += 1
+
+        ImageVariantJob.objects.bulk_update(
+            batch, ['status', 'processed_at', 'attempts', 'last_error', 'next_attempt_at']
+        )
+
+    return done, failed
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only URLs of an image's resized copies: {"thumb": {"webp": url, "jpeg": url}, ...}.
+    Empty until the worker has rendered the current upload, so clients fall
+    back to the original.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.setdefault('source', '*')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        image = getattr(instance, self.image_field)
+        rendered = getattr(instance, variants_field(self.image_field)) or {}
+        if not image or rendered.get('source') != image.name:
+            return {}
+
+        request = self.context.get('request')
+        def url(name):
+            location = image.storage.url(name)
+            return request.build_absolute_uri(location) if request is not None else location
+
+        return {
+            variant: {extension: url(name) for extension, name in files.items()}
+            for variant, files in rendered.items() if variant != 'source'
+        }
@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
+
+from .authentication import auth_user_cache_key
+from .models import CustomerProfile
+
+POINTS_PER_VISIT = 10  # 1 Haircut = 10 Points
+# Highest first; a customer holds the first tier whose threshold they reach
+TIER_THRESHOLDS = (
+    ('Platinum', 500),
+    ('Gold', 200),
+    ('Silver', 0),
+)
+
+def tier_for(points):
+    for tier, threshold in TIER_THRESHOLDS:
+        if points >= threshold:
+            return tier
+    return TIER_THRESHOLDS[-1][0]
+
+def tier_expression(points):
+    """SQL equivalent of tier_for() for a points expression."""
+    return Case(
+        *[When(GreaterThanOrEqual(points, threshold), then=Value(tier)) for tier, threshold in TIER_THRESHOLDS[:-1]],
+        default=Value(TIER_THRESHOLDS[-1][0]),
+    )
+
+def award_visit_points(booking):
+    """
+    Credit a completed booking to its customer in a single UPDATE:
+    points are incremented with F() and the tier is derived from the new
+    total in the same statement, so concurrent completions never lose points.
+    Walk-in guests without an account earn nothing.
+    """
+    if booking.customer_id is None:
+        return
+    new_points = F('points') + POINTS_PER_VISIT
+    updated = CustomerProfile.objects.filter(user_id=booking.customer_id).update(
+        points=new_points, tier=tier_expression(new_points)
+    )
+    if updated:
+        # .update() skips signals; the cached auth user carries the profile
+        key = auth_user_cache_key(booking.customer_id)
+        transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.images import process_image_batch
+
+class Command(BaseCommand):
+    help = "Render resized variants for newly uploaded images."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting when the queue is drained")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds to sleep between polls in --loop mode")
+
+    def handle(self, *args, **options):
+        total_done = total_failed = 0
+        while True:
+            done, failed = process_image_batch(options['batch_size'])
+            total_done += done
+            total_failed += failed
+
+            if done or failed:
+                self.stdout.write(f"Image batch: {done} done, {failed} failed")
+                continue  # Drain the backlog before sleeping
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_done} done, {total_failed} failed"))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import PayrollRun
+from accounts.payroll import ACTIVE_STATUSES, run_payroll
+
+class Command(BaseCommand):
+    help = "Process queued (or resume interrupted) payroll runs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new runs")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to sleep between polls in --loop mode")
+
+    def handle(self, *args, **options):
+        while True:
+            run = PayrollRun.objects.filter(status__in=ACTIVE_STATUSES).order_by('created_at').first()
+            if run:
+                self.stdout.write(f"Processing {run}")
+                try:
+                    run = run_payroll(run)
+                except Exception as e:
+                    self.stderr.write(f"Run {run.pk} failed: {e}")
+                    continue
+                self.stdout.write(self.style.SUCCESS(f"{run}: generated {run.generated} of {run.processed}"))
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import send_outbox_batch
+
+class Command(BaseCommand):
+    help = "Deliver queued transactional emails from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting when the outbox is drained")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds to sleep between polls in --loop mode")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_outbox_batch(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+
+            if sent or failed:
+                self.stdout.write(f"Outbox batch: {sent} sent, {failed} failed")
+                continue  # Drain the backlog before sleeping
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_sent} sent, {total_failed} failed"))
@@ -0,0 +1,39 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Trigram GIN indexes backing accounts.search on PostgreSQL.
+# SQLite (local/test) has no equivalent, so the indexes are skipped there.
+TRIGRAM_INDEXES = [
+    ('accounts_emp_job_title_trgm', 'accounts_employeeprofile', 'job_title'),
+    ('accounts_emp_expertise_trgm', 'accounts_employeeprofile', 'expertise'),
+    ('accounts_emp_bio_trgm', 'accounts_employeeprofile', 'bio'),
+    ('accounts_user_username_trgm', 'accounts_user', 'username'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_alter_user_managers'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped on password change to revoke issued JWTs'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:38
+
+import accounts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendance',
+            name='check_in',
+            field=models.TimeField(default=accounts.models.current_time),
+        ),
+        migrations.AlterField(
+            model_name='attendance',
+            name='date',
+            field=models.DateField(db_index=True, default=accounts.models.current_date),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
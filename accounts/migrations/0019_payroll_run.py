@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_outbox_sending_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payroll',
+            name='run',
+            field=models.ForeignKey(blank=True, help_text='Run that inserted this row', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payrolls', to='accounts.payrollrun'),
+        ),
+    ]
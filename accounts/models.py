@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.utils import timezone
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -37,20 +38,90 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     phone_number = models.CharField(max_length=15, unique=True, null=True, blank=True)
     profile_picture = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies (accounts.images)")
 
     # Auth & Security
     is_email_verified = models.BooleanField(default=False)
     is_first_login_done = models.BooleanField(default=False, help_text="For Admins to force password reset or OTP on first login")
+    token_version = models.PositiveIntegerField(default=0, help_text="Bumped on password change to revoke issued JWTs")
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'phone_number']
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['-date_joined', '-id'], name='user_date_joined_keyset_idx'),  # Keyset pagination of the admin user list
+        ]
+
     def __str__(self):
         return self.email
 
-class EmployeeProfile(models.Model):
+    def change_password(self, raw_password):
+        """
+        Explicit password change or reset: also revokes every issued token.
+        set_password alone doesn't, since login calls it to upgrade the hash.
+        """
+        self.set_password(raw_password)
+        self.save_password()
+
+    def save_password(self):
+        """Persist an already-set password and bump token_version."""
+        self.token_version = models.F('token_version') + 1  # Tokens carrying the old version stop authenticating
+        self.save(update_fields=['password', 'token_version'])
+        self.refresh_from_db(fields=['token_version'])
+
+class DirtyFieldsMixin:
+    """
+    Tracks which concrete fields changed since the row was loaded or saved,
+    so callers can write only those (`save(update_fields=...)`).
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_dirty_fields(self):
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return [f.attname for f in self._meta.concrete_fields if not f.primary_key]
+        return [name for name, value in loaded.items() if getattr(self, name) != value]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        saved = [
+            f.attname for f in self._meta.concrete_fields
+            if update_fields is None or f.name in update_fields or f.attname in update_fields
+        ]
+        loaded = getattr(self, '_loaded_values', None) or {}
+        for name in saved:
+            value = getattr(self, name)
+            if hasattr(value, 'resolve_expression'):
+                loaded.pop(name, None)  # F() results are unknown until reloaded
+            else:
+                loaded[name] = value
+        self._loaded_values = loaded
+
+def attendance_today_prefetch(lookup='attendance'):
+    """
+    Prefetch only today's attendance row onto `attendance_today_list`.
+    `lookup` lets related querysets reach it (e.g. 'employee__attendance').
+    """
+    return models.Prefetch(
+        lookup,
+        queryset=Attendance.objects.filter(date=timezone.now().date()),
+        to_attr='attendance_today_list'
+    )
+
+class EmployeeProfileQuerySet(models.QuerySet):
+    def with_attendance_today(self):
+        return self.prefetch_related(attendance_today_prefetch())
+
+class EmployeeProfile(DirtyFieldsMixin, models.Model):
     """
     Extended Profile for Employees:
     - Linked one-to-one with the User model.
@@ -78,10 +149,12 @@ class EmployeeProfile(models.Model):
     wallet_balance = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, help_text="Accumulated Commission")
     base_salary = models.DecimalField(max_digits=10, decimal_places=2, default=15000.00, help_text="Fixed Monthly Salary")
 
+    objects = EmployeeProfileQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.user.email} - {self.job_title}"
 
-class CustomerProfile(models.Model):
+class CustomerProfile(DirtyFieldsMixin, models.Model):
     """
     Extended Profile for Customers:
     - Default profile logic for regular users.
@@ -101,14 +174,21 @@ class CustomerProfile(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.tier}"
 
+def current_date():
+    return timezone.now().date()
+
+def current_time():
+    return timezone.now().time()
+
 class Attendance(models.Model):
     """
     NEW: Biometric HR & Payroll System
     Tracks daily check-in/check-out for payroll calculation.
+    Defaults (not auto_now_add) so device logs can be ingested for past punches.
     """
     employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='attendance')
-    date = models.DateField(auto_now_add=True, db_index=True)  # Indexed for daily attendance reports
-    check_in = models.TimeField(auto_now_add=True)
+    date = models.DateField(default=current_date, db_index=True)  # Indexed for daily attendance reports
+    check_in = models.TimeField(default=current_time)
     check_out = models.TimeField(null=True, blank=True)
     is_late = models.BooleanField(default=False)
 
@@ -140,9 +220,114 @@ class Payroll(models.Model):
         default='PENDING'
     )
     generated_on = models.DateTimeField(auto_now_add=True)
+    run = models.ForeignKey('PayrollRun', on_delete=models.SET_NULL, null=True, blank=True, related_name='payrolls', help_text="Run that inserted this row")
 
     class Meta:
         unique_together = ('employee', 'month')
 
     def __str__(self):
-        return f"Payroll {self.employee.user.username} - {self.month.strftime('%B %Y')}"
\ No newline at end of file
+        return f"Payroll {self.employee.user.username} - {self.month.strftime('%B %Y')}"
+
+class PayrollRun(models.Model):
+    """
+    One payroll generation job for a month (see accounts.payroll).
+    - Processes employees in id order, chunk by chunk.
+    - `last_employee_id` is committed with each chunk, so an interrupted
+      run resumes where it stopped.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    )
+
+    month = models.DateField(help_text="First day of the month (e.g. 2023-10-01)")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    total_employees = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    generated = models.PositiveIntegerField(default=0)
+    last_employee_id = models.BigIntegerField(default=0, help_text="Resume cursor")
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Payroll run {self.month.strftime('%B %Y')} - {self.status}"
+
+class OutboxEmail(models.Model):
+    """
+    Transactional Email Outbox
+    - Request handlers only insert rows (see accounts.outbox.queue_email).
+    - `manage.py send_outbox` delivers them in batches over one SMTP connection,
+      retrying failures with exponential backoff.
+    - Mail with `expires_at` (one-time codes) is marked FAILED instead of
+      being delivered or retried past that time.
+    - A worker leases rows as SENDING (lease end in `next_attempt_at`) and
+      sends outside any transaction; a lapsed lease makes the row due again.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(help_text="List of recipient addresses")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),  # Worker polls due PENDING/SENDING rows
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+
+class ImageVariantJob(models.Model):
+    """
+    Image Resize Queue
+    - Inserted when an image field gets a new upload (see accounts.images).
+    - `manage.py process_images` renders the variants, so requests never wait
+      on Pillow; failures are retried with exponential backoff.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    model_label = models.CharField(max_length=100, help_text="app_label.model_name")
+    object_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=50)
+    source = models.CharField(max_length=255, help_text="Storage name of the uploaded original")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('model_label', 'object_id', 'field_name', 'source')
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='image_job_due_idx'),  # Worker polls due PENDING rows
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}.{self.field_name} ({self.status})"
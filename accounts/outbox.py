@@ -0,0 +1,118 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30  # 30s, 60s, 120s, 240s between retries
+LEASE_SECONDS = 300  # A SENDING row whose worker died is retried after this
+
+def queue_email(subject, message, recipient_list, from_email=None, max_age=None):
+    """
+    Insert an outbox row; delivery happens in the send_outbox worker.
+    `max_age` (seconds) is for mail that is useless once stale, such as OTPs.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or getattr(settings, 'DEFAULT_FROM_EMAIL', None) or 'noreply@hairways.com',
+        to=list(recipient_list),
+        expires_at=timezone.now() + timedelta(seconds=max_age) if max_age else None,
+    )
+
+def backoff_delay(attempts):
+    return timedelta(seconds=BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+
+def _mark_failed(email, error, now):
+    email.attempts += 1
+    email.last_error = str(error)
+    next_attempt_at = now + backoff_delay(email.attempts)
+    if email.attempts >= MAX_ATTEMPTS or (email.expires_at and next_attempt_at >= email.expires_at):
+        email.status = 'FAILED'
+    else:
+        email.status = 'PENDING'
+        email.next_attempt_at = next_attempt_at
+
+def _expire(email):
+    email.status = 'FAILED'
+    email.last_error = "Expired before delivery"
+
+def _claim(batch_size, now):
+    """
+    Lease up to `batch_size` due emails to this worker in a short transaction.
+    Claimed rows turn SENDING with the lease end in `next_attempt_at`, so rows
+    left SENDING by a crashed worker come due again once the lease runs out.
+    Returns (claimed, expired).
+    """
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['PENDING', 'SENDING'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        claimed, expired = [], []
+        for email in batch:
+            if email.expires_at and email.expires_at <= now:
+                _expire(email)
+                expired.append(email)
+            else:
+                email.status = 'SENDING'
+                email.next_attempt_at = now + timedelta(seconds=LEASE_SECONDS)
+                claimed.append(email)
+        OutboxEmail.objects.bulk_update(batch, ['status', 'last_error', 'next_attempt_at'])
+    return claimed, expired
+
+def send_outbox_batch(batch_size=50):
+    """
+    Deliver up to `batch_size` due emails over a single SMTP connection.
+    Rows are claimed with SKIP LOCKED so several workers can run side by side;
+    sending happens after the claim commits, outside any transaction, and each
+    result is recorded as soon as it is known.
+    Returns (sent, failed) counts for this batch.
+    """
+    now = timezone.now()
+    batch, expired = _claim(batch_size, now)
+    sent, failed = 0, len(expired)
+    if not batch:
+        return sent, failed
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning("Outbox: SMTP connection failed: %s", e)
+        for email in batch:
+            _mark_failed(email, e, now)
+        OutboxEmail.objects.bulk_update(batch, ['attempts', 'last_error', 'status', 'next_attempt_at'])
+        return 0, failed + len(batch)
+
+    try:
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.to,
+                connection=connection,
+            )
+            try:
+                message.send()
+                email.status = 'SENT'
+                email.sent_at = timezone.now()
+                sent += 1
+            except Exception as e:
+                logger.warning("Outbox: sending #%s failed: %s", email.pk, e)
+                _mark_failed(email, e, now)
+                failed += 1
+            email.save(update_fields=['status', 'sent_at', 'attempts', 'last_error', 'next_attempt_at'])
+    finally:
+        connection.close()
+
+    return sent, failed
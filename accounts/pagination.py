@@ -0,0 +1,43 @@
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+
+class StandardPagination(PageNumberPagination):
+    """
+    Opt-in page-number pagination for list endpoints.
+    Views only paginate when the client sends `page` or `page_size`,
+    so existing clients keep receiving plain lists.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def is_requested(self, request):
+        return 'page' in request.query_params or self.page_size_query_param in request.query_params
+
+    async def apaginate_queryset(self, queryset, request):
+        """paginate_queryset for async views: the count and the page use the async ORM."""
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return list(self.page)
+
+class UserCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the user list (newest first).
+    Each page is one indexed range scan, however deep the client pages.
+    """
+    ordering = ('-date_joined', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def is_requested(self, request):
+        return self.cursor_query_param in request.query_params or self.page_size_query_param in request.query_params
+
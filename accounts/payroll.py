@@ -0,0 +1,182 @@
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, Exists, F, FilteredRelation, OuterRef, Q, Value, When
+
+from saloon_core.db_router import primary_db
+
+from .authentication import auth_user_cache_key
+from .cache_versions import get_version, bump_version
+from .models import Attendance, EmployeeProfile, Payroll, PayrollRun
+from .reports import next_month
+
+logger = logging.getLogger(__name__)
+
+LATE_DEDUCTION = Decimal('100')  # Deducted per late arrival in the month
+ACTIVE_STATUSES = ('PENDING', 'RUNNING')
+
+PREVIEW_VERSION_KEY = 'payroll_preview_version'
+PREVIEW_TIMEOUT = 300
+
+def bump_preview_version():
+    bump_version(PREVIEW_VERSION_KEY)
+
+def chunk_size():
+    return getattr(settings, 'PAYROLL_CHUNK_SIZE', 500)
+
+def start_payroll_run(month_start):
+    """Return the month's active run, or queue a new one."""
+    run = PayrollRun.objects.filter(month=month_start, status__in=ACTIVE_STATUSES).first()
+    if run is None:
+        run = PayrollRun.objects.create(month=month_start, total_employees=EmployeeProfile.objects.count())
+    return run
+
+def late_counts(month_start, employee_ids):
+    return dict(
+        Attendance.objects.filter(
+            employee_id__in=employee_ids,
+            date__gte=month_start,
+            date__lt=next_month(month_start),
+            is_late=True,
+        ).values('employee_id').annotate(late=Count('id')).values_list('employee_id', 'late')
+    )
+
+def process_chunk(run_id):
+    """
+    Generate payroll for the next chunk of employees.
+    A fixed number of queries per chunk: lock the run and the chunk's profiles,
+    find existing payrolls, aggregate late counts, bulk insert, read back the
+    rows this run inserted, and pay those wallets out with one CASE update. Returns False once the run is finished.
+    """
+    with transaction.atomic():
+        run = PayrollRun.objects.select_for_update().get(pk=run_id)
+        if run.status not in ACTIVE_STATUSES:
+            return False
+
+        profiles = list(
+            EmployeeProfile.objects.select_for_update()
+            .filter(id__gt=run.last_employee_id)
+            .order_by('id')
+            .values('id', 'user_id', 'base_salary', 'wallet_balance')[:chunk_size()]
+        )
+        if not profiles:
+            run.status = 'COMPLETED'
+            run.save(update_fields=['status', 'updated_at'])
+            return False
+
+        ids = [p['id'] for p in profiles]
+        already_paid = set(
+            Payroll.objects.filter(month=run.month, employee_id__in=ids).values_list('employee_id', flat=True)
+        )
+        lates = late_counts(run.month, ids)
+
+        payrolls = []
+        for profile in profiles:
+            if profile['id'] in already_paid:
+                continue
+            base = profile['base_salary']
+            commission = profile['wallet_balance']  # Unpaid commission is paid out now
+            deductions = lates.get(profile['id'], 0) * LATE_DEDUCTION
+            payrolls.append(Payroll(
+                employee_id=profile['id'],
+                month=run.month,
+                run=run,
+                base_salary=base,
+                commission_earned=commission,
+                deductions=deductions,
+                total_salary=max(0, base + commission - deductions),
+                status='PENDING'
+            ))
+
+        Payroll.objects.bulk_create(payrolls, ignore_conflicts=True)
+        # ignore_conflicts hides skipped rows: count and pay out only the ones this run inserted
+        inserted = set(Payroll.objects.filter(run=run, employee_id__in=ids).values_list('employee_id', flat=True))
+
+        payouts, paid_users = [], []
+        for profile in profiles:
+            commission = profile['wallet_balance']
+            if profile['id'] in inserted and commission:
+                # Subtract what was paid rather than zeroing, keeping any commission earned since the read
+                payouts.append(When(id=profile['id'], then=F('wallet_balance') - Value(commission)))
+                paid_users.append(profile['user_id'])
+
+        if payouts:
+            EmployeeProfile.objects.filter(id__in=ids).update(
+                wallet_balance=Case(*payouts, default=F('wallet_balance'), output_field=DecimalField(max_digits=10, decimal_places=2))
+            )
+            # Bulk updates skip signals; drop cached users carrying stale profiles
+            keys = [auth_user_cache_key(user_id) for user_id in paid_users]
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+        transaction.on_commit(bump_preview_version)
+
+        run.status = 'RUNNING'
+        run.processed += len(profiles)
+        run.generated += len(inserted)
+        run.last_employee_id = ids[-1]
+        run.save(update_fields=['status', 'processed', 'generated', 'last_employee_id', 'updated_at'])
+        return True
+
+def run_payroll(run):
+    """Process a run to completion (inline or from the worker command)."""
+    try:
+        while process_chunk(run.pk):
+            pass
+    except Exception as e:
+        logger.exception("Payroll run %s failed", run.pk)
+        PayrollRun.objects.filter(pk=run.pk).update(status='FAILED', error=str(e))
+        raise
+    run.refresh_from_db()
+    return run
+
+
+def payroll_preview(month_start):
+    """
+    Dry run of generation for a month: nothing is written.
+    One grouped query (late arrivals joined through a FilteredRelation,
+    existing payroll as an EXISTS), cached per month under a version that
+    attendance, commission and payroll changes bump (accounts.signals).
+    """
+    key = f'payroll_preview:{get_version(PREVIEW_VERSION_KEY)}:{month_start:%Y-%m}'
+    preview = cache.get(key)
+    if preview is not None:
+        return preview
+
+    late = Q(attendance__is_late=True, attendance__date__gte=month_start, attendance__date__lt=next_month(month_start))
+    with primary_db():  # Cached under the current version, so it must not lag behind it
+        rows = list(
+            EmployeeProfile.objects
+            .annotate(month_lates=FilteredRelation('attendance', condition=late))
+            .values('id', 'user__username', 'base_salary', 'wallet_balance')
+            .annotate(
+                late_count=Count('month_lates'),
+                already_generated=Exists(Payroll.objects.filter(employee=OuterRef('pk'), month=month_start)),
+            )
+            .order_by('id')
+        )
+
+    employees = []
+    totals = {'base_salary': Decimal('0'), 'commission': Decimal('0'), 'deductions': Decimal('0'), 'total_salary': Decimal('0')}
+    for row in rows:
+        deductions = row['late_count'] * LATE_DEDUCTION
+        entry = {
+            'employee': row['id'],
+            'employee_name': row['user__username'],
+            'base_salary': row['base_salary'],
+            'commission': row['wallet_balance'],
+            'late_count': row['late_count'],
+            'deductions': deductions,
+            'total_salary': max(0, row['base_salary'] + row['wallet_balance'] - deductions),
+            'already_generated': row['already_generated'],
+        }
+        employees.append(entry)
+        if not entry['already_generated']:
+            for field in totals:
+                totals[field] += entry[field]
+
+    preview = {'month': month_start, 'employees': employees, 'totals': totals}
+    cache.set(key, preview, timeout=PREVIEW_TIMEOUT)
+    return preview
@@ -0,0 +1,73 @@
+import csv
+from datetime import datetime, date
+
+from django.db.models import Count, DurationField, ExpressionWrapper, F, FilteredRelation, Q, Sum
+
+from .models import EmployeeProfile
+
+REPORT_COLUMNS = ['employee', 'employee_name', 'days_present', 'late_count', 'missing_checkouts', 'total_hours']
+
+def parse_month(value):
+    """'YYYY-MM' or 'YYYY-MM-DD' -> first day of that month."""
+    for fmt in ('%Y-%m', '%Y-%m-%d'):
+        try:
+            parsed = datetime.strptime(value, fmt).date()
+            return date(parsed.year, parsed.month, 1)
+        except (TypeError, ValueError):
+            continue
+    raise ValueError("Invalid month. Use YYYY-MM")
+
+def next_month(month_start):
+    if month_start.month == 12:
+        return date(month_start.year + 1, 1, 1)
+    return date(month_start.year, month_start.month + 1, 1)
+
+def monthly_attendance_report(month_start):
+    """
+    Per-employee attendance totals for one month, as a single grouped query.
+    The month is applied in the LEFT JOIN (FilteredRelation), so each employee
+    reads only that month's rows via the (employee, date) unique index, and
+    employees with no attendance still appear with zeros.
+    """
+    month = Q(attendance__date__gte=month_start, attendance__date__lt=next_month(month_start))
+    worked = ExpressionWrapper(
+        F('month_attendance__check_out') - F('month_attendance__check_in'), output_field=DurationField()
+    )
+    return (
+        EmployeeProfile.objects
+        .annotate(month_attendance=FilteredRelation('attendance', condition=month))
+        .values('id', 'user__username')
+        .annotate(
+            days_present=Count('month_attendance'),
+            late_count=Count('month_attendance', filter=Q(month_attendance__is_late=True)),
+            missing_checkouts=Count(
+                'month_attendance',
+                filter=Q(month_attendance__id__isnull=False, month_attendance__check_out__isnull=True)
+            ),
+            total_worked=Sum(worked, filter=Q(month_attendance__check_out__isnull=False)),
+        )
+        .order_by('id')
+    )
+
+def report_rows(queryset):
+    for row in queryset.iterator():
+        worked = row['total_worked']
+        yield {
+            'employee': row['id'],
+            'employee_name': row['user__username'],
+            'days_present': row['days_present'],
+            'late_count': row['late_count'],
+            'missing_checkouts': row['missing_checkouts'],
+            'total_hours': round(worked.total_seconds() / 3600, 2) if worked else 0,
+        }
+
+class _Echo:
+    """File-like object whose write() just returns the line, for streaming csv."""
+    def write(self, value):
+        return value
+
+def stream_csv(rows, columns=REPORT_COLUMNS):
+    writer = csv.DictWriter(_Echo(), fieldnames=columns)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,29 @@
+import hashlib
+
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.renderers import JSONRenderer
+
+def render_json(data):
+    """JSON bytes for `data` and the strong ETag cached_json_response serves them with."""
+    body = JSONRenderer().render(data)
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+def cached_json_response(request, body, etag):
+    """
+    Serve pre-rendered JSON bytes with a strong ETag.
+    Returns 304 when the client already holds this version.
+    """
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'  # Clients revalidate via If-None-Match
+    return response
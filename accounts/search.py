@@ -0,0 +1,53 @@
+from functools import reduce
+import operator
+
+from django.db import connections
+from django.db.models import Case, When, Value, IntegerField, Q
+
+# Fields searched for stylists, with their weight in the SQLite ranking
+EMPLOYEE_SEARCH_FIELDS = {
+    'user__username': 3,
+    'job_title': 3,
+    'expertise': 2,
+    'bio': 1,
+}
+
+def search_employees(queryset, query):
+    """
+    Ranked fuzzy search over stylists.
+    - PostgreSQL: trigram word similarity, served by the GIN indexes from
+      migration 0010 (`%>` and ILIKE both use gin_trgm_ops).
+    - Other backends: per-term icontains, ranked by weighted field matches.
+    Results are annotated with `search_rank` and ordered best first.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    if connections[queryset.db].vendor == 'postgresql':
+        return _search_postgres(queryset, query)
+    return _search_fallback(queryset, query)
+
+def _search_postgres(queryset, query):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+    from django.db.models.functions import Greatest
+
+    rank = Greatest(*[TrigramWordSimilarity(query, field) for field in EMPLOYEE_SEARCH_FIELDS])
+    match = reduce(operator.or_, [
+        Q(**{f'{field}__trigram_word_similar': query}) | Q(**{f'{field}__icontains': query})
+        for field in EMPLOYEE_SEARCH_FIELDS
+    ])
+    return queryset.filter(match).annotate(search_rank=rank).order_by('-search_rank', 'id')
+
+def _search_fallback(queryset, query):
+    terms = query.split()
+    rank = reduce(operator.add, [
+        Case(
+            When(**{f'{field}__icontains': term}, then=Value(weight)),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+        for term in terms
+        for field, weight in EMPLOYEE_SEARCH_FIELDS.items()
+    ])
+    return queryset.annotate(search_rank=rank).filter(search_rank__gt=0).order_by('-search_rank', 'id')
@@ -2,7 +2,8 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.db import transaction
-from .models import EmployeeProfile, Attendance, Payroll
+from .models import EmployeeProfile, Attendance, Payroll, PayrollRun
+from .images import ImageVariantsField
 
 User = get_user_model()
 
@@ -15,11 +16,12 @@ class UserSerializer(serializers.ModelSerializer):
     bio = serializers.CharField(source='customer_profile.bio', required=False, allow_blank=True)
     preferences = serializers.CharField(source='customer_profile.preferences', required=False, allow_blank=True)
     birth_date = serializers.DateField(source='customer_profile.birth_date', required=False, allow_null=True)
+    profile_picture_variants = ImageVariantsField('profile_picture')
 
     class Meta:
         model = User
         fields = [
-            'id', 'email', 'username', 'role', 'phone_number', 'profile_picture', 
+            'id', 'email', 'username', 'role', 'phone_number', 'profile_picture', 'profile_picture_variants',
             'face_shape', 'points', 'tier', 'bio', 'preferences', 'birth_date'
         ]
         read_only_fields = ['role', 'points', 'tier']
@@ -33,17 +35,18 @@ class UserSerializer(serializers.ModelSerializer):
                 if isinstance(profile_data_nested, dict):
                     profile_data.update(profile_data_nested)
 
-        # 2. Update User Fields
+        # 2. Update User Fields (only the columns sent)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
 
         # 3. Update CustomerProfile Fields
-        if hasattr(instance, 'customer_profile') and profile_data:
+        if profile_data and hasattr(instance, 'customer_profile'):
             profile = instance.customer_profile
             for attr, value in profile_data.items():
                 setattr(profile, attr, value)
-            profile.save()
+            profile.save(update_fields=list(profile_data))
 
         return instance
 
@@ -64,6 +67,15 @@ class AttendanceSerializer(serializers.ModelSerializer):
         model = Attendance
         fields = '__all__'
 
+class AttendanceEventSerializer(serializers.Serializer):
+    """One punch from a biometric device log."""
+    employee = serializers.IntegerField()
+    timestamp = serializers.DateTimeField()
+
+class AttendanceIngestSerializer(serializers.Serializer):
+    device_id = serializers.CharField(required=False, allow_blank=True)
+    events = serializers.ListField(child=serializers.DictField(), max_length=5000)
+
 class PayrollSerializer(serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.user.username', read_only=True)
     month = serializers.DateField(format="%Y-%m-%d")
@@ -71,6 +83,23 @@ class PayrollSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payroll
         fields = '__all__'
+
+class PayrollRunSerializer(serializers.ModelSerializer):
+    month = serializers.DateField(format="%Y-%m-%d", read_only=True)
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PayrollRun
+        fields = [
+            'id', 'month', 'status', 'total_employees', 'processed', 'generated',
+            'progress', 'error', 'created_at', 'updated_at'
+        ]
+
+    def get_progress(self, obj):
+        if obj.status == 'COMPLETED' or not obj.total_employees:
+            return 100 if obj.status == 'COMPLETED' else 0
+        return min(100, round(obj.processed * 100 / obj.total_employees))
+
 class EmployeeProfileSerializer(serializers.ModelSerializer):
     user_details = UserSerializer(source='user', read_only=True)
     attendance_today = serializers.SerializerMethodField()
@@ -90,8 +119,12 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
         ]
 
     def get_attendance_today(self, obj):
-        today = timezone.now().date()
-        attendance = obj.attendance.filter(date=today).first()
+        # Views that install `attendance_today_prefetch` skip the per-row query
+        if hasattr(obj, 'attendance_today_list'):
+            attendance = obj.attendance_today_list[0] if obj.attendance_today_list else None
+        else:
+            today = timezone.now().date()
+            attendance = obj.attendance.filter(date=today).first()
         return AttendanceSerializer(attendance).data if attendance else None
 
     def update(self, instance, validated_data):
@@ -108,6 +141,22 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+class PublicEmployeeSerializer(serializers.ModelSerializer):
+    """
+    Stylist fields safe for anonymous clients (cached public directory).
+    """
+    username = serializers.CharField(source='user.username', read_only=True)
+    profile_picture = serializers.ImageField(source='user.profile_picture', read_only=True)
+    profile_picture_variants = ImageVariantsField('profile_picture', source='user')
+
+    class Meta:
+        model = EmployeeProfile
+        fields = [
+            'id', 'username', 'profile_picture', 'profile_picture_variants',
+            'job_title', 'years_of_experience', 'expertise', 'bio',
+            'rating', 'review_count', 'is_available', 'shift_start', 'shift_end'
+        ]
+
 # CREATION SERIALIZER
 class EmployeeCreationSerializer(serializers.ModelSerializer):
     username = serializers.CharField(write_only=True)
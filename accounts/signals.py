@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import EmployeeProfile, CustomerProfile
+from django.db import transaction
+from .models import EmployeeProfile, CustomerProfile, Attendance, Payroll
+from .directory import bump_directory_version, PUBLIC_USER_FIELDS, PUBLIC_PROFILE_FIELDS
+from .authentication import invalidate_cached_user
+from .payroll import bump_preview_version
+from .images import queue_image_variants
 
 User = get_user_model()
 
@@ -14,8 +19,82 @@ def create_user_profile(sender, instance, created, **kwargs):
             CustomerProfile.objects.get_or_create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if instance.role == 'EMPLOYEE' and hasattr(instance, 'employee_profile'):
-        instance.employee_profile.save()
-    elif instance.role == 'CUSTOMER' and hasattr(instance, 'customer_profile'):
-        instance.customer_profile.save()
\ No newline at end of file
+def save_user_profile(sender, instance, created, **kwargs):
+    """
+    Persist edits made to the user's already-loaded profile.
+    Profiles that were never loaded can't have changed, so no query is made,
+    and a loaded profile only writes its dirty fields.
+    """
+    if created:
+        return
+    if instance.role == 'EMPLOYEE':
+        descriptor = User.employee_profile
+    elif instance.role == 'CUSTOMER':
+        descriptor = User.customer_profile
+    else:
+        return
+    if not descriptor.is_cached(instance):
+        return
+    profile = descriptor.related.get_cached_value(instance)
+    if profile is None:
+        return
+    dirty = profile.get_dirty_fields()
+    if dirty:
+        profile.save(update_fields=dirty)
+
+# --- PUBLIC DIRECTORY INVALIDATION ---
+
+def _touches(update_fields, public_fields):
+    return update_fields is None or bool(set(update_fields) & public_fields)
+
+@receiver(post_save, sender=EmployeeProfile)
+@receiver(post_delete, sender=EmployeeProfile)
+def invalidate_directory_on_profile_change(sender, instance, **kwargs):
+    if _touches(kwargs.get('update_fields'), PUBLIC_PROFILE_FIELDS):
+        transaction.on_commit(bump_directory_version)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_directory_on_user_change(sender, instance, **kwargs):
+    # Skips customers and last_login-only saves
+    if instance.role == 'EMPLOYEE' and _touches(kwargs.get('update_fields'), PUBLIC_USER_FIELDS):
+        transaction.on_commit(bump_directory_version)
+
+
+# --- AUTH USER CACHE INVALIDATION ---
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_cache_on_user_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+@receiver(post_save, sender=EmployeeProfile)
+@receiver(post_save, sender=CustomerProfile)
+def invalidate_auth_cache_on_profile_change(sender, instance, **kwargs):
+    # The cached user carries its profiles (see CachedJWTAuthentication)
+    invalidate_cached_user(instance.user_id)
+
+
+# --- PAYROLL PREVIEW INVALIDATION ---
+
+PAYROLL_PROFILE_FIELDS = {'wallet_balance', 'base_salary'}
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+@receiver(post_save, sender=Payroll)
+@receiver(post_delete, sender=Payroll)
+def invalidate_preview_on_change(sender, instance, **kwargs):
+    transaction.on_commit(bump_preview_version)
+
+@receiver(post_save, sender=EmployeeProfile)
+@receiver(post_delete, sender=EmployeeProfile)
+def invalidate_preview_on_commission_change(sender, instance, **kwargs):
+    if _touches(kwargs.get('update_fields'), PAYROLL_PROFILE_FIELDS):
+        transaction.on_commit(bump_preview_version)
+
+
+# --- IMAGE VARIANTS ---
+
+@receiver(post_save, sender=User)
+def queue_profile_picture_variants(sender, instance, **kwargs):
+    queue_image_variants(instance, 'profile_picture', kwargs.get('update_fields'))
@@ -0,0 +1,166 @@
+import functools
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_METRICS_KEY = 'throttle_metrics:{scope}'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Refill-and-take on a Redis hash in one server-side step (see take_token).
+# Floats are returned as strings since Redis truncates Lua numbers to integers.
+TOKEN_BUCKET_SCRIPT = """
+local capacity, refill = tonumber(ARGV[1]), tonumber(ARGV[2])
+local now, timeout = tonumber(ARGV[3]), tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill)
+if tokens < 1 then
+    return {0, tostring(tokens)}
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], timeout)
+return {1, tostring(tokens)}
+"""
+_bucket_lock = threading.Lock()
+
+@functools.cache
+def get_redis_client():
+    """
+    redis-py client for settings.REDIS_URL, the server behind the shared cache.
+    Built from redis-py's public API so take_token doesn't depend on the cache
+    backend's internals; one client (and connection pool) per process.
+    """
+    import redis
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+def parse_rate(rate):
+    """'20/min' -> (capacity=20, refill_per_second=20/60)"""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+def record_throttled(scope):
+    key = THROTTLE_METRICS_KEY.format(scope=scope)
+    if not default_cache.add(key, 1, timeout=None):
+        try:
+            default_cache.incr(key)
+        except ValueError:
+            default_cache.set(key, 1, timeout=None)
+
+def get_throttle_metrics(scopes=None):
+    """Throttled-request counters per scope, e.g. {'auth_ip': 12}."""
+    scopes = scopes or api_settings.DEFAULT_THROTTLE_RATES.keys()
+    keys = {THROTTLE_METRICS_KEY.format(scope=scope): scope for scope in scopes}
+    return {keys[key]: count for key, count in default_cache.get_many(keys).items()}
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket stored in the shared cache.
+    - Rate comes from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] under
+      '<view.throttle_scope>_<suffix>' (e.g. 'auth_ip'); unset scopes never throttle.
+    - The bucket holds `capacity` tokens and refills at capacity/period.
+    - Only unsafe methods are metered, so reads on the same view are free.
+    - Buckets are per get_ident_key(): the client IP unless a subclass overrides it.
+    - Refill-and-take is atomic (a Lua script on Redis, a lock on local memory).
+    Runs from the cache alone, so views that set `authentication_classes = []`
+    reject bursts before any password hashing or DB access.
+    """
+    suffix = None
+    cache = default_cache
+    timer = time.time
+
+    def get_ident_key(self, request, view):
+        """Bucket key for this request; None skips throttling. Defaults to the client IP."""
+        return self.get_ident(request)
+
+    def get_scope(self, view):
+        prefix = getattr(view, 'throttle_scope', None)
+        return f'{prefix}_{self.suffix}' if prefix else None
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+
+        self.scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope) if self.scope else None
+        if not rate:
+            return True
+
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        allowed, tokens = self.take_token(f'throttle_bucket:{self.scope}:{ident}', capacity, refill, self.timer())
+        if not allowed:
+            self.wait_seconds = (1 - tokens) / refill
+            record_throttled(self.scope)
+            logger.warning("Throttled %s request on scope %s (%s)", request.method, self.scope, ident)
+            return False
+        return True
+
+    def take_token(self, key, capacity, refill, now):
+        """
+        Refill the bucket and take one token as a single atomic step, so
+        parallel requests can't all read the same bucket and all pass.
+        Returns (allowed, tokens available before taking).
+        """
+        # Idle buckets expire once they would have refilled completely
+        timeout = math.ceil(capacity / refill)
+        if isinstance(self.cache, RedisCache):
+            allowed, tokens = get_redis_client().eval(
+                TOKEN_BUCKET_SCRIPT, 1, self.cache.make_and_validate_key(key), capacity, refill, now, timeout
+            )
+            return bool(allowed), float(tokens)
+
+        # Local-memory cache: buckets live in this process, so a process lock is enough
+        with _bucket_lock:
+            tokens, updated = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill)
+            if tokens < 1:
+                return False, tokens
+            self.cache.set(key, (tokens - 1, now), timeout=timeout)
+            return True, tokens
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+class IPBucketThrottle(TokenBucketThrottle):
+    suffix = 'ip'
+
+class EmailBucketThrottle(TokenBucketThrottle):
+    """Keyed by the submitted email, so one account can't be hammered from many IPs."""
+    suffix = 'email'
+
+    def get_ident_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return str(email).strip().lower() if email else None
+
+class EndpointBucketThrottle(TokenBucketThrottle):
+    """One bucket per view: caps total throughput regardless of client."""
+    suffix = 'endpoint'
+
+    def get_ident_key(self, request, view):
+        return view.__class__.__name__
+
+class UserBucketThrottle(TokenBucketThrottle):
+    suffix = 'user'
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return super().get_ident_key(request, view)
+
+AUTH_THROTTLES = [IPBucketThrottle, EmailBucketThrottle, EndpointBucketThrottle]
+BOOKING_THROTTLES = [UserBucketThrottle, EndpointBucketThrottle]
@@ -0,0 +1,22 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import EmployeeProfile
+
+TOKEN_VERSION_CLAIM = 'ver'
+
+class HairwaysRefreshToken(RefreshToken):
+    """
+    Refresh token carrying role, employee_profile_id and token version claims.
+    Access tokens derived from it copy the same claims.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['role'] = user.role
+        token['employee_profile_id'] = (
+            EmployeeProfile.objects.filter(user=user).values_list('id', flat=True).first()
+            if user.role == 'EMPLOYEE' else None
+        )
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
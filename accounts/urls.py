@@ -1,13 +1,15 @@
 from django.urls import path, include
 from .views import (
     RegisterApi, UserProfileApi, 
-    EmployeeListCreateApi, EmployeeDetailApi,
-    AttendanceListApi, AttendancePunchApi,
-    PayrollListApi, GeneratePayrollApi,
+    EmployeeDetailApi,
+    AttendanceListApi, AttendancePunchApi, AttendanceIngestApi, AttendanceReportApi,
+    PayrollListApi, GeneratePayrollApi, PayrollRunApi, PayrollPreviewApi,
     GoogleLoginApi, UserListApi,
     CustomLoginApi, VerifyRegistrationOTPApi, VerifyAdminLoginOTPApi,
     CustomTokenRefreshView
 )
+from .async_api import read_view
+from .async_views import AsyncEmployeeListApi
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -25,14 +27,18 @@ urlpatterns = [
     path('users/', UserListApi.as_view(), name='user-list'),
         
     # Employees
-    path('employees/', EmployeeListCreateApi.as_view(), name='employee-list'),
+    path('employees/', read_view(AsyncEmployeeListApi), name='employee-list'),
     path('employees/<int:pk>/', EmployeeDetailApi.as_view(), name='employee-detail'),
     
     # Attendance
     path('attendance/', AttendanceListApi.as_view(), name='attendance-list'),
     path('attendance/punch/', AttendancePunchApi.as_view(), name='attendance-punch'),
+    path('attendance/ingest/', AttendanceIngestApi.as_view(), name='attendance-ingest'),
+    path('attendance/report/', AttendanceReportApi.as_view(), name='attendance-report'),
 
     # Payroll
     path('payroll/', PayrollListApi.as_view(), name='payroll-list'),
     path('payroll/generate/', GeneratePayrollApi.as_view(), name='payroll-generate'),
+    path('payroll/runs/<int:pk>/', PayrollRunApi.as_view(), name='payroll-run'),
+    path('payroll/preview/', PayrollPreviewApi.as_view(), name='payroll-preview'),
 ]
\ No newline at end of file
@@ -5,13 +5,14 @@ from django.contrib.auth import get_user_model
 from django.contrib import auth
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from .models import EmployeeProfile, Attendance, Payroll
+from .models import EmployeeProfile, Attendance, Payroll, PayrollRun
 from .serializers import (
     UserSerializer, EmployeeProfileSerializer, AttendanceSerializer, 
     EmployeeCreationSerializer, UserRegistrationSerializer, PayrollSerializer,
-    GoogleLoginSerializer, LoginSerializer, VerifyOTPSerializer
+    GoogleLoginSerializer, LoginSerializer, VerifyOTPSerializer,
+    PublicEmployeeSerializer, AttendanceIngestSerializer, PayrollRunSerializer
 )
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import HairwaysRefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
@@ -20,22 +21,39 @@ from django.db.models import Sum
 from datetime import datetime, date
 from django.conf import settings
 from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from .google_certs import google_certs_request
 from django.utils.crypto import get_random_string
-from django.core.mail import send_mail
+from .outbox import queue_email
+from .attendance import ingest_punches
+from .reports import parse_month, monthly_attendance_report, report_rows, stream_csv
+from .payroll import start_payroll_run, run_payroll, payroll_preview
+from django.http import StreamingHttpResponse
 from django.core.cache import cache
 import random
 import uuid
 
 User = get_user_model()
 from .permissions import IsAdminOrReadOnly, IsEmployeeOwnerOrReadOnly, IsSelfOrAdmin
+from .throttling import AUTH_THROTTLES
 
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from .search import search_employees
+from .pagination import StandardPagination, UserCursorPagination
+from .filters import UserFilter
+from .directory import get_directory, is_staff_request
+from .responses import cached_json_response
+
+OTP_TIMEOUT = 60  # Seconds an emailed OTP stays valid
 
 # --- USER APIS ---
 
 class CustomLoginApi(APIView):
     permission_classes = [permissions.AllowAny]
+    # No authenticators: throttles run before any hashing or DB work
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = 'auth'
 
     @swagger_auto_schema(request_body=LoginSerializer)
     def post(self, request):
@@ -60,7 +78,7 @@ class CustomLoginApi(APIView):
 
         # Role Check
         if user.role == 'EMPLOYEE':
-             refresh = RefreshToken.for_user(user)
+             refresh = HairwaysRefreshToken.for_user(user)
              return Response({
                  "access": str(refresh.access_token),
                  "refresh": str(refresh),
@@ -73,20 +91,16 @@ class CustomLoginApi(APIView):
                  # Generate OTP
                  otp = f"{random.randint(1000, 9999)}"
                  cache_key = f"admin_otp_{user.id}"
-                 cache.set(cache_key, otp, timeout=60)
+                 cache.set(cache_key, otp, timeout=OTP_TIMEOUT)
                  
-                 # Send Email
-                 try:
-                    print(f"DEBUG: Sending Admin OTP {otp} to {user.email}")
-                    send_mail(
-                        subject="Admin Login OTP",
-                        message=f"Your Admin Login OTP is {otp}. Expires in 1 minute.",
-                        from_email='noreply@hairways.com',
-                        recipient_list=[user.email],
-                        fail_silently=False
-                    )
-                 except Exception as e:
-                    print(f"Error sending email: {e}")
+                 # Queue Email (delivered by the send_outbox worker; dropped once the OTP expires)
+                 queue_email(
+                     subject="Admin Login OTP",
+                     message=f"Your Admin Login OTP is {otp}. Expires in 1 minute.",
+                     from_email='noreply@hairways.com',
+                     recipient_list=[user.email],
+                     max_age=OTP_TIMEOUT
+                 )
 
                  return Response({
                      "message": "First login: OTP sent to email.",
@@ -94,7 +108,7 @@ class CustomLoginApi(APIView):
                      "email": user.email
                  }, status=200)
              else:
-                 refresh = RefreshToken.for_user(user)
+                 refresh = HairwaysRefreshToken.for_user(user)
                  return Response({
                      "access": str(refresh.access_token),
                      "refresh": str(refresh),
@@ -106,7 +120,7 @@ class CustomLoginApi(APIView):
              if not user.is_email_verified:
                   return Response({"error": "Email not verified"}, status=403)
              
-             refresh = RefreshToken.for_user(user)
+             refresh = HairwaysRefreshToken.for_user(user)
              return Response({
                  "access": str(refresh.access_token),
                  "refresh": str(refresh),
@@ -129,6 +143,9 @@ class CustomTokenRefreshView(TokenRefreshView):
 
 class VerifyAdminLoginOTPApi(APIView):
     permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = 'auth'
 
 
     @swagger_auto_schema(request_body=VerifyOTPSerializer)
@@ -147,10 +164,10 @@ class VerifyAdminLoginOTPApi(APIView):
 
         if cached_otp and str(cached_otp) == str(otp):
             user.is_first_login_done = True
-            user.save()
+            user.save(update_fields=['is_first_login_done'])
             cache.delete(cache_key)
             
-            refresh = RefreshToken.for_user(user)
+            refresh = HairwaysRefreshToken.for_user(user)
             return Response({
                  "access": str(refresh.access_token),
                  "refresh": str(refresh),
@@ -161,6 +178,9 @@ class VerifyAdminLoginOTPApi(APIView):
 
 class RegisterApi(APIView):
     permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = 'auth'
 
 
     @swagger_auto_schema(request_body=UserRegistrationSerializer)
@@ -171,29 +191,22 @@ class RegisterApi(APIView):
             user = serializer.save()
             user.is_active = False
             user.role = 'CUSTOMER' # Ensure role is set
-            user.save()
+            user.save(update_fields=['is_active', 'role'])
 
             # Generate 4-digit OTP
             otp = f"{random.randint(1000, 9999)}"
             
             # Cache OTP for 1 minute (user_id as key)
             cache_key = f"reg_otp_{user.id}"
-            cache.set(cache_key, otp, timeout=60)
-
-            # Send Email (Console Backend in Dev)
-            try:
-                print(f"DEBUG: Sending OTP {otp} to {user.email}")
-                send_mail(
-                    subject="Verify your HairWays Registration",
-                    message=f"Your OTP is {otp}. It expires in 1 minute.",
-                    from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@hairways.com',
-                    recipient_list=[user.email],
-                    fail_silently=False
-                )
-            except Exception as e:
-                print(f"Error sending email: {e}")
-                # We still return success but maybe warn? 
-                # For now, assume user checks console or email works.
+            cache.set(cache_key, otp, timeout=OTP_TIMEOUT)
+
+            # Queue Email (delivered by the send_outbox worker; dropped once the OTP expires)
+            queue_email(
+                subject="Verify your HairWays Registration",
+                message=f"Your OTP is {otp}. It expires in 1 minute.",
+                recipient_list=[user.email],
+                max_age=OTP_TIMEOUT
+            )
 
             return Response({
                 "user": UserSerializer(user).data,
@@ -203,6 +216,9 @@ class RegisterApi(APIView):
 
 class VerifyRegistrationOTPApi(APIView):
     permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = 'auth'
 
 
     @swagger_auto_schema(request_body=VerifyOTPSerializer)
@@ -230,13 +246,13 @@ class VerifyRegistrationOTPApi(APIView):
         if cached_otp and str(cached_otp) == str(otp):
             user.is_active = True
             user.is_email_verified = True
-            user.save()
+            user.save(update_fields=['is_active', 'is_email_verified'])
             
             # Clear OTP
             cache.delete(cache_key)
 
             # Generate Tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = HairwaysRefreshToken.for_user(user)
 
             return Response({
                 "message": "Verification successful",
@@ -268,28 +284,93 @@ class UserProfileApi(APIView):
 class UserListApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('role', openapi.IN_QUERY, description="ADMIN, MANAGER, EMPLOYEE or CUSTOMER", type=openapi.TYPE_STRING),
+            openapi.Parameter('verified', openapi.IN_QUERY, description="Filter by email verification", type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter('joined_after', openapi.IN_QUERY, description="Joined on or after (YYYY-MM-DD)", type=openapi.TYPE_STRING),
+            openapi.Parameter('joined_before', openapi.IN_QUERY, description="Joined on or before (YYYY-MM-DD)", type=openapi.TYPE_STRING),
+            openapi.Parameter('cursor', openapi.IN_QUERY, description="Keyset cursor (enables pagination)", type=openapi.TYPE_STRING),
+            openapi.Parameter('page_size', openapi.IN_QUERY, description="Results per page (max 200)", type=openapi.TYPE_INTEGER),
+        ]
+    )
     def get(self, request):
         """Admin only: List all users"""
         if request.user.role != 'ADMIN':
             return Response({"error": "Admin only"}, status=status.HTTP_403_FORBIDDEN)
         
-        queryset = User.objects.all().order_by('-date_joined')
+        queryset = User.objects.select_related('customer_profile').order_by('-date_joined', '-id')
+        user_filter = UserFilter(request.query_params, queryset=queryset)
+        if not user_filter.is_valid():
+            return Response(user_filter.errors, status=status.HTTP_400_BAD_REQUEST)
+        queryset = user_filter.qs
+
+        paginator = UserCursorPagination()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = UserSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = UserSerializer(queryset, many=True)
         return Response(serializer.data)
 
 # --- EMPLOYEE APIS ---
 
+def employee_listing(request, paginator):
+    """
+    (serializer_class, queryset) for a live employee listing, or None when the
+    cached public directory answers the request.
+    """
+    search = request.query_params.get('search')
+    staff = is_staff_request(request)
+
+    if not staff and not search and not paginator.is_requested(request):
+        return None
+
+    if staff:
+        serializer_class = EmployeeProfileSerializer
+        queryset = EmployeeProfile.objects.select_related(
+            'user', 'user__customer_profile'
+        ).with_attendance_today()
+    else:
+        serializer_class = PublicEmployeeSerializer
+        queryset = EmployeeProfile.objects.select_related('user')
+    queryset = queryset.order_by('id')
+
+    # Search functionality (ranked, best match first)
+    if search:
+        queryset = search_employees(queryset, search)
+    return serializer_class, queryset
+
 class EmployeeListCreateApi(APIView):
     permission_classes = [IsAdminOrReadOnly] 
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('search', openapi.IN_QUERY, description="Ranked search over name, job title, expertise and bio", type=openapi.TYPE_STRING),
+            openapi.Parameter('page', openapi.IN_QUERY, description="Page number (enables pagination)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page_size', openapi.IN_QUERY, description="Results per page (max 100)", type=openapi.TYPE_INTEGER),
+        ]
+    )
     def get(self, request):
-        queryset = EmployeeProfile.objects.select_related('user').all()
-        # Search functionality
-        search = request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(job_title__icontains=search)
-        
-        serializer = EmployeeProfileSerializer(queryset, many=True)
+        """
+        Staff get full live profiles.
+        Everyone else gets public fields; the plain listing is served from
+        the cached directory (see accounts.directory).
+        """
+        paginator = StandardPagination()
+        listing = employee_listing(request, paginator)
+        if listing is None:
+            body, etag = get_directory()['list']
+            return cached_json_response(request, body, etag)
+
+        serializer_class, queryset = listing
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(queryset, many=True)
         return Response(serializer.data)
 
     def post(self, request):
@@ -310,6 +391,12 @@ class EmployeeDetailApi(APIView):
         return get_object_or_404(EmployeeProfile, pk=pk)
 
     def get(self, request, pk):
+        if not is_staff_request(request):
+            cached = get_directory()['items'].get(pk)
+            if cached is None:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            return cached_json_response(request, *cached)
+
         profile = self.get_object(pk)
         serializer = EmployeeProfileSerializer(profile)
         return Response(serializer.data)
@@ -336,6 +423,14 @@ class EmployeeDetailApi(APIView):
 class AttendanceListApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('employee', openapi.IN_QUERY, description="Filter by employee profile id", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('date_from', openapi.IN_QUERY, description="On or after (YYYY-MM-DD)", type=openapi.TYPE_STRING),
+            openapi.Parameter('date_to', openapi.IN_QUERY, description="On or before (YYYY-MM-DD)", type=openapi.TYPE_STRING),
+            openapi.Parameter('page', openapi.IN_QUERY, description="Page number (enables pagination)", type=openapi.TYPE_INTEGER),
+        ]
+    )
     def get(self, request):
         queryset = Attendance.objects.all().order_by('-date', '-check_in')
         
@@ -343,10 +438,57 @@ class AttendanceListApi(APIView):
         employee_id = request.query_params.get('employee')
         if employee_id:
             queryset = queryset.filter(employee_id=employee_id)
-            
+
+        # Filter by date range
+        try:
+            date_from = request.query_params.get('date_from')
+            if date_from:
+                queryset = queryset.filter(date__gte=datetime.strptime(date_from, '%Y-%m-%d').date())
+            date_to = request.query_params.get('date_to')
+            if date_to:
+                queryset = queryset.filter(date__lte=datetime.strptime(date_to, '%Y-%m-%d').date())
+        except ValueError:
+            return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=400)
+
+        paginator = StandardPagination()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = AttendanceSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = AttendanceSerializer(queryset, many=True)
         return Response(serializer.data)
 
+class AttendanceReportApi(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('month', openapi.IN_QUERY, description="Month (YYYY-MM)", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('export', openapi.IN_QUERY, description="'csv' to stream a CSV file", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request):
+        """
+        Monthly attendance per employee (Admin/Manager):
+        days present, late count, total hours and missing check-outs.
+        """
+        if request.user.role not in ['ADMIN', 'MANAGER']:
+            return Response({"error": "Admin only"}, status=403)
+
+        try:
+            month_start = parse_month(request.query_params.get('month'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        rows = report_rows(monthly_attendance_report(month_start))
+        if request.query_params.get('export') == 'csv':
+            response = StreamingHttpResponse(stream_csv(rows), content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="attendance-{month_start:%Y-%m}.csv"'
+            return response
+
+        return Response({"month": month_start, "employees": list(rows)})
+
 class AttendancePunchApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -379,6 +521,29 @@ class AttendancePunchApi(APIView):
             attendance.save()
             return Response({"status": "Checked Out", "time": now_time})
 
+class AttendanceIngestApi(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(request_body=AttendanceIngestSerializer)
+    def post(self, request):
+        """
+        Bulk upload of biometric device punches (Admin/Manager).
+        Expected JSON:
+        {
+            "device_id": "branch-1-door",
+            "events": [{"employee": 3, "timestamp": "2025-01-01T09:02:11Z"}, ...]
+        }
+        Safe to re-upload: punches already stored leave the day unchanged.
+        """
+        if request.user.role not in ['ADMIN', 'MANAGER']:
+            return Response({"error": "Admin only"}, status=403)
+
+        serializer = AttendanceIngestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(ingest_punches(serializer.validated_data['events']))
+
 # --- PAYROLL APIS ---
 
 class PayrollListApi(APIView):
@@ -400,6 +565,12 @@ class GeneratePayrollApi(APIView):
     permission_classes = [IsAdminOrReadOnly]
 
     def post(self, request):
+        """
+        Generate payroll for a month (set-based, see accounts.payroll).
+        - Up to PAYROLL_INLINE_LIMIT employees: generated in this request.
+        - Larger staff: queued for `manage.py process_payroll_runs`; poll
+          payroll/runs/<id>/ for progress.
+        """
         if request.user.role != 'ADMIN':
             return Response({"error": "Admin only"}, status=403)
 
@@ -408,62 +579,59 @@ class GeneratePayrollApi(APIView):
             return Response({"error": "Month is required (YYYY-MM-DD)"}, status=400)
             
         try:
-            month_date = datetime.strptime(month_str, '%Y-%m-%d').date()
-            # Normalize to first of month
-            month_start = date(month_date.year, month_date.month, 1)
+            month_start = parse_month(month_str)  # Normalized to first of month
         except ValueError:
             return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=400)
 
-        employees = EmployeeProfile.objects.all()
-        generated_count = 0
-
-        with transaction.atomic():
-            for emp in employees:
-                # 1. Check if payroll already exists
-                if Payroll.objects.filter(employee=emp, month=month_start).exists():
-                    continue
-
-                # 2. Calculate Components
-                base = emp.base_salary
-                commission = emp.wallet_balance # Commission Paid Out
-                
-                deductions = 0 
-                # Simple logic: Deduct 100 per late arrival in this month
-                late_count = Attendance.objects.filter(
-                    employee=emp, 
-                    date__year=month_start.year, 
-                    date__month=month_start.month,
-                    is_late=True
-                ).count()
-                deductions = late_count * 100
-
-                # Ensure total is not negative
-                total = max(0, base + commission - deductions)
-
-                # 3. Create Payroll Record
-                Payroll.objects.create(
-                    employee=emp,
-                    month=month_start,
-                    base_salary=base,
-                    commission_earned=commission,
-                    deductions=deductions,
-                    total_salary=total,
-                    status='PENDING'
-                )
-                
-                # 4. Reset Wallet (Commission Paid Out)
-                emp.wallet_balance = 0
-                emp.save()
-                
-                generated_count += 1
+        run = start_payroll_run(month_start)
+        if run.total_employees > getattr(settings, 'PAYROLL_INLINE_LIMIT', 500):
+            return Response({
+                "status": "queued",
+                "run": PayrollRunSerializer(run).data
+            }, status=status.HTTP_202_ACCEPTED)
 
+        run = run_payroll(run)
         return Response({
             "status": "success", 
-            "message": f"Generated payroll for {generated_count} employees for {month_start.strftime('%B %Y')}"
+            "message": f"Generated payroll for {run.generated} employees for {month_start.strftime('%B %Y')}",
+            "run": PayrollRunSerializer(run).data
         })
 
+class PayrollPreviewApi(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('month', openapi.IN_QUERY, description="Month (YYYY-MM)", type=openapi.TYPE_STRING, required=True),
+        ]
+    )
+    def get(self, request):
+        """Dry run of payroll generation for a month (Admin only). Writes nothing."""
+        if request.user.role != 'ADMIN':
+            return Response({"error": "Admin only"}, status=403)
+
+        try:
+            month_start = parse_month(request.query_params.get('month'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(payroll_preview(month_start))
+
+class PayrollRunApi(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        """Progress of a payroll generation run (Admin only)."""
+        if request.user.role != 'ADMIN':
+            return Response({"error": "Admin only"}, status=403)
+        run = get_object_or_404(PayrollRun, pk=pk)
+        return Response(PayrollRunSerializer(run).data)
+
 class GoogleLoginApi(APIView):
     permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = 'auth'
 
 
     @swagger_auto_schema(request_body=GoogleLoginSerializer)
@@ -476,11 +644,10 @@ class GoogleLoginApi(APIView):
         try:
             print(f"DEBUG: Received Google Token: {token[:20]}...")
             
-            # Verify Token
-            # Verify Token
+            # Verify Token (signing certs served from the shared cache)
             id_info = id_token.verify_oauth2_token(
                 token, 
-                google_requests.Request(), 
+                google_certs_request, 
                 settings.GOOGLE_CLIENT_ID,
                 clock_skew_in_seconds=10
             )
@@ -508,7 +675,7 @@ class GoogleLoginApi(APIView):
                 )
 
 
-            refresh = RefreshToken.for_user(user)
+            refresh = HairwaysRefreshToken.for_user(user)
             
             return Response({
                 'refresh': str(refresh),
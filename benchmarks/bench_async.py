@@ -0,0 +1,154 @@
+"""
+Concurrent pollers one ASGI worker sustains: DRF (sync) views vs the async variants.
+
+Runs against a throwaway test database created from the configured settings:
+
+    python benchmarks/bench_async.py --endpoint track --pollers 1 10 50 100 --seconds 5
+
+Each run drives one in-process ASGIHandler (one worker) with N pollers that
+re-request the endpoint as soon as the previous response arrives. "sync"
+mounts the DRF view, which Django runs in a worker thread per request;
+"async" mounts the AsyncReadApi variant (what ASYNC_READ_VIEWS=True serves).
+`pollers@Ns` is throughput x interval: clients polling every N seconds that
+the worker keeps up with at that concurrency.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'saloon_core.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from datetime import time as clock  # noqa: E402
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment  # noqa: E402
+from django.urls import path  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from accounts.async_views import AsyncEmployeeListApi  # noqa: E402
+from accounts.models import User  # noqa: E402
+from accounts.tokens import HairwaysRefreshToken  # noqa: E402
+from bookings.async_views import AsyncBookingTrackApi, AsyncEmployeeDashboardApi  # noqa: E402
+from bookings.models import Booking  # noqa: E402
+from services.async_views import AsyncServiceListApi  # noqa: E402
+from services.models import Category, Service  # noqa: E402
+
+ENDPOINTS = {
+    'track': (AsyncBookingTrackApi, 'track/<int:pk>/'),
+    'dashboard': (AsyncEmployeeDashboardApi, 'dashboard/'),
+    'services': (AsyncServiceListApi, 'services/'),
+    'employees': (AsyncEmployeeListApi, 'employees/'),
+}
+
+def urlconf(async_class, route, use_async):
+    view = async_class.as_view() if use_async else async_class.api_class.as_view()
+    return type('BenchUrls', (), {'urlpatterns': [path(route, view)]})
+
+def seed(queue_length):
+    customer = User.objects.create_user(
+        email='customer@example.com', username='customer', password='bench-password', role='CUSTOMER'
+    )
+    stylist = User.objects.create_user(
+        email='stylist@example.com', username='stylist', password='bench-password', role='EMPLOYEE'
+    )
+    category = Category.objects.create(name='Hair')
+    services = [
+        Service.objects.create(name=f'Service {i}', price=100 + i, duration_minutes=15 + i, category=category)
+        for i in range(20)
+    ]
+    today = timezone.now().date()
+    booking = None
+    for i in range(queue_length):
+        booking = Booking.objects.create(
+            customer=customer, employee=stylist.employee_profile, booking_date=today,
+            booking_time=clock(8 + i // 4, (i % 4) * 15), status='IN_PROGRESS' if i == 0 else 'CONFIRMED',
+        )
+        booking.items.create(service=services[i % len(services)], price=100)
+    return customer, stylist, booking
+
+async def request(app, url, headers):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': url, 'raw_path': url.encode(),
+        'query_string': b'', 'root_path': '', 'headers': headers,
+        'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+    }
+    sent_body = False
+    status = None
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()  # Client stays connected until Django cancels the listener
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await app(scope, receive, send)
+    assert status == 200, status
+
+async def load(app, url, headers, pollers, seconds):
+    timings = []
+    deadline = time.perf_counter() + seconds
+
+    async def poller():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await request(app, url, headers)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(poller() for _ in range(pollers)))
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return len(timings) / elapsed, statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default='track')
+    parser.add_argument('--pollers', type=int, nargs='+', default=[1, 10, 50, 100])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--interval', type=float, default=5, help='Client poll interval for pollers@Ns')
+    parser.add_argument('--queue', type=int, default=12, help='Bookings in the stylist queue')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        cache.clear()
+        customer, stylist, booking = seed(args.queue)
+        async_class, route = ENDPOINTS[args.endpoint]
+        url = '/' + route.replace('<int:pk>', str(booking.pk))
+        user = stylist if args.endpoint == 'dashboard' else customer
+        headers = [
+            (b'host', b'testserver'),
+            (b'authorization', f'Bearer {HairwaysRefreshToken.for_user(user).access_token}'.encode()),
+        ]
+        connection.close()  # Each request thread opens its own
+
+        print(f"endpoint: {url}   {args.seconds:g}s per run")
+        print(f"{'mode':6} {'pollers':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {f'pollers@{args.interval:g}s':>13}")
+        for mode in ('sync', 'async'):
+            with override_settings(ROOT_URLCONF=urlconf(async_class, route, mode == 'async')):
+                app = get_asgi_application()
+                for pollers in args.pollers:
+                    rate, p50, p95 = asyncio.run(load(app, url, headers, pollers, args.seconds))
+                    print(f"{mode:6} {pollers:8d} {rate:9.1f} {p50:9.2f} {p95:9.2f} {rate * args.interval:13.0f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-request authentication cost: the old default stack vs JWT-only.
+
+Runs against a throwaway test database created from the configured settings:
+
+    python benchmarks/bench_auth.py --requests 200
+
+"before" uses the previous REST_FRAMEWORK defaults (JWT + Session + Basic) with
+the Basic header Swagger sent, and plain JWTAuthentication with a Bearer token.
+"after" uses CachedJWTAuthentication, the only scheme on API routes now.
+"""
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'saloon_core.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment  # noqa: E402
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+
+from accounts.authentication import CachedJWTAuthentication  # noqa: E402
+from accounts.models import User  # noqa: E402
+from accounts.tokens import HairwaysRefreshToken  # noqa: E402
+
+LEGACY_STACK = [JWTAuthentication, SessionAuthentication, BasicAuthentication]
+JWT_ONLY = [CachedJWTAuthentication]
+
+def measure(authenticators, header, requests):
+    factory = APIRequestFactory()
+    timings, queries = [], []
+    for _ in range(requests):
+        request = Request(
+            factory.get('/api/v1/accounts/me/', HTTP_AUTHORIZATION=header),
+            authenticators=[cls() for cls in authenticators],
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            user = request.user
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(ctx))
+        assert user.is_authenticated
+    return statistics.mean(timings), statistics.median(timings), statistics.mean(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        cache.clear()
+        user = User.objects.create_user(
+            email='bench@example.com', username='bench', password='bench-password', role='CUSTOMER'
+        )
+        basic = 'Basic ' + base64.b64encode(b'bench@example.com:bench-password').decode()
+        bearer = f'Bearer {HairwaysRefreshToken.for_user(user).access_token}'
+
+        cases = [
+            ('before: Basic header (Swagger)', LEGACY_STACK, basic),
+            ('before: Bearer, uncached JWT', LEGACY_STACK, bearer),
+            ('after:  Bearer, cached JWT', JWT_ONLY, bearer),
+        ]
+        print(f"{'case':34} {'mean ms':>9} {'median ms':>10} {'queries':>8}")
+        for label, authenticators, header in cases:
+            mean, median, queries = measure(authenticators, header, args.requests)
+            print(f"{label:34} {mean:9.3f} {median:10.3f} {queries:8.2f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+if __name__ == '__main__':
+    main()
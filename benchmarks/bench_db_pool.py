@@ -0,0 +1,119 @@
+"""
+Per-request latency with and without database connection reuse.
+
+Runs against a throwaway test database created from the configured settings:
+
+    python benchmarks/bench_db_pool.py --requests 500 --threads 1 8
+
+Each simulated request fires request_started / request_finished around one
+indexed query, so Django opens, reuses or returns connections exactly as it
+does when serving:
+- per-request: CONN_MAX_AGE=0, a new connection (TCP + auth) every request;
+- persistent:  CONN_MAX_AGE=60 with health checks, one connection per thread;
+- pooled:      psycopg ConnectionPool (needs PostgreSQL and psycopg[pool]).
+Connection stats come from saloon_core.db_pool (the saloon_core.db_backend engine).
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'saloon_core.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.signals import request_finished, request_started  # noqa: E402
+from django.db import DEFAULT_DB_ALIAS, connection, connections  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+from saloon_core.db_pool import pool_stats, reset_pool_stats  # noqa: E402
+from services.models import Category, Service  # noqa: E402
+
+def pooling_available():
+    if connection.vendor != 'postgresql':
+        return False
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def configure(mode):
+    """Switch the default alias to `mode` for connections opened from now on."""
+    settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+    close_pool = getattr(connection, 'close_pool', None)
+    if close_pool:
+        close_pool()
+    settings_dict['CONN_HEALTH_CHECKS'] = True
+    settings_dict['CONN_MAX_AGE'] = 60 if mode == 'persistent' else 0
+    options = settings_dict.setdefault('OPTIONS', {})
+    options.pop('pool', None)
+    if mode == 'pooled':
+        options['pool'] = {'min_size': 2, 'max_size': 10, 'timeout': 10}
+
+def serve(requests, timings):
+    for _ in range(requests):
+        start = time.perf_counter()
+        request_started.send(sender=None)
+        Service.objects.filter(is_active=True, category_id=1).exists()
+        request_finished.send(sender=None)
+        timings.append((time.perf_counter() - start) * 1000)
+    connections.close_all()
+
+def run(requests, threads):
+    timings = []
+    workers = [threading.Thread(target=serve, args=(requests // threads, timings)) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return len(timings) / elapsed, statistics.mean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help='Requests per run, split across threads')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8])
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        category = Category.objects.create(name='Hair')
+        Service.objects.bulk_create(
+            Service(name=f'Service {i}', price=100, duration_minutes=30, category=category) for i in range(100)
+        )
+        connections.close_all()
+
+        modes = ['per-request', 'persistent']
+        if pooling_available():
+            modes.append('pooled')
+        else:
+            print('pooled: skipped (needs PostgreSQL and psycopg[pool])')
+
+        print(f"{'mode':12} {'threads':>7} {'req/s':>9} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8}"
+              f" {'connects':>9} {'acquire ms':>11} {'peak use':>9}")
+        for mode in modes:
+            configure(mode)
+            for threads in args.threads:
+                reset_pool_stats()
+                rate, mean, p50, p95 = run(args.requests, threads)
+                stats = pool_stats()[DEFAULT_DB_ALIAS]
+                acquire = stats['acquire_ms']['mean']
+                acquire = f"{acquire:11.3f}" if acquire is not None else f"{'-':>11}"
+                print(f"{mode:12} {threads:7d} {rate:9.1f} {mean:8.3f} {p50:8.3f} {p95:8.3f}"
+                      f" {stats['acquired']:9d} {acquire} {stats['peak_in_use']:9d}")
+        configure('per-request')
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+if __name__ == '__main__':
+    main()
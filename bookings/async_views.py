@@ -0,0 +1,41 @@
+from accounts.async_api import AsyncReadApi
+from .models import Booking
+from .views import (
+    BookingTrackApi, EmployeeDashboardApi,
+    queue_ahead_of, track_payload, dashboard_querysets, dashboard_payload,
+)
+
+class AsyncBookingTrackApi(AsyncReadApi):
+    api_class = BookingTrackApi
+    login_required = True
+
+    async def get(self, request, pk):
+        booking = await Booking.objects.select_related('employee__user').filter(pk=pk).afirst()
+        if booking is None:
+            return self.render({"detail": "No Booking matches the given query."}, status=404)
+
+        if booking.status in ['COMPLETED', 'CANCELLED']:
+            return self.render({"status": booking.status, "message": "Booking is finished/cancelled"})
+
+        if not booking.employee:
+            return self.render({"status": "Unassigned", "message": "Waiting for stylist assignment"})
+
+        queue_ahead = [b async for b in queue_ahead_of(booking)]
+        current_job = await Booking.objects.filter(employee=booking.employee_id, status='IN_PROGRESS').afirst()
+        return self.render(track_payload(booking, queue_ahead, current_job))
+
+class AsyncEmployeeDashboardApi(AsyncReadApi):
+    api_class = EmployeeDashboardApi
+    login_required = True
+
+    async def get(self, request):
+        user = request.user
+        # The authenticated user is loaded with its profiles, so this makes no query
+        if not hasattr(user, 'employee_profile'):
+            return self.render({"error": "Not an employee"}, status=403)
+
+        profile = user.employee_profile
+        completed_totals, pending = dashboard_querysets(profile)
+        completed_totals = [total async for total in completed_totals]
+        pending = [booking async for booking in pending]
+        return self.render(dashboard_payload(user, profile, completed_totals, pending))
@@ -0,0 +1,26 @@
+from django.db.models import Count, F, OuterRef, Subquery
+
+from accounts.loyalty import award_visit_points
+from services.models import Service
+
+from .inventory import consume_stock
+from .models import BookingItem
+from .visits import record_visit
+
+def record_service_popularity(booking):
+    """Add each of the booking's services to its popularity counter in one UPDATE."""
+    items = BookingItem.objects.filter(booking=booking)
+    performed = (
+        items.filter(service=OuterRef('pk'))
+        .values('service')
+        .annotate(times=Count('id'))
+        .values('times')
+    )
+    Service.objects.filter(pk__in=items.values('service')).update(popularity=F('popularity') + Subquery(performed))
+
+def on_booking_completed(booking):
+    """Side effects of a booking moving to COMPLETED (finish_job or an admin PATCH)."""
+    award_visit_points(booking)
+    record_visit(booking)
+    consume_stock(booking)
+    record_service_popularity(booking)
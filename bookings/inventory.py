@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models import Case, F, Sum, Value, When
+
+from services.models import Product, ServiceProduct, StockMovement
+
+def consume_stock(booking):
+    """
+    Take the products used by every item of a completed booking out of stock.
+    Usage is summed from the services' bill of materials in one grouped
+    query. The products are then locked and read, so each takes what it
+    has left (stock is floored at zero rather than failing the job when the
+    books are already off), applied with one set-based conditional UPDATE
+    and logged to the stock ledger with one insert. The ledger records the
+    change actually applied, so it always sums to stock_quantity.
+    Returns rows updated.
+    """
+    usage = dict(
+        ServiceProduct.objects.filter(service__bookingitem__booking=booking)
+        .values_list('product')
+        .annotate(total=Sum('quantity'))
+        .order_by()
+    )
+    if not usage:
+        return 0
+
+    with transaction.atomic():
+        stock = dict(
+            Product.objects.select_for_update().filter(pk__in=usage).order_by('pk')
+            .values_list('pk', 'stock_quantity')
+        )
+        applied = {pk: min(quantity, usage[pk]) for pk, quantity in stock.items()}
+        updated = Product.objects.filter(pk__in=applied).update(
+            stock_quantity=F('stock_quantity') - Case(*[When(pk=pk, then=Value(taken)) for pk, taken in applied.items()])
+        )
+        StockMovement.objects.bulk_create([
+            StockMovement(product_id=pk, change=-taken, reason='CONSUMPTION', reference=f'booking:{booking.pk}')
+            for pk, taken in applied.items() if taken
+        ])
+    return updated
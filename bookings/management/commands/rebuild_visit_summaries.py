@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bookings.visits import rebuild_visit_summaries
+
+class Command(BaseCommand):
+    help = "Rebuild every customer's visit summary from completed bookings."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_visit_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} visit summar{'y' if count == 1 else 'ies'}"))
@@ -0,0 +1,35 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from accounts.authentication import auth_user_cache_key
+from accounts.loyalty import POINTS_PER_VISIT, tier_for
+from accounts.models import CustomerProfile
+from bookings.models import Booking
+
+class Command(BaseCommand):
+    help = "Rebuild every customer's loyalty points and tier from completed bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Profiles written per UPDATE")
+
+    def handle(self, *args, **options):
+        # One grouped aggregation over the whole booking history
+        visits = dict(
+            Booking.objects.filter(status='COMPLETED', customer__isnull=False)
+            .values_list('customer_id')
+            .annotate(visits=Count('id'))
+            .order_by()
+        )
+
+        changed = []
+        for profile in CustomerProfile.objects.only('id', 'user_id', 'points', 'tier').iterator(chunk_size=options['batch_size']):
+            points = visits.get(profile.user_id, 0) * POINTS_PER_VISIT
+            tier = tier_for(points)
+            if (profile.points, profile.tier) != (points, tier):
+                profile.points, profile.tier = points, tier
+                changed.append(profile)
+
+        CustomerProfile.objects.bulk_update(changed, ['points', 'tier'], batch_size=options['batch_size'])
+        cache.delete_many([auth_user_cache_key(profile.user_id) for profile in changed])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed loyalty for {len(changed)} customer(s)"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from bookings.models import BookingItem
+from services.models import Service
+
+class Command(BaseCommand):
+    help = "Rebuild every service's popularity counter from completed bookings."
+
+    def handle(self, *args, **options):
+        # One grouped aggregation over the whole booking history
+        performed = dict(
+            BookingItem.objects.filter(booking__status='COMPLETED')
+            .values_list('service_id')
+            .annotate(times=Count('id'))
+            .order_by()
+        )
+
+        changed = []
+        for service in Service.objects.only('id', 'popularity'):
+            popularity = performed.get(service.id, 0)
+            if service.popularity != popularity:
+                service.popularity = popularity
+                changed.append(service)
+
+        # bulk_update skips signals: popularity is not part of the cached catalog
+        Service.objects.bulk_update(changed, ['popularity'], batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(f"Recomputed popularity for {len(changed)} service(s)"))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_payrollrun'),
+        ('bookings', '0006_alter_booking_unique_together'),
+        ('services', '0004_alter_service_name_alter_product_unique_together'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerVisitSummary',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='visit_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('visit_count', models.PositiveIntegerField(default=0)),
+                ('lifetime_spend', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('last_visit', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['customer', '-booking_date', '-booking_time', '-id'], name='booking_customer_history_idx'),
+        ),
+        migrations.AddField(
+            model_name='customervisitsummary',
+            name='favorite_service',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='services.service'),
+        ),
+        migrations.AddField(
+            model_name='customervisitsummary',
+            name='favorite_stylist',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.employeeprofile'),
+        ),
+    ]
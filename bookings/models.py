@@ -47,6 +47,10 @@ class Booking(models.Model):
             ('booking_date', 'token_number'),
             ('employee', 'booking_date', 'booking_time')  # Prevent double-booking: An employee cannot have two bookings at the same time
         ]
+        indexes = [
+            # Customer visit history, newest first (keyset paginated)
+            models.Index(fields=['customer', '-booking_date', '-booking_time', '-id'], name='booking_customer_history_idx'),
+        ]
 
     def __str__(self):
         return f"Token #{self.token_number} - {self.status}"
@@ -57,4 +61,21 @@ class BookingItem(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
 
     def __str__(self):
-        return f"{self.service.name} for Token #{self.booking.token_number}"
\ No newline at end of file
+        return f"{self.service.name} for Token #{self.booking.token_number}"
+
+class CustomerVisitSummary(models.Model):
+    """
+    Denormalized visit stats for a customer's profile screen.
+    Maintained by bookings.visits when a booking is completed, so reading it
+    is a single primary-key lookup instead of a scan of the booking history.
+    """
+    customer = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='visit_summary')
+    visit_count = models.PositiveIntegerField(default=0)
+    lifetime_spend = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    last_visit = models.DateField(null=True, blank=True)
+    favorite_stylist = models.ForeignKey(EmployeeProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    favorite_service = models.ForeignKey(Service, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.customer.email} - {self.visit_count} visits"
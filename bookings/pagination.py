@@ -0,0 +1,8 @@
+from rest_framework.pagination import CursorPagination
+
+class VisitHistoryPagination(CursorPagination):
+    """Keyset pagination for a customer's bookings (newest first), backed by booking_customer_history_idx."""
+    ordering = ('-booking_date', '-booking_time', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,7 +1,8 @@
 from rest_framework import serializers
-from .models import Booking, BookingItem, BarberQueue
+from .models import Booking, BookingItem, BarberQueue, CustomerVisitSummary
 from services.models import Service
 from accounts.serializers import UserSerializer, EmployeeProfileSerializer
+from accounts.images import ImageVariantsField
 from datetime import datetime, timedelta, date
 
 class BookingItemSerializer(serializers.ModelSerializer):
@@ -113,7 +114,29 @@ class BookingSerializer(serializers.ModelSerializer):
 class BarberQueueSerializer(serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.user.username', read_only=True)
     employee_image = serializers.ImageField(source='employee.user.profile_picture', read_only=True)
+    employee_image_variants = ImageVariantsField('profile_picture', source='employee.user')
     
     class Meta:
         model = BarberQueue
-        fields = ['id', 'employee', 'employee_name', 'employee_image', 'joined_at']
\ No newline at end of file
+        fields = ['id', 'employee', 'employee_name', 'employee_image', 'employee_image_variants', 'joined_at']
+
+class CustomerVisitSummarySerializer(serializers.ModelSerializer):
+    favorite_stylist_name = serializers.CharField(source='favorite_stylist.user.username', read_only=True, default=None)
+    favorite_service_name = serializers.CharField(source='favorite_service.name', read_only=True, default=None)
+
+    class Meta:
+        model = CustomerVisitSummary
+        fields = [
+            'visit_count', 'lifetime_spend', 'last_visit',
+            'favorite_stylist', 'favorite_stylist_name',
+            'favorite_service', 'favorite_service_name',
+        ]
+
+class VisitHistorySerializer(serializers.ModelSerializer):
+    """Compact booking row for the customer's history screen."""
+    items = BookingItemSerializer(many=True, read_only=True)
+    employee_name = serializers.CharField(source='employee.user.username', read_only=True, default=None)
+
+    class Meta:
+        model = Booking
+        fields = ['id', 'token_number', 'booking_date', 'booking_time', 'status', 'total_price', 'employee', 'employee_name', 'items']
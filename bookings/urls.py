@@ -1,9 +1,11 @@
 from django.urls import path
+from accounts.async_api import read_view
 from .views import (
     BookingListCreateApi, BookingDetailApi, BookingCancelApi, 
     BookingRescheduleApi, StartJobApi, FinishJobApi, 
-    BookingTrackApi, EmployeeDashboardApi, AdminStatsApi
+    CustomerHistoryApi, AdminStatsApi
 )
+from .async_views import AsyncBookingTrackApi, AsyncEmployeeDashboardApi
 
 urlpatterns = [
     # Core Booking CRUD
@@ -13,12 +15,13 @@ urlpatterns = [
     # Actions
     path('bookings/<int:pk>/cancel/', BookingCancelApi.as_view(), name='booking-cancel'),
     path('bookings/<int:pk>/reschedule/', BookingRescheduleApi.as_view(), name='booking-reschedule'),
-    path('bookings/<int:pk>/track/', BookingTrackApi.as_view(), name='booking-track'),
+    path('bookings/<int:pk>/track/', read_view(AsyncBookingTrackApi), name='booking-track'),
+    path('bookings/history/', CustomerHistoryApi.as_view(), name='customer-history'),
     
     # Employee Operations
     path('bookings/<int:pk>/start_job/', StartJobApi.as_view(), name='start-job'),
     path('bookings/<int:pk>/finish_job/', FinishJobApi.as_view(), name='finish-job'),
-    path('employee/dashboard/', EmployeeDashboardApi.as_view(), name='employee-dashboard'),
+    path('employee/dashboard/', read_view(AsyncEmployeeDashboardApi), name='employee-dashboard'),
 
     # Admin
     path('admin/stats/', AdminStatsApi.as_view(), name='admin-stats'),
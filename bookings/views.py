@@ -6,8 +6,12 @@ from django.utils import timezone
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from datetime import datetime, date, timedelta
-from .models import Booking, BookingItem
-from .serializers import BookingSerializer
+from accounts.models import attendance_today_prefetch
+from accounts.throttling import BOOKING_THROTTLES
+from .models import Booking, BookingItem, CustomerVisitSummary
+from .pagination import VisitHistoryPagination
+from .serializers import BookingSerializer, CustomerVisitSummarySerializer, VisitHistorySerializer
+from .completion import on_booking_completed
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
@@ -15,6 +19,8 @@ from drf_yasg import openapi
 
 class BookingListCreateApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = BOOKING_THROTTLES  # Metered on POST only
+    throttle_scope = 'booking'
 
     @swagger_auto_schema(
         manual_parameters=[
@@ -30,9 +36,11 @@ class BookingListCreateApi(APIView):
         - Filter by ?date=YYYY-MM-DD
         """
         queryset = Booking.objects.select_related(
-            'customer', 'employee', 'employee__user'
+            'customer', 'customer__customer_profile',
+            'employee', 'employee__user', 'employee__user__customer_profile'
         ).prefetch_related(
-            'items__service'
+            'items__service',
+            attendance_today_prefetch('employee__attendance')
         ).order_by('-booking_date', '-booking_time')
 
         date_param = request.query_params.get('date')
@@ -92,8 +100,9 @@ class BookingListCreateApi(APIView):
 class BookingDetailApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_object(self, pk, user):
-        booking = get_object_or_404(Booking, pk=pk)
+    def get_object(self, pk, user, for_update=False):
+        queryset = Booking.objects.select_for_update() if for_update else Booking.objects
+        booking = get_object_or_404(queryset, pk=pk)
         # Permission Check
         if user.role not in ['ADMIN', 'MANAGER', 'EMPLOYEE'] and booking.customer != user:
              return None
@@ -114,43 +123,50 @@ class BookingDetailApi(APIView):
 
     def patch(self, request, pk):
         """Allow Admins/Managers to manually update booking status with side effects."""
-        booking = self.get_object(pk, request.user)
-        if not booking: return Response({"error": "Not authorized"}, status=403)
+        # Locked so a concurrent finish_job can't complete the booking twice,
+        # and atomic so completion side effects apply all or not at all
+        with transaction.atomic():
+            booking = self.get_object(pk, request.user, for_update=True)
+            if not booking: return Response({"error": "Not authorized"}, status=403)
 
-        if request.user.role not in ['ADMIN', 'MANAGER']:
-             return Response({"error": "Permission denied"}, status=403)
+            if request.user.role not in ['ADMIN', 'MANAGER']:
+                 return Response({"error": "Permission denied"}, status=403)
 
-        data = request.data
-        if 'status' in data:
-            new_status = data['status']
-            
-            # 1. Handle "Start Job" Side Effects
-            if new_status == 'IN_PROGRESS' and booking.status != 'IN_PROGRESS':
-                booking.actual_start_time = timezone.now()
-                if booking.employee:
-                    booking.employee.is_available = False
-                    booking.employee.save()
+            data = request.data
+            completed = False
+            if 'status' in data:
+                new_status = data['status']
+                
+                # 1. Handle "Start Job" Side Effects
+                if new_status == 'IN_PROGRESS' and booking.status != 'IN_PROGRESS':
+                    booking.actual_start_time = timezone.now()
+                    if booking.employee:
+                        booking.employee.is_available = False
+                        booking.employee.save()
+                
+                # 2. Handle "Finish Job" Side Effects
+                elif new_status == 'COMPLETED' and booking.status != 'COMPLETED':
+                    booking.actual_end_time = timezone.now()
+                    if booking.employee:
+                        booking.employee.is_available = True
+                        # Commission Logic
+                        if booking.employee.commission_rate > 0:
+                            commission = (booking.total_price * booking.employee.commission_rate) / 100
+                            booking.employee.wallet_balance = F('wallet_balance') + commission
+                        booking.employee.save()
+
+                # 3. Handle "Cancel" Side Effects
+                elif new_status == 'CANCELLED':
+                    if booking.status == 'IN_PROGRESS' and booking.employee:
+                         booking.employee.is_available = True
+                         booking.employee.save()
+
+                completed = new_status == 'COMPLETED' and booking.status != 'COMPLETED'
+                booking.status = new_status
             
-            # 2. Handle "Finish Job" Side Effects
-            elif new_status == 'COMPLETED' and booking.status != 'COMPLETED':
-                booking.actual_end_time = timezone.now()
-                if booking.employee:
-                    booking.employee.is_available = True
-                    # Commission Logic
-                    if booking.employee.commission_rate > 0:
-                        commission = (booking.total_price * booking.employee.commission_rate) / 100
-                        booking.employee.wallet_balance = F('wallet_balance') + commission
-                    booking.employee.save()
-
-            # 3. Handle "Cancel" Side Effects
-            elif new_status == 'CANCELLED':
-                if booking.status == 'IN_PROGRESS' and booking.employee:
-                     booking.employee.is_available = True
-                     booking.employee.save()
-
-            booking.status = new_status
-        
-        booking.save()
+            booking.save()
+            if completed:
+                on_booking_completed(booking)
         
         # Refresh to get updated values (like wallet balance derived from F expression)
         booking.refresh_from_db()
@@ -223,7 +239,9 @@ class FinishJobApi(APIView):
 
     def post(self, request, pk):
         with transaction.atomic():
-            booking = get_object_or_404(Booking, pk=pk)
+            # Row lock: of concurrent finishes only the first sees IN_PROGRESS,
+            # so completion side effects run once
+            booking = get_object_or_404(Booking.objects.select_for_update(), pk=pk)
             
              # Auth check
             if request.user.role != 'ADMIN' and booking.employee.user != request.user:
@@ -243,14 +261,40 @@ class FinishJobApi(APIView):
                     booking.employee.refresh_from_db()
                     booking.employee.wallet_balance += commission
                 booking.employee.save()
+
+            on_booking_completed(booking)
                 
             return Response({"status": "Job Finished"})
 
+def queue_ahead_of(booking):
+    """Open bookings ahead of `booking` in its stylist's queue, annotated with their service minutes."""
+    return Booking.objects.filter(
+        employee=booking.employee_id,
+        booking_date=booking.booking_date,
+        status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS'],
+        booking_time__lt=booking.booking_time
+    ).annotate(service_minutes=Sum('items__service__duration_minutes'))
+
+def track_payload(booking, queue_ahead, current_job):
+    est_minutes = sum(b.service_minutes or 30 for b in queue_ahead)
+    stylist_status = "Free"
+    if current_job:
+        stylist_status = f"Busy with Token #{current_job.token_number}"
+
+    return {
+        "token": booking.token_number,
+        "stylist": booking.employee.user.username,
+        "stylist_status": stylist_status,
+        "position_in_queue": len(queue_ahead) + 1,
+        "estimated_wait_minutes": est_minutes,
+        "booking_status": booking.status
+    }
+
 class BookingTrackApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
-        booking = get_object_or_404(Booking, pk=pk)
+        booking = get_object_or_404(Booking.objects.select_related('employee__user'), pk=pk)
         
         if booking.status in ['COMPLETED', 'CANCELLED']:
              return Response({"status": booking.status, "message": "Booking is finished/cancelled"})
@@ -258,39 +302,85 @@ class BookingTrackApi(APIView):
         if not booking.employee:
             return Response({"status": "Unassigned", "message": "Waiting for stylist assignment"})
 
-        queue_ahead = Booking.objects.filter(
-            employee=booking.employee,
-            booking_date=booking.booking_date,
-            status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS'],
-            booking_time__lt=booking.booking_time
+        queue_ahead = list(queue_ahead_of(booking))
+        current_job = Booking.objects.filter(employee=booking.employee_id, status='IN_PROGRESS').first()
+        return Response(track_payload(booking, queue_ahead, current_job))
+
+class CustomerHistoryApi(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('customer', openapi.IN_QUERY, description="Customer ID (Admin/Manager only)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('status', openapi.IN_QUERY, description="Filter by booking status", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request):
+        """
+        Visit summary plus a keyset-paginated page of bookings, newest first.
+        The summary is a primary-key lookup on the denormalized CustomerVisitSummary.
+        """
+        customer_id = request.user.id
+        if 'customer' in request.query_params:
+            if request.user.role not in ['ADMIN', 'MANAGER']:
+                return Response({"error": "Permission denied"}, status=403)
+            try:
+                customer_id = int(request.query_params['customer'])
+            except ValueError:
+                return Response({"error": "customer must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        summary = (
+            CustomerVisitSummary.objects.select_related('favorite_stylist__user', 'favorite_service')
+            .filter(customer_id=customer_id).first()
+        ) or CustomerVisitSummary(customer_id=customer_id)
+
+        queryset = Booking.objects.filter(customer_id=customer_id).select_related('employee__user').prefetch_related(
+            Prefetch('items', queryset=BookingItem.objects.select_related('service'))
         )
-        
-        customers_ahead = queue_ahead.count()
-        
-        est_minutes = 0
-        for b in queue_ahead:
-             duration = sum(item.service.duration_minutes for item in b.items.all())
-             if duration == 0: duration = 30
-             est_minutes += duration
-
-        current_job = Booking.objects.filter(employee=booking.employee, status='IN_PROGRESS').first()
-        stylist_status = "Free"
-        if current_job:
-            stylist_status = f"Busy with Token #{current_job.token_number}"
-        
-        return Response({
-            "token": booking.token_number,
-            "stylist": booking.employee.user.username,
-            "stylist_status": stylist_status,
-            "position_in_queue": customers_ahead + 1,
-            "estimated_wait_minutes": est_minutes,
-            "booking_status": booking.status
-        })
+        if request.query_params.get('status'):
+            queryset = queryset.filter(status=request.query_params['status'])
+
+        paginator = VisitHistoryPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        response = paginator.get_paginated_response(VisitHistorySerializer(page, many=True).data)
+        response.data['summary'] = CustomerVisitSummarySerializer(summary).data
+        return response
 
 # --- DASHBOARD APIS ---
 
+def dashboard_querysets(profile):
+    """(completed totals, open queue) for a stylist's day."""
+    todays_jobs = Booking.objects.filter(employee=profile, booking_date=timezone.now().date())
+    completed_totals = todays_jobs.filter(status='COMPLETED').values_list('total_price', flat=True)
+    pending = todays_jobs.filter(status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']).select_related(
+        'customer', 'customer__customer_profile',
+        'employee', 'employee__user', 'employee__user__customer_profile'
+    ).prefetch_related(
+        'items__service',
+        attendance_today_prefetch('employee__attendance')
+    ).order_by('booking_time')
+    return completed_totals, pending
+
+def dashboard_payload(user, profile, completed_totals, pending):
+    today_commission = 0
+    for total_price in completed_totals:
+        if profile.commission_rate > 0:
+            today_commission += (total_price * profile.commission_rate) / 100
+
+    queue = BookingSerializer(pending, many=True).data
+    return {
+        "employee": user.username,
+        "wallet_balance": profile.wallet_balance,
+        "today_earnings": today_commission,
+        "jobs_completed": len(completed_totals),
+        "queue_length": len(pending),
+        "next_customer": queue[0] if queue else None,
+        "queue": queue
+    }
+
 class EmployeeDashboardApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = False  # Live queue: must not lag behind start/finish job
 
     def get(self, request):
         user = request.user
@@ -298,26 +388,8 @@ class EmployeeDashboardApi(APIView):
             return Response({"error": "Not an employee"}, status=403)
         
         profile = user.employee_profile
-        today = timezone.now().date()
-        
-        todays_jobs = Booking.objects.filter(employee=profile, booking_date=today)
-        completed = todays_jobs.filter(status='COMPLETED')
-        pending = todays_jobs.filter(status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']).order_by('booking_time')
-        
-        today_commission = 0
-        for job in completed:
-            if profile.commission_rate > 0:
-                today_commission += (job.total_price * profile.commission_rate) / 100
-
-        return Response({
-            "employee": user.username,
-            "wallet_balance": profile.wallet_balance,
-            "today_earnings": today_commission,
-            "jobs_completed": completed.count(),
-            "queue_length": pending.count(),
-            "next_customer": BookingSerializer(pending.first()).data if pending.exists() else None,
-            "queue": BookingSerializer(pending, many=True).data
-        })
+        completed_totals, pending = dashboard_querysets(profile)
+        return Response(dashboard_payload(user, profile, list(completed_totals), list(pending)))
 
 class AdminStatsApi(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -0,0 +1,61 @@
+from django.db.models import Count, DecimalField, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Booking, BookingItem, CustomerVisitSummary
+
+def favorite_stylist_subquery(customer):
+    """Most-visited stylist among the customer's completed bookings (latest visit breaks ties)."""
+    return Subquery(
+        Booking.objects.filter(customer=customer, status='COMPLETED', employee__isnull=False)
+        .values('employee')
+        .annotate(visits=Count('id'), latest=Max('booking_date'))
+        .order_by('-visits', '-latest')
+        .values('employee')[:1]
+    )
+
+def favorite_service_subquery(customer):
+    return Subquery(
+        BookingItem.objects.filter(booking__customer=customer, booking__status='COMPLETED')
+        .values('service')
+        .annotate(times=Count('id'), latest=Max('booking__booking_date'))
+        .order_by('-times', '-latest')
+        .values('service')[:1]
+    )
+
+def record_visit(booking):
+    """
+    Fold a just-completed booking into its customer's summary.
+    Counters move with F() and the favorites are re-derived by indexed
+    subqueries over this customer only, all in one UPDATE.
+    Walk-in guests without an account have no summary.
+    """
+    if booking.customer_id is None:
+        return
+    CustomerVisitSummary.objects.get_or_create(customer_id=booking.customer_id)
+    CustomerVisitSummary.objects.filter(customer_id=booking.customer_id).update(
+        visit_count=F('visit_count') + 1,
+        lifetime_spend=F('lifetime_spend') + booking.total_price,
+        last_visit=Greatest(Coalesce(F('last_visit'), Value(booking.booking_date)), Value(booking.booking_date)),
+        favorite_stylist=favorite_stylist_subquery(booking.customer_id),
+        favorite_service=favorite_service_subquery(booking.customer_id),
+    )
+
+def rebuild_visit_summaries():
+    """Recreate every summary from history with one grouped aggregation. Returns the row count."""
+    customer = OuterRef('customer_id')
+    rows = (
+        Booking.objects.filter(status='COMPLETED', customer__isnull=False)
+        .values('customer_id')
+        .annotate(
+            visit_count=Count('id'),
+            lifetime_spend=Coalesce(Sum('total_price'), Value(0, output_field=DecimalField())),
+            last_visit=Max('booking_date'),
+            favorite_stylist_id=favorite_stylist_subquery(customer),
+            favorite_service_id=favorite_service_subquery(customer),
+        )
+        .order_by()
+    )
+    summaries = [CustomerVisitSummary(**row) for row in rows]
+    CustomerVisitSummary.objects.all().delete()
+    CustomerVisitSummary.objects.bulk_create(summaries, batch_size=1000)
+    return len(summaries)
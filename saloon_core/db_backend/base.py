@@ -0,0 +1,7 @@
+"""PostgreSQL backend with connection acquisition statistics (saloon_core.db_pool)."""
+from django.db.backends.postgresql import base
+
+from saloon_core.db_pool import InstrumentedConnectionMixin
+
+class DatabaseWrapper(InstrumentedConnectionMixin, base.DatabaseWrapper):
+    pass
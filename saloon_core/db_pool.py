@@ -0,0 +1,127 @@
+"""
+Database connection reuse instrumentation.
+
+Connections are reused in one of two ways (see DATABASES in settings):
+- persistent: each worker thread keeps its connection for CONN_MAX_AGE
+  seconds, checked with CONN_HEALTH_CHECKS before reuse;
+- pooled: DB_POOL_MAX_SIZE > 0 hands connections out of psycopg's
+  ConnectionPool, which checks them on checkout.
+InstrumentedConnectionMixin (used by the saloon_core.db_backend engine) times
+every acquisition: a fresh connect in persistent mode, a pool checkout
+(including time queued for a free connection) when pooled. Statistics are
+per process, so each worker reports its own.
+"""
+import threading
+import time
+from collections import deque
+
+from django.db import connections
+
+RECENT_ACQUIRES = 1000  # Window for acquire latency percentiles
+
+class _AliasStats:
+    def __init__(self):
+        self.acquired = 0
+        self.failed = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.acquire_ms_total = 0.0
+        self.acquire_ms_max = 0.0
+        self.recent_ms = deque(maxlen=RECENT_ACQUIRES)
+
+_lock = threading.Lock()
+_stats = {}
+
+def _for(alias):
+    stats = _stats.get(alias)
+    if stats is None:
+        with _lock:
+            stats = _stats.setdefault(alias, _AliasStats())
+    return stats
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 3)
+
+class InstrumentedConnectionMixin:
+    """DatabaseWrapper mixin recording acquire latency and connections held."""
+
+    def get_new_connection(self, conn_params):
+        stats = _for(self.alias)
+        with _lock:
+            stats.waiting += 1
+        start = time.perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            with _lock:
+                stats.waiting -= 1
+                stats.failed += 1
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with _lock:
+            stats.waiting -= 1
+            stats.acquired += 1
+            stats.in_use += 1
+            stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
+            stats.acquire_ms_total += elapsed_ms
+            stats.acquire_ms_max = max(stats.acquire_ms_max, elapsed_ms)
+            stats.recent_ms.append(elapsed_ms)
+        return connection
+
+    def _close(self):
+        held = self.connection is not None
+        try:
+            return super()._close()
+        finally:
+            if held:
+                stats = _for(self.alias)
+                with _lock:
+                    stats.in_use = max(0, stats.in_use - 1)
+
+def pool_stats():
+    """
+    {alias: stats} for this process.
+    `in_use` counts connections checked out (pooled) or open (persistent);
+    `waiting` counts threads currently blocked acquiring one.
+    Pooled aliases add psycopg_pool's own counters under `pool`.
+    """
+    result = {}
+    for alias in connections:
+        settings_dict = connections.settings[alias]
+        pooled = bool(settings_dict.get('OPTIONS', {}).get('pool'))
+        stats = _for(alias)
+        with _lock:
+            ordered = sorted(stats.recent_ms)
+            entry = {
+                'mode': 'pooled' if pooled else 'persistent' if settings_dict.get('CONN_MAX_AGE') else 'per-request',
+                'in_use': stats.in_use,
+                'peak_in_use': stats.peak_in_use,
+                'waiting': stats.waiting,
+                'acquired': stats.acquired,
+                'failed': stats.failed,
+                'acquire_ms': {
+                    'mean': round(stats.acquire_ms_total / stats.acquired, 3) if stats.acquired else None,
+                    'p50': _percentile(ordered, 0.5),
+                    'p95': _percentile(ordered, 0.95),
+                    'max': round(stats.acquire_ms_max, 3),
+                },
+            }
+        if pooled:
+            # Only report pools this process already opened
+            pool = getattr(type(connections[alias]), '_connection_pools', {}).get(alias)
+            if pool is not None:
+                entry['pool'] = pool.get_stats()
+        result[alias] = entry
+    return result
+
+def reset_pool_stats():
+    """Zero the counters; connections currently held or awaited stay counted."""
+    with _lock:
+        for stats in _stats.values():
+            stats.acquired = stats.failed = 0
+            stats.peak_in_use = stats.in_use
+            stats.acquire_ms_total = stats.acquire_ms_max = 0.0
+            stats.recent_ms.clear()
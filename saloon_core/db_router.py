@@ -0,0 +1,152 @@
+"""
+Read-replica routing.
+
+When DATABASES defines a 'replica' alias, reads made while serving a safe
+(GET/HEAD/OPTIONS) request go to it; everything else uses 'default'.
+A request stays on the primary:
+- once it has written, or while a transaction is open on the primary,
+- for views that set `replica_reads = False` or code inside `primary_db()`,
+- for REPLICA_PIN_SECONDS after the same user's last write, so users
+  always read their own writes despite replication lag.
+Reads outside a request (management commands, workers) use the primary.
+The middleware runs natively in both sync (WSGI) and async (ASGI) stacks;
+async views' ORM calls inherit the request's routing state through the
+context that sync_to_async copies into its worker thread.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_CACHE_KEY = 'db_pin:{user_id}'
+
+class _RoutingState:
+    __slots__ = ('replica_ok', 'wrote', 'user_id')
+
+    def __init__(self, replica_ok):
+        self.replica_ok = replica_ok
+        self.wrote = False
+        self.user_id = None
+
+_state = contextvars.ContextVar('db_routing_state', default=None)
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in connections.settings
+
+def pin_cache_key(user_id):
+    return PIN_CACHE_KEY.format(user_id=user_id)
+
+def note_authenticated_user(user_id):
+    """Called by authentication once the user is known: pins recent writers."""
+    state = _state.get()
+    if state is None:
+        return
+    state.user_id = user_id
+    if state.replica_ok and cache.get(pin_cache_key(user_id)):
+        state.replica_ok = False
+
+async def anote_authenticated_user(user_id):
+    """note_authenticated_user for async views."""
+    state = _state.get()
+    if state is None:
+        return
+    state.user_id = user_id
+    if state.replica_ok and await cache.aget(pin_cache_key(user_id)):
+        state.replica_ok = False
+
+@contextmanager
+def primary_db():
+    """Force reads in the block onto the primary (consistency-critical checks)."""
+    state = _state.get()
+    if state is None:
+        yield
+        return
+    previous = state.replica_ok
+    state.replica_ok = False
+    try:
+        yield
+    finally:
+        state.replica_ok = previous
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_ok or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        pin_key = self._pin_key(request, state)
+        if pin_key:
+            cache.set(pin_key, True, timeout=getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+        return response
+
+    async def __acall__(self, request):
+        state, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        pin_key = self._pin_key(request, state)
+        if pin_key:
+            await cache.aset(pin_key, True, timeout=getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+        return response
+
+    def _start(self, request):
+        state = _RoutingState(replica_ok=request.method in SAFE_METHODS and replica_configured())
+        return state, _state.set(state)
+
+    def _pin_key(self, request, state):
+        """Cache key pinning this request's user to the primary, if it wrote."""
+        if not state.wrote or not replica_configured():
+            return None
+        user = getattr(request, 'user', None)
+        user_id = state.user_id or (user.pk if user is not None and user.is_authenticated else None)
+        return pin_cache_key(user_id) if user_id is not None else None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if not getattr(view_class, 'replica_reads', getattr(view_func, 'replica_reads', True)):
+            state = _state.get()
+            if state is not None:
+                state.replica_ok = False
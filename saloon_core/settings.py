@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Trigram lookups for stylist search
 
     # Third-party Packages
     'rest_framework',
@@ -59,6 +60,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', #For connecting REACT
+    'saloon_core.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,6 +88,12 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'saloon_core.wsgi.application'
+ASGI_APPLICATION = 'saloon_core.asgi.application'
+# Serve the hot read endpoints from native async views (accounts/async_api.py).
+# Turn on only for ASGI workers (e.g. uvicorn saloon_core.asgi:application);
+# under WSGI (runserver, gunicorn) each async view would pay an event loop per
+# request, so the DRF views are served instead.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS') == 'True'
 
 
 # Database
@@ -94,15 +102,68 @@ WSGI_APPLICATION = 'saloon_core.wsgi.application'
 #Database Configuration
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'saloon_core.db_backend',  # PostgreSQL + connection stats (saloon_core/db_pool.py)
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Reuse each thread's connection instead of reconnecting per request
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,  # Drop dead persistent connections before reuse
     }
 }
 
+# psycopg connection pool, per worker process. Use it for ASGI workers
+# (threads come and go, so persistent connections do not pay off there)
+# or when many threads share few database connections. CONN_HEALTH_CHECKS
+# makes the pool check each connection on checkout.
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 0))
+if DB_POOL_MAX_SIZE:
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # Pooled connections are returned after each request
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),  # Seconds to wait for a free connection
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+        },
+    }
+
+# Optional read replica; safe reads are routed there by saloon_core.db_router
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['saloon_core.db_router.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+
+# Cache
+# Shared across workers when REDIS_URL is set (OTPs, throttling buckets);
+# falls back to per-process memory for local development.
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -156,18 +217,36 @@ AUTH_USER_MODEL = 'accounts.User'
 # settings.py 
 
 REST_FRAMEWORK = {
+    # API routes accept JWT only. Session/Basic (Basic runs PBKDF2 on every
+    # request) are limited to the docs views via DOCS_AUTHENTICATION_CLASSES.
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication',  # Enable Session Auth for Browsable API / Swagger
-        'rest_framework.authentication.BasicAuthentication',  # Enable Basic Auth for Swagger Authorize button
+        'accounts.authentication.CachedJWTAuthentication',  # JWT with cached user resolution
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated', # by default everyside must want login
     ),
+    # Reverse proxies in front of the app. Client IPs for throttling come from
+    # X-Forwarded-For only past this many trusted hops; 0 uses REMOTE_ADDR, so a
+    # client can't pick its own throttle bucket by sending the header itself.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
+    # Token-bucket admission control (accounts/throttling.py): '<view scope>_<key>'
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.getenv('THROTTLE_AUTH_IP', '30/min'),
+        'auth_email': os.getenv('THROTTLE_AUTH_EMAIL', '10/min'),
+        'auth_endpoint': os.getenv('THROTTLE_AUTH_ENDPOINT', '600/min'),
+        'booking_user': os.getenv('THROTTLE_BOOKING_USER', '20/min'),
+        'booking_endpoint': os.getenv('THROTTLE_BOOKING_ENDPOINT', '600/min'),
+    },
 }
 
+# Browser-only schemes for Swagger / Redoc (saloon_core/urls.py)
+DOCS_AUTHENTICATION_CLASSES = (
+    'rest_framework.authentication.SessionAuthentication',
+    'rest_framework.authentication.BasicAuthentication',
+)
+
 SWAGGER_SETTINGS = {
-   'USE_SESSION_AUTH': True,
+   'USE_SESSION_AUTH': False,  # "Try it out" calls need the Bearer token; API routes ignore sessions
    'SECURITY_DEFINITIONS': {
       'Bearer': {
             'type': 'apiKey',
@@ -183,12 +262,22 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),  # 1 day login
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
 }
+AUTH_USER_CACHE_TIMEOUT = 60  # Seconds a resolved JWT user stays cached
+
+# Payroll generation (accounts/payroll.py)
+PAYROLL_CHUNK_SIZE = 500  # Employees per transaction
+PAYROLL_INLINE_LIMIT = 500  # Larger staff counts are queued for process_payroll_runs
+
+# Bulk service import (services/imports.py)
+SERVICE_IMPORT_CHUNK_SIZE = 500  # Rows per upsert transaction
 
 
 CORS_ALLOW_ALL_ORIGINS = True
 
 # Google Auth Settings
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID')
+# Optional dotted path to a `fetcher(url) -> (certs, max_age)` (see accounts/google_certs.py)
+GOOGLE_CERTS_FETCHER = os.getenv('GOOGLE_CERTS_FETCHER')
 
 # Email Backend (SMTP)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
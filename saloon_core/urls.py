@@ -3,12 +3,15 @@ from django.contrib.auth import views as auth_views
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
+from django.utils.module_loading import import_string
 
 # Swagger Imports
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from .views import DbPoolStatsApi
+
 # Swagger Schema View Configuration
 schema_view = get_schema_view(
    openapi.Info(
@@ -21,6 +24,7 @@ schema_view = get_schema_view(
    ),
    public=True,
    permission_classes=(permissions.AllowAny,),
+   authentication_classes=[import_string(path) for path in settings.DOCS_AUTHENTICATION_CLASSES],
 )
 
 urlpatterns = [
@@ -35,6 +39,9 @@ urlpatterns = [
     # Accounts Link
     path('api/v1/accounts/', include('accounts.urls')),
     
+    # Internal: database connection stats of the serving worker
+    path('api/v1/internal/db-pool/', DbPoolStatsApi.as_view(), name='db-pool-stats'),
+
     # DRF Login/Logout (Session Auth)
     path('api-auth/', include('rest_framework.urls')),
     
@@ -0,0 +1,16 @@
+import os
+
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .db_pool import pool_stats
+
+class DbPoolStatsApi(APIView):
+    """Connection reuse statistics for the worker process serving the request (admin only)."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'ADMIN':
+            return Response({"error": "Admin only"}, status=403)
+        return Response({"pid": os.getpid(), "databases": pool_stats()})
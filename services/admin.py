@@ -1,12 +1,17 @@
 from django.contrib import admin
-from .models import Category, Service
+from .models import Category, Service, ServiceProduct
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'id')
 
+class ServiceProductInline(admin.TabularInline):
+    model = ServiceProduct
+    extra = 1
+
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
+    inlines = [ServiceProductInline]
     list_display = ('name', 'category', 'price', 'duration_minutes', 'is_active')
     list_filter = ('category', 'is_active')
     search_fields = ('name',)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from accounts.async_api import AsyncReadApi
+from accounts.responses import cached_json_response
+from .catalog import aget_catalog
+from .serializers import ServiceSerializer
+from .views import ServiceListApi, service_filter, catalog_services
+
+class AsyncServiceListApi(AsyncReadApi):
+    api_class = ServiceListApi
+
+    async def get(self, request):
+        filterset = service_filter(request.query_params)
+        if filterset is not None:
+            if not filterset.is_valid():
+                return self.render(filterset.errors, status=400)
+            services = [service async for service in filterset.qs]
+            return self.render(ServiceSerializer(services, many=True).data)
+
+        try:
+            cached = catalog_services(await aget_catalog(), request.query_params)
+        except ValueError:
+            return self.render({"error": "category must be an integer"}, status=400)
+        if cached is None:
+            return self.render([])
+        return cached_json_response(request, *cached)
@@ -0,0 +1,56 @@
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+
+from accounts.cache_versions import get_version, aget_version, bump_version
+from accounts.responses import render_json
+from saloon_core.db_router import primary_db
+
+# Service catalog (categories with their active services), rendered once to
+# JSON bytes per version. services.signals bumps the version whenever a
+# category or service changes, which orphans the old entry.
+CATALOG_VERSION_KEY = 'service_catalog_version'
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+def bump_catalog_version():
+    bump_version(CATALOG_VERSION_KEY)
+
+def build_catalog():
+    from django.db.models import Prefetch
+    from .models import Category, Service
+    from .serializers import CatalogCategorySerializer
+
+    categories = Category.objects.order_by('id').prefetch_related(
+        Prefetch('services', queryset=Service.objects.filter(is_active=True).order_by('id'), to_attr='active_services')
+    )
+    catalog = CatalogCategorySerializer(categories, many=True).data
+    by_category = {category['id']: category['services'] for category in catalog}
+    services = sorted((s for nested in by_category.values() for s in nested), key=lambda s: s['id'])
+    return {
+        'catalog': render_json(catalog),
+        'categories': render_json([{k: v for k, v in c.items() if k != 'services'} for c in catalog]),
+        'services': render_json(services),
+        'by_category': {pk: render_json(nested) for pk, nested in by_category.items()},
+    }
+
+def get_catalog():
+    """
+    Returns {'catalog' | 'categories' | 'services': (body, etag),
+    'by_category': {category_pk: (body, etag)}}.
+    Cache hits do no database work.
+    """
+    key = f'service_catalog:{get_version(CATALOG_VERSION_KEY)}'
+    catalog = cache.get(key)
+    if catalog is None:
+        # A lagging replica must not be snapshotted under the new version
+        with primary_db():
+            catalog = build_catalog()
+        cache.set(key, catalog, timeout=CATALOG_TIMEOUT)
+    return catalog
+
+async def aget_catalog():
+    """get_catalog for async views; only a cache miss leaves the event loop."""
+    catalog = await cache.aget(f'service_catalog:{await aget_version(CATALOG_VERSION_KEY)}')
+    if catalog is None:
+        catalog = await sync_to_async(get_catalog)()
+    return catalog
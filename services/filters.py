@@ -0,0 +1,26 @@
+import django_filters
+
+from .models import Service
+
+class ServiceFilter(django_filters.FilterSet):
+    """
+    Active service list filters (see the composite indexes on Service).
+    ?category=1&min_price=100&max_price=500&max_duration=45&search=cut&ordering=-popularity
+    """
+    category = django_filters.NumberFilter(field_name='category_id')
+    min_price = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    max_duration = django_filters.NumberFilter(field_name='duration_minutes', lookup_expr='lte')
+    search = django_filters.CharFilter(field_name='name', lookup_expr='icontains')
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ('price', 'price'),
+            ('popularity', 'popularity'),
+            ('duration_minutes', 'duration'),
+            ('name', 'name'),
+        )
+    )
+
+    class Meta:
+        model = Service
+        fields = []
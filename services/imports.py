@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .catalog import bump_catalog_version
+from .models import Category, Service
+from .serializers import ServiceImportRowSerializer
+
+UPSERT_FIELDS = ['category', 'price', 'duration_minutes', 'description', 'is_active']
+
+def chunk_size():
+    return getattr(settings, 'SERVICE_IMPORT_CHUNK_SIZE', 500)
+
+def rows_from_groups(groups):
+    """Flatten the JSON body [{category_name, services: [...]}, ...] into import rows."""
+    for group in groups:
+        services = group.get('services') if isinstance(group, dict) else None
+        if not isinstance(services, list):
+            yield None, {'non_field_errors': ["Expected an object with 'category_name' and a 'services' list."]}
+            continue
+        for service in services:
+            if not isinstance(service, dict):
+                yield None, {'non_field_errors': ["Expected an object."]}
+                continue
+            yield {'category_name': group.get('category_name'), **service}, None
+
+def rows_from_csv(binary):
+    """Stream rows from a CSV upload with a header row (category_name,name,price,duration,description)."""
+    text = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+    try:
+        for row in csv.DictReader(text):
+            if None in row:
+                yield None, {'non_field_errors': ["Row has more columns than the header."]}
+                continue
+            # Empty cells mean "not given" so field defaults apply
+            yield {key: value for key, value in row.items() if value != ''}, None
+    finally:
+        text.detach()
+
+def rows_from_jsonl(binary):
+    """Stream rows from a JSON Lines upload, one flat object per line."""
+    text = io.TextIOWrapper(binary, encoding='utf-8-sig')
+    try:
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield None, {'non_field_errors': [f"Invalid JSON: {e}"]}
+                continue
+            if not isinstance(row, dict):
+                yield None, {'non_field_errors': ["Expected an object."]}
+                continue
+            yield row, None
+    finally:
+        text.detach()
+
+def upsert_chunk(valid_rows):
+    """
+    Write one chunk of validated rows: a name lookup, a category insert plus
+    re-read, and a single service upsert. Returns (created, updated).
+    """
+    by_name = {row['name']: row for row in valid_rows}  # Last row wins within a chunk
+    with transaction.atomic():
+        existing = set(Service.objects.filter(name__in=by_name).values_list('name', flat=True))
+
+        category_names = {row['category_name'] for row in by_name.values()}
+        Category.objects.bulk_create([Category(name=name) for name in category_names], ignore_conflicts=True)
+        category_ids = dict(Category.objects.filter(name__in=category_names).values_list('name', 'id'))
+
+        Service.objects.bulk_create(
+            [
+                Service(
+                    name=name,
+                    category_id=category_ids[row['category_name']],
+                    price=row['price'],
+                    duration_minutes=row['duration'],
+                    description=row['description'],
+                    is_active=True,
+                )
+                for name, row in by_name.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=UPSERT_FIELDS,
+        )
+        transaction.on_commit(bump_catalog_version)  # bulk_create skips signals
+    return len(by_name) - len(existing), len(existing)
+
+def import_services(rows):
+    """
+    Validate and upsert (data, parse_error) pairs incrementally, one chunk at a
+    time, so uploads of any size run in bounded memory. Invalid rows are
+    reported by 1-based row number and never abort the rest of the import.
+    """
+    summary = {'processed': 0, 'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    numbered = enumerate(rows, start=1)
+    while True:
+        chunk = list(islice(numbered, chunk_size()))
+        if not chunk:
+            break
+
+        valid = []
+        for number, (data, error) in chunk:
+            if error is None:
+                serializer = ServiceImportRowSerializer(data=data)
+                if serializer.is_valid():
+                    valid.append(serializer.validated_data)
+                    continue
+                error = serializer.errors
+            summary['failed'] += 1
+            summary['errors'].append({'row': number, 'errors': error})
+
+        if valid:
+            created, updated = upsert_chunk(valid)
+            summary['created'] += created
+            summary['updated'] += updated
+        summary['processed'] += len(chunk)
+    return summary
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Product, StockMovement
+
+FORECAST_WINDOW_DAYS = 30
+MAX_FORECAST_WINDOW_DAYS = 365
+
+def record_movement(product, change, reason, user=None, reference=''):
+    if change:
+        StockMovement.objects.create(
+            product=product, change=change, reason=reason, reference=reference,
+            created_by=user if user is not None and user.is_authenticated else None,
+        )
+
+def restock(product, quantity, user=None, reference=''):
+    """Add stock with an F() increment (safe against concurrent consumption) and log it."""
+    with transaction.atomic():
+        Product.objects.filter(pk=product.pk).update(stock_quantity=F('stock_quantity') + quantity)
+        record_movement(product, quantity, 'RESTOCK', user=user, reference=reference)
+    product.refresh_from_db(fields=['stock_quantity'])
+    return product
+
+def forecast(window_days=FORECAST_WINDOW_DAYS):
+    """
+    Usage rate and days until stockout for every product, over a trailing window.
+    Consumption is summed per product by one grouped query over the ledger;
+    the rates are then simple per-row arithmetic on that result set.
+    Products with no usage in the window get no stockout estimate.
+    """
+    since = timezone.now() - timedelta(days=window_days)
+    products = Product.objects.annotate(
+        used=Coalesce(
+            -Sum('movements__change', filter=Q(movements__reason='CONSUMPTION', movements__created_at__gte=since)),
+            Value(0),
+        )
+    ).order_by('id')
+
+    today = timezone.localdate()
+    rows = []
+    for product in products:
+        daily_usage = Decimal(product.used) / window_days
+        row = {
+            'product': product.id,
+            'name': product.name,
+            'brand': product.brand,
+            'stock_quantity': product.stock_quantity,
+            'low_stock_threshold': product.low_stock_threshold,
+            'used': product.used,
+            'daily_usage': daily_usage.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+            'days_until_stockout': None,
+            'stockout_date': None,
+            'reorder_by': None,
+        }
+        if daily_usage:
+            days_left = int(product.stock_quantity / daily_usage)
+            days_to_threshold = max(0, int((product.stock_quantity - product.low_stock_threshold) / daily_usage))
+            row.update({
+                'days_until_stockout': days_left,
+                'stockout_date': today + timedelta(days=days_left),
+                'reorder_by': today + timedelta(days=days_to_threshold),
+            })
+        rows.append(row)
+
+    # Soonest stockouts first; products without usage last
+    rows.sort(key=lambda row: (row['days_until_stockout'] is None, row['days_until_stockout'] or 0, row['product']))
+    return rows
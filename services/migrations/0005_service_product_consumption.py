@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0004_alter_service_name_alter_product_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceProduct',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=1, help_text='Units used per service')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('stock_quantity__lte', models.F('low_stock_threshold'))), fields=['stock_quantity'], name='product_low_stock_idx'),
+        ),
+        migrations.AddField(
+            model_name='serviceproduct',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='service_usage', to='services.product'),
+        ),
+        migrations.AddField(
+            model_name='serviceproduct',
+            name='service',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='consumption', to='services.service'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='serviceproduct',
+            unique_together={('service', 'product')},
+        ),
+    ]
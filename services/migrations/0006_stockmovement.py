@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0005_service_product_consumption'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('change', models.IntegerField(help_text='Signed quantity; positive adds stock')),
+                ('reason', models.CharField(choices=[('INITIAL', 'Initial stock'), ('RESTOCK', 'Restock'), ('ADJUSTMENT', 'Manual adjustment'), ('CONSUMPTION', 'Used by a service')], max_length=20)),
+                ('reference', models.CharField(blank=True, help_text='Source of the change, e.g. booking:42', max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='services.product')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['reason', 'created_at', 'product'], name='stock_movement_window_idx'), models.Index(fields=['product', '-created_at'], name='stock_movement_product_idx')],
+            },
+        ),
+    ]
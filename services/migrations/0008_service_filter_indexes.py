@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0007_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='popularity',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Times performed (completed booking items)'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['is_active', 'category', 'price'], name='service_active_cat_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['is_active', 'duration_minutes'], name='service_active_duration_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['is_active', '-popularity'], name='service_active_popular_idx'),
+        ),
+    ]
@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.db import models
 
 class Category(models.Model):
     name = models.CharField(max_length=50, unique=True)
     image = models.ImageField(upload_to='category_images/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies (accounts.images)")
 
     class Meta:
         verbose_name_plural = "Categories"
@@ -17,7 +19,17 @@ class Service(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     duration_minutes = models.PositiveIntegerField(help_text="Estimated duration in minutes")
     image = models.ImageField(upload_to='service_images/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies (accounts.images)")
     is_active = models.BooleanField(default=True)
+    popularity = models.PositiveIntegerField(default=0, editable=False, help_text="Times performed (completed booking items)")
+
+    class Meta:
+        indexes = [
+            # ServiceFilter: active catalog by category and price range / price sort
+            models.Index(fields=['is_active', 'category', 'price'], name='service_active_cat_price_idx'),
+            models.Index(fields=['is_active', 'duration_minutes'], name='service_active_duration_idx'),
+            models.Index(fields=['is_active', '-popularity'], name='service_active_popular_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.duration_minutes} min"
@@ -36,6 +48,65 @@ class Product(models.Model):
     
     class Meta:
         unique_together = ('name', 'brand')  # Prevent duplicate products: Same name and brand cannot exist twice
+        indexes = [
+            # Partial index: only low-stock rows are indexed, so alerts never scan the whole table
+            models.Index(
+                fields=['stock_quantity'],
+                name='product_low_stock_idx',
+                condition=models.Q(stock_quantity__lte=models.F('low_stock_threshold')),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.stock_quantity} left)"
+
+class ServiceProduct(models.Model):
+    """
+    Bill of materials: how much of a product one performance of a service uses.
+    Stock is decremented from these rows when a booking is completed.
+    """
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='consumption')
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='service_usage')
+    quantity = models.PositiveIntegerField(default=1, help_text="Units used per service")
+
+    class Meta:
+        unique_together = ('service', 'product')
+
+    def __str__(self):
+        return f"{self.service.name} uses {self.quantity} x {self.product.name}"
+
+
+class StockMovement(models.Model):
+    """
+    Append-only ledger of stock changes, written alongside every change made
+    through the product APIs and on booking completion (services.inventory).
+    """
+    REASON_CHOICES = (
+        ('INITIAL', 'Initial stock'),
+        ('RESTOCK', 'Restock'),
+        ('ADJUSTMENT', 'Manual adjustment'),
+        ('CONSUMPTION', 'Used by a service'),
+    )
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='movements')
+    change = models.IntegerField(help_text="Signed quantity; positive adds stock")
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    reference = models.CharField(max_length=50, blank=True, help_text="Source of the change, e.g. booking:42")
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Trailing-window usage per product (forecast)
+            models.Index(fields=['reason', 'created_at', 'product'], name='stock_movement_window_idx'),
+            models.Index(fields=['product', '-created_at'], name='stock_movement_product_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Stock movements are append-only")
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.name} ({self.stock_quantity} left)"
\ No newline at end of file
+        return f"{self.product.name} {self.change:+d} ({self.reason})"
@@ -1,7 +1,10 @@
 from rest_framework import serializers
-from .models import Service, Category, Product
+from accounts.images import ImageVariantsField
+from .models import Service, Category, Product, StockMovement
 
 class CategorySerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField('image')
+
     class Meta:
         model = Category
         fields = '__all__'
@@ -10,6 +13,7 @@ class ServiceSerializer(serializers.ModelSerializer):
 
     # To display category name in API response (Read Only)
     category_name = serializers.ReadOnlyField(source='category.name')
+    image_variants = ImageVariantsField('image')
 
     class Meta:
         model = Service
@@ -20,11 +24,16 @@ class ServiceSerializer(serializers.ModelSerializer):
             'price', 
             'duration_minutes', 
             'image', 
+            'image_variants',
             'is_active', 
             'category',
             'category_name'
         ]
 
+class CatalogCategorySerializer(CategorySerializer):
+    """Category with its active services nested (expects the `active_services` prefetch)."""
+    services = ServiceSerializer(source='active_services', many=True, read_only=True)
+
 class ProductSerializer(serializers.ModelSerializer):
     """
     Inventory Management Serializer
@@ -33,11 +42,31 @@ class ProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = '__all__'
 
+class StockMovementSerializer(serializers.ModelSerializer):
+    created_by_name = serializers.CharField(source='created_by.username', read_only=True, default=None)
+
+    class Meta:
+        model = StockMovement
+        fields = ['id', 'product', 'change', 'reason', 'reference', 'created_by', 'created_by_name', 'created_at']
+
+class RestockSerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(min_value=1)
+    reference = serializers.CharField(max_length=50, required=False, allow_blank=True, default='')
+
+class BulkServiceItemSerializer(serializers.Serializer):
+    """One service row of a bulk import."""
+    name = serializers.CharField(max_length=100)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    duration = serializers.IntegerField(min_value=1, required=False, default=30, help_text="Minutes")
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+
+class ServiceImportRowSerializer(BulkServiceItemSerializer):
+    """Flat import row (CSV/JSONL uploads, or a JSON group flattened by the view)."""
+    category_name = serializers.CharField(max_length=50)
+
 class BulkServiceSerializer(serializers.Serializer):
     """
     Serializer to handle bulk creation of services under a category
     """
     category_name = serializers.CharField(max_length=50)
-    services = serializers.ListField(
-        child=serializers.DictField() 
-    )
\ No newline at end of file
+    services = BulkServiceItemSerializer(many=True)
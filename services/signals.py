@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.images import queue_image_variants
+
+from .catalog import bump_catalog_version
+from .models import Category, Service
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_catalog(sender, instance, **kwargs):
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Service)
+def queue_image(sender, instance, **kwargs):
+    queue_image_variants(instance, 'image', kwargs.get('update_fields'))
@@ -1,21 +1,31 @@
 from django.urls import path
+from accounts.async_api import read_view
 from .views import (
-    CategoryListCreateApi, CategoryDetailApi,
-    ServiceListApi, ServiceDetailApi, BulkServiceCreateApi,
-    ProductListCreateApi, ProductDetailApi
+    CatalogApi, CategoryListCreateApi, CategoryDetailApi,
+    ServiceDetailApi, BulkServiceCreateApi,
+    ProductListCreateApi, ProductDetailApi, LowStockProductApi,
+    ProductRestockApi, ProductMovementListApi, StockForecastApi
 )
+from .async_views import AsyncServiceListApi
 
 urlpatterns = [
+    # Catalog snapshot (categories with nested active services)
+    path('catalog/', CatalogApi.as_view(), name='service-catalog'),
+
     # Categories
     path('categories/', CategoryListCreateApi.as_view(), name='category-list'),
     path('categories/<int:pk>/', CategoryDetailApi.as_view(), name='category-detail'),
 
     # Services
-    path('services/', ServiceListApi.as_view(), name='service-list'),
+    path('services/', read_view(AsyncServiceListApi), name='service-list'),
     path('services/<int:pk>/', ServiceDetailApi.as_view(), name='service-detail'),
     path('services/bulk_create/', BulkServiceCreateApi.as_view(), name='service-bulk-create'),
 
     # Products
     path('products/', ProductListCreateApi.as_view(), name='product-list'),
     path('products/<int:pk>/', ProductDetailApi.as_view(), name='product-detail'),
+    path('products/low_stock/', LowStockProductApi.as_view(), name='product-low-stock'),
+    path('products/forecast/', StockForecastApi.as_view(), name='product-forecast'),
+    path('products/<int:pk>/restock/', ProductRestockApi.as_view(), name='product-restock'),
+    path('products/<int:pk>/movements/', ProductMovementListApi.as_view(), name='product-movements'),
 ]
\ No newline at end of file
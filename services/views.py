@@ -1,18 +1,27 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from rest_framework.parsers import JSONParser, MultiPartParser
 from django.db import transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 from .models import Service, Category, Product
 from .serializers import (
     ServiceSerializer, CategorySerializer, ProductSerializer, 
-    BulkServiceSerializer
+    BulkServiceSerializer, StockMovementSerializer, RestockSerializer
 )
 
 # --- PERMISSIONS ---
 
 from accounts.permissions import IsAdminOrReadOnly
+from accounts.pagination import StandardPagination
+from accounts.responses import cached_json_response
+from .catalog import get_catalog
+from .filters import ServiceFilter
+from .imports import import_services, rows_from_csv, rows_from_jsonl, rows_from_groups
+from .inventory import record_movement, restock, forecast, FORECAST_WINDOW_DAYS, MAX_FORECAST_WINDOW_DAYS
 
 # --- CATEGORY APIS ---
 
@@ -20,9 +29,8 @@ class CategoryListCreateApi(APIView):
     permission_classes = [IsAdminOrReadOnly]
 
     def get(self, request):
-        queryset = Category.objects.prefetch_related('services').all()
-        serializer = CategorySerializer(queryset, many=True)
-        return Response(serializer.data)
+        """Served from the cached catalog snapshot (ETag / If-None-Match aware)."""
+        return cached_json_response(request, *get_catalog()['categories'])
 
     def post(self, request):
         serializer = CategorySerializer(data=request.data)
@@ -55,20 +63,68 @@ class CategoryDetailApi(APIView):
         category.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+class CatalogApi(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        """Categories with their active services nested; cached snapshot with ETag / 304 support."""
+        return cached_json_response(request, *get_catalog()['catalog'])
+
 # --- SERVICE APIS ---
 
+# Query parameters that need the database rather than the catalog snapshot
+SERVICE_QUERY_PARAMS = {'min_price', 'max_price', 'max_duration', 'search', 'ordering'}
+
+def service_filter(query_params):
+    """ServiceFilter over the active services, or None when the catalog snapshot answers the request."""
+    if not SERVICE_QUERY_PARAMS & set(query_params):
+        return None
+    queryset = Service.objects.select_related('category').filter(is_active=True).order_by('id')
+    return ServiceFilter(query_params, queryset=queryset)
+
+def catalog_services(catalog, query_params):
+    """
+    Cached (body, etag) for a plain or `?category=` listing; None for an unknown
+    category. Raises ValueError when the category isn't an integer.
+    """
+    category_id = query_params.get('category')
+    if not category_id:
+        return catalog['services']
+    return catalog['by_category'].get(int(category_id))
+
 class ServiceListApi(APIView):
     permission_classes = [IsAdminOrReadOnly]
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('category', openapi.IN_QUERY, description="Category ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('min_price', openapi.IN_QUERY, description="Minimum price", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('max_price', openapi.IN_QUERY, description="Maximum price", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('max_duration', openapi.IN_QUERY, description="Maximum duration in minutes", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('search', openapi.IN_QUERY, description="Name contains", type=openapi.TYPE_STRING),
+            openapi.Parameter('ordering', openapi.IN_QUERY, description="price, popularity, duration or name (prefix - for descending)", type=openapi.TYPE_STRING),
+        ]
+    )
     def get(self, request):
-        queryset = Service.objects.select_related('category').filter(is_active=True)
-        # Optional: Filter by Category
-        category_id = request.query_params.get('category')
-        if category_id:
-            queryset = queryset.filter(category_id=category_id)
-            
-        serializer = ServiceSerializer(queryset, many=True)
-        return Response(serializer.data)
+        """
+        Active services.
+        Plain and `?category=` requests are served from the cached catalog snapshot;
+        any other filter or ordering runs ServiceFilter against the indexed table.
+        """
+        filterset = service_filter(request.query_params)
+        if filterset is not None:
+            if not filterset.is_valid():
+                return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer = ServiceSerializer(filterset.qs, many=True)
+            return Response(serializer.data)
+
+        try:
+            cached = catalog_services(get_catalog(), request.query_params)
+        except ValueError:
+            return Response({"error": "category must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if cached is None:
+            return Response([])
+        return cached_json_response(request, *cached)
 
     def post(self, request):
         serializer = ServiceSerializer(data=request.data)
@@ -103,11 +159,12 @@ class ServiceDetailApi(APIView):
 
 class BulkServiceCreateApi(APIView):
     permission_classes = [IsAdminOrReadOnly]
+    parser_classes = [JSONParser, MultiPartParser]
 
     @swagger_auto_schema(request_body=BulkServiceSerializer(many=True))
     def post(self, request):
         """
-        Bulk create categories and services.
+        Bulk upsert categories and services (matched by service name).
         Expected JSON:
         [
             {
@@ -118,36 +175,33 @@ class BulkServiceCreateApi(APIView):
                 ]
             }
         ]
+        Or a multipart `file` upload, streamed row by row:
+        - .csv with header category_name,name,price,duration,description
+        - .jsonl with one {"category_name": ..., "name": ..., ...} object per line
+        Invalid rows are reported in `errors` without aborting the rest.
         """
-        serializer = BulkServiceSerializer(data=request.data, many=True)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            with transaction.atomic():
-                created_count = 0
-                for item in serializer.validated_data:
-                    category_name = item['category_name']
-                    services_data = item['services']
-
-                    category, _ = Category.objects.get_or_create(name=category_name)
-
-                    for service_data in services_data:
-                        Service.objects.update_or_create(
-                            name=service_data['name'],
-                            category=category,
-                            defaults={
-                                'price': service_data['price'],
-                                'duration_minutes': service_data.get('duration', 30),
-                                'description': service_data.get('description', ''),
-                                'is_active': True
-                            }
-                        )
-                        created_count += 1
-                
-                return Response({"status": "success", "message": f"{created_count} services processed."})
-        except Exception as e:
-            return Response({"error": str(e)}, status=400)
+        upload = request.FILES.get('file')
+        if upload is not None:
+            extension = upload.name.rsplit('.', 1)[-1].lower()
+            if extension == 'csv':
+                rows = rows_from_csv(upload.file)
+            elif extension in ('jsonl', 'ndjson'):
+                rows = rows_from_jsonl(upload.file)
+            else:
+                return Response({"error": "Upload a .csv or .jsonl file"}, status=status.HTTP_400_BAD_REQUEST)
+        elif isinstance(request.data, list):
+            rows = rows_from_groups(request.data)
+        else:
+            return Response({"error": "Expected a list of categories or a file upload"}, status=status.HTTP_400_BAD_REQUEST)
+
+        summary = import_services(rows)
+        succeeded = summary['processed'] - summary['failed']
+        summary['status'] = 'success' if not summary['failed'] else 'partial'
+        summary['message'] = f"{succeeded} services processed."
+        if summary['failed'] and not succeeded:
+            summary['status'] = 'failed'
+            return Response(summary, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summary)
 
 # --- PRODUCT APIS ---
 
@@ -162,10 +216,21 @@ class ProductListCreateApi(APIView):
     def post(self, request):
         serializer = ProductSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                product = serializer.save()
+                record_movement(product, product.stock_quantity, 'INITIAL', user=request.user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class LowStockProductApi(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+
+    def get(self, request):
+        """Products at or below their alert threshold (served by product_low_stock_idx)."""
+        queryset = Product.objects.filter(stock_quantity__lte=F('low_stock_threshold')).order_by('stock_quantity', 'id')
+        serializer = ProductSerializer(queryset, many=True)
+        return Response(serializer.data)
+
 class ProductDetailApi(APIView):
     permission_classes = [IsAdminOrReadOnly]
 
@@ -178,14 +243,63 @@ class ProductDetailApi(APIView):
         return Response(serializer.data)
 
     def put(self, request, pk):
-        product = self.get_object(pk)
-        serializer = ProductSerializer(product, data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # Locked so a consumption or restock can't land between reading the
+        # old stock and saving the new one (the ADJUSTMENT delta uses both)
+        with transaction.atomic():
+            product = get_object_or_404(Product.objects.select_for_update(), pk=pk)
+            previous_stock = product.stock_quantity
+            serializer = ProductSerializer(product, data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            product = serializer.save()
+            record_movement(product, product.stock_quantity - previous_stock, 'ADJUSTMENT', user=request.user)
+        return Response(serializer.data)
 
     def delete(self, request, pk):
         product = self.get_object(pk)
         product.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class ProductRestockApi(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+
+    @swagger_auto_schema(request_body=RestockSerializer)
+    def post(self, request, pk):
+        """Add delivered stock (atomic increment, recorded in the ledger)."""
+        product = get_object_or_404(Product, pk=pk)
+        serializer = RestockSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        product = restock(product, serializer.validated_data['quantity'], user=request.user, reference=serializer.validated_data['reference'])
+        return Response(ProductSerializer(product).data)
+
+class ProductMovementListApi(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+
+    def get(self, request, pk):
+        """Stock ledger for a product, newest first."""
+        product = get_object_or_404(Product, pk=pk)
+        queryset = product.movements.select_related('created_by')
+        paginator = StandardPagination()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            return paginator.get_paginated_response(StockMovementSerializer(page, many=True).data)
+        return Response(StockMovementSerializer(queryset, many=True).data)
+
+class StockForecastApi(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('days', openapi.IN_QUERY, description=f"Trailing window in days (default {FORECAST_WINDOW_DAYS})", type=openapi.TYPE_INTEGER),
+        ]
+    )
+    def get(self, request):
+        """Daily usage and days until stockout per product, soonest stockout first."""
+        try:
+            days = int(request.query_params.get('days', FORECAST_WINDOW_DAYS))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= MAX_FORECAST_WINDOW_DAYS:
+            return Response({"error": f"days must be between 1 and {MAX_FORECAST_WINDOW_DAYS}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"window_days": days, "products": forecast(days)})
\ No newline at end of file
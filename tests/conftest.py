@@ -0,0 +1,21 @@
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+@pytest.fixture
+def create_employees(db):
+    """Factory for stylists stylist{start}..stylist{start+count-1} with a wallet and base salary; returns their profiles."""
+    def create(start, count, wallet=Decimal('200.00')):
+        profiles = []
+        for i in range(start, start + count):
+            profile = User.objects.create_user(
+                email=f"stylist{i}@example.com", username=f"stylist{i}", password="password", role='EMPLOYEE'
+            ).employee_profile
+            profile.wallet_balance = wallet
+            profile.base_salary = Decimal('15000.00')
+            profile.save()
+            profiles.append(profile)
+        return profiles
+    return create
@@ -0,0 +1,155 @@
+import json
+import pytest
+from datetime import time
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, override_settings
+from django.urls import path, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.async_api import read_view
+from accounts.async_views import AsyncEmployeeListApi
+from accounts.tokens import HairwaysRefreshToken
+from bookings.async_views import AsyncBookingTrackApi, AsyncEmployeeDashboardApi
+from bookings.models import Booking
+from services.async_views import AsyncServiceListApi
+from services.models import Category, Service
+
+User = get_user_model()
+
+# The async variants, mounted as an ASGI deployment would (ASYNC_READ_VIEWS=True)
+urlpatterns = [
+    path('track/<int:pk>/', AsyncBookingTrackApi.as_view()),
+    path('dashboard/', AsyncEmployeeDashboardApi.as_view()),
+    path('services/', AsyncServiceListApi.as_view()),
+    path('employees/', AsyncEmployeeListApi.as_view()),
+]
+
+def bearer(user):
+    return f'Bearer {HairwaysRefreshToken.for_user(user).access_token}'
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    def setup_method(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password", role='CUSTOMER'
+        )
+        self.stylist = User.objects.create_user(
+            email="stylist@example.com", username="stylist", password="password", role='EMPLOYEE'
+        )
+        profile = self.stylist.employee_profile
+        profile.commission_rate = 10
+        profile.save()
+
+        self.category = Category.objects.create(name="Hair")
+        self.cut = Service.objects.create(name="Haircut", price=300, duration_minutes=30, category=self.category)
+        self.color = Service.objects.create(name="Color", price=900, duration_minutes=90, category=self.category)
+
+        today = timezone.now().date()
+        self.bookings = []
+        for hour, status, services in [
+            (9, 'COMPLETED', [self.color]),
+            (10, 'IN_PROGRESS', [self.cut, self.color]),
+            (11, 'PENDING', []),
+            (12, 'CONFIRMED', [self.cut]),
+        ]:
+            booking = Booking.objects.create(
+                customer=self.customer, employee=profile, booking_date=today,
+                booking_time=time(hour, 0), status=status, total_price=sum(s.price for s in services)
+            )
+            for service in services:
+                booking.items.create(service=service, price=service.price)
+            self.bookings.append(booking)
+
+    def sync_get(self, url, user=None, params=None):
+        client = APIClient()
+        if user:
+            client.credentials(HTTP_AUTHORIZATION=bearer(user))
+        return client.get(url, params)
+
+    def async_get(self, url, user=None, params=None):
+        headers = {'Authorization': bearer(user)} if user else {}
+        with override_settings(ROOT_URLCONF=__name__):
+            return async_to_sync(AsyncClient().get)(url, params or {}, headers=headers)
+
+    def assert_same(self, sync_response, async_response):
+        assert async_response.status_code == sync_response.status_code
+        assert json.loads(async_response.content) == json.loads(sync_response.content)
+
+    def test_booking_track(self):
+        last = self.bookings[-1]
+        sync_response = self.sync_get(reverse('booking-track', args=[last.pk]), self.customer)
+        self.assert_same(sync_response, self.async_get(f'/track/{last.pk}/', self.customer))
+        assert sync_response.data['position_in_queue'] == 3
+        assert sync_response.data['estimated_wait_minutes'] == 120 + 30  # Empty booking counts 30
+        assert sync_response.data['stylist_status'] == f"Busy with Token #{self.bookings[1].token_number}"
+
+        finished = self.bookings[0]
+        self.assert_same(
+            self.sync_get(reverse('booking-track', args=[finished.pk]), self.customer),
+            self.async_get(f'/track/{finished.pk}/', self.customer),
+        )
+        self.assert_same(
+            self.sync_get(reverse('booking-track', args=[999]), self.customer),
+            self.async_get('/track/999/', self.customer),
+        )
+
+    def test_login_required(self):
+        response = self.async_get(f'/track/{self.bookings[0].pk}/')
+        assert response.status_code == 401
+        assert response['WWW-Authenticate'].startswith('Bearer')
+
+        response = self.async_get('/dashboard/')
+        assert response.status_code == 401
+
+    def test_employee_dashboard(self):
+        sync_response = self.sync_get(reverse('employee-dashboard'), self.stylist)
+        self.assert_same(sync_response, self.async_get('/dashboard/', self.stylist))
+        assert sync_response.data['jobs_completed'] == 1
+        assert sync_response.data['queue_length'] == 3
+        assert sync_response.data['next_customer']['id'] == self.bookings[1].pk
+
+        self.assert_same(
+            self.sync_get(reverse('employee-dashboard'), self.customer),
+            self.async_get('/dashboard/', self.customer),
+        )
+
+    def test_service_list(self):
+        for params in [{}, {'category': self.category.id}, {'category': 999}, {'category': 'x'},
+                       {'ordering': '-price'}, {'max_duration': 45}, {'min_price': 'cheap'}]:
+            self.assert_same(
+                self.sync_get(reverse('service-list'), params=params),
+                self.async_get('/services/', params=params),
+            )
+
+    def test_employee_list(self):
+        for user, params in [(None, {}), (None, {'page': 1}), (self.admin, {}),
+                             (self.admin, {'page_size': 1, 'page': 1}), (self.admin, {'page': 5})]:
+            sync_response = self.sync_get(reverse('employee-list'), user, params)
+            async_response = self.async_get('/employees/', user, params)
+            assert async_response.status_code == sync_response.status_code
+            sync_body, async_body = json.loads(sync_response.content), json.loads(async_response.content)
+            if isinstance(sync_body, dict) and 'next' in sync_body:
+                # Absolute page links differ only by the mount point
+                assert (sync_body.pop('next') is None) == (async_body.pop('next') is None)
+            assert async_body == sync_body
+
+    def test_writes_are_delegated_to_the_api_view(self):
+        with override_settings(ROOT_URLCONF=__name__):
+            response = async_to_sync(AsyncClient().post)(
+                '/services/', {'name': 'Shave', 'price': 150, 'duration_minutes': 15, 'category': self.category.id},
+                content_type='application/json', headers={'Authorization': bearer(self.admin)},
+            )
+        assert response.status_code == 201
+        assert Service.objects.filter(name='Shave').exists()
+
+    def test_read_view_follows_setting(self):
+        with override_settings(ASYNC_READ_VIEWS=False):
+            assert read_view(AsyncServiceListApi).view_class is AsyncServiceListApi.api_class
+        with override_settings(ASYNC_READ_VIEWS=True):
+            view = read_view(AsyncServiceListApi)
+            assert view.view_class is AsyncServiceListApi
+            assert view.cls is AsyncServiceListApi.api_class  # Swagger docs and routing flags
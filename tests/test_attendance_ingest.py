@@ -0,0 +1,70 @@
+import pytest
+from datetime import date, time
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.models import Attendance
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestAttendanceIngest:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('attendance-ingest')
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+        user = User.objects.create_user(
+            email="stylist@example.com", username="stylist", password="password", role='EMPLOYEE'
+        )
+        self.employee = user.employee_profile
+        self.employee.shift_start = time(9, 0)
+        self.employee.save()
+
+    def upload(self, events):
+        return self.client.post(self.url, {"device_id": "door-1", "events": events}, format='json')
+
+    def test_derives_days_and_reports_rows(self):
+        emp = self.employee.id
+        events = [
+            {"employee": emp, "timestamp": "2025-01-01T18:01:00Z"},
+            {"employee": emp, "timestamp": "2025-01-01T09:15:00Z"},
+            {"employee": emp, "timestamp": "2025-01-01T09:15:00Z"},
+            {"employee": emp, "timestamp": "2025-01-02T08:55:00Z"},
+            {"employee": 999, "timestamp": "2025-01-02T08:55:00Z"},
+            {"employee": emp, "timestamp": "not-a-time"},
+        ]
+
+        response = self.upload(events)
+
+        assert response.status_code == 200
+        assert response.data['created'] == 2
+        assert [r['status'] for r in response.data['results']] == ['ok', 'ok', 'duplicate', 'ok', 'error', 'error']
+
+        late_day = Attendance.objects.get(employee=self.employee, date=date(2025, 1, 1))
+        assert (late_day.check_in, late_day.check_out, late_day.is_late) == (time(9, 15), time(18, 1), True)
+        on_time = Attendance.objects.get(employee=self.employee, date=date(2025, 1, 2))
+        assert (on_time.check_in, on_time.check_out, on_time.is_late) == (time(8, 55), None, False)
+
+    def test_reupload_is_idempotent_and_merges(self):
+        emp = self.employee.id
+        events = [{"employee": emp, "timestamp": "2025-01-01T09:15:00Z"}]
+        self.upload(events)
+
+        again = self.upload(events)
+        assert again.data['unchanged'] == 1
+
+        later = self.upload([{"employee": emp, "timestamp": "2025-01-01T17:00:00Z"}])
+        assert later.data['updated'] == 1
+        day = Attendance.objects.get(employee=self.employee)
+        assert (day.check_in, day.check_out) == (time(9, 15), time(17, 0))
+
+    def test_customers_cannot_ingest(self):
+        customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password", role='CUSTOMER'
+        )
+        self.client.force_authenticate(user=customer)
+
+        assert self.upload([]).status_code == 403
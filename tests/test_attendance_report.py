@@ -0,0 +1,52 @@
+import pytest
+from datetime import date, time
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.models import Attendance
+
+User = get_user_model()
+
+def create_employee(username):
+    return User.objects.create_user(
+        email=f"{username}@example.com", username=username, password="password", role='EMPLOYEE'
+    ).employee_profile
+
+@pytest.mark.django_db
+class TestAttendanceReport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('attendance-report')
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+
+        self.alice = create_employee("alice")
+        self.bob = create_employee("bob")
+        Attendance.objects.create(employee=self.alice, date=date(2025, 3, 3), check_in=time(9, 0), check_out=time(17, 30))
+        Attendance.objects.create(employee=self.alice, date=date(2025, 3, 4), check_in=time(9, 20), is_late=True)
+        Attendance.objects.create(employee=self.alice, date=date(2025, 4, 1), check_in=time(9, 0), check_out=time(10, 0))
+        Attendance.objects.create(employee=self.bob, date=date(2025, 2, 28), check_in=time(9, 0), check_out=time(18, 0))
+
+    def test_monthly_totals_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'month': '2025-03'})
+
+        assert response.status_code == 200
+        assert len(ctx) == 1
+        alice, bob = response.data['employees']
+        assert (alice['days_present'], alice['late_count'], alice['missing_checkouts'], alice['total_hours']) == (2, 1, 1, 8.5)
+        assert (bob['days_present'], bob['late_count'], bob['missing_checkouts'], bob['total_hours']) == (0, 0, 0, 0)
+
+    def test_csv_export_streams(self):
+        response = self.client.get(self.url, {'month': '2025-03', 'export': 'csv'})
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'employee,employee_name,days_present,late_count,missing_checkouts,total_hours'
+        assert lines[1] == f'{self.alice.id},alice,2,1,1,8.5'
+
+    def test_invalid_month(self):
+        assert self.client.get(self.url, {'month': 'March'}).status_code == 400
@@ -0,0 +1,36 @@
+import base64
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.urls import reverse
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestAuthSchemes:
+    def setup_method(self):
+        self.client = APIClient()
+        User.objects.create_user(
+            email="customer@example.com", username="customer", password="password",
+            role='CUSTOMER', is_email_verified=True
+        )
+
+    def test_basic_auth_is_not_accepted_on_api_routes(self):
+        credentials = base64.b64encode(b"customer@example.com:password").decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+
+        response = self.client.get(reverse('user-profile'))
+
+        assert response.status_code == 401
+
+    def test_session_is_not_accepted_on_api_routes(self):
+        self.client.login(email="customer@example.com", password="password")
+
+        response = self.client.get(reverse('user-profile'))
+
+        assert response.status_code == 401
+
+    def test_docs_remain_public(self):
+        response = self.client.get(reverse('schema-json', kwargs={'format': '.json'}))
+
+        assert response.status_code == 200
@@ -0,0 +1,100 @@
+import json
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from services.models import Category, Service
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestBulkServiceImport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('service-bulk-create')
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+
+    def post_json(self, groups):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, groups, format='json')
+        return len(ctx), response
+
+    def upload(self, name, content):
+        return self.client.post(self.url, {'file': SimpleUploadedFile(name, content.encode())}, format='multipart')
+
+    def groups(self, count, start=0):
+        return [{
+            'category_name': 'Cutting',
+            'services': [{'name': f'Cut {i}', 'price': 100 + i, 'duration': 30} for i in range(start, start + count)],
+        }]
+
+    def test_json_upsert(self):
+        Service.objects.create(name='Cut 0', price=1, duration_minutes=5, category=Category.objects.create(name='Old'), is_active=False)
+
+        _, response = self.post_json(self.groups(3))
+
+        assert response.status_code == 200
+        assert (response.data['created'], response.data['updated'], response.data['failed']) == (2, 1, 0)
+        cut = Service.objects.get(name='Cut 0')
+        assert (cut.category.name, cut.price, cut.duration_minutes, cut.is_active) == ('Cutting', 100, 30, True)
+
+    def test_queries_per_chunk_not_per_row(self, settings):
+        settings.SERVICE_IMPORT_CHUNK_SIZE = 1000
+        few, _ = self.post_json(self.groups(2))
+        many, response = self.post_json(self.groups(50, start=2))
+
+        assert response.data['created'] == 50
+        assert many == few
+
+    def test_row_errors_do_not_abort(self):
+        groups = self.groups(2)
+        groups[0]['services'].insert(1, {'name': 'Broken', 'price': -5})
+        groups[0]['services'].append({'name': 'No price'})
+
+        _, response = self.post_json(groups)
+
+        assert response.status_code == 200
+        assert response.data['status'] == 'partial'
+        assert [e['row'] for e in response.data['errors']] == [2, 4]
+        assert 'price' in response.data['errors'][0]['errors']
+        assert set(Service.objects.values_list('name', flat=True)) == {'Cut 0', 'Cut 1'}
+
+    def test_all_rows_invalid(self):
+        _, response = self.post_json([{'category_name': 'Cutting', 'services': [{'name': 'x'}]}])
+
+        assert response.status_code == 400
+        assert response.data['status'] == 'failed'
+
+    def test_csv_upload_in_chunks(self, settings):
+        settings.SERVICE_IMPORT_CHUNK_SIZE = 2
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 10  # Spool to a temporary file
+        lines = ['category_name,name,price,duration,description']
+        lines += [f'Color,Shade {i},{500 + i},,' for i in range(5)]
+        lines.append('Color,Bad,abc,30,')
+
+        response = self.upload('services.csv', '\n'.join(lines))
+
+        assert response.data['created'] == 5
+        assert response.data['errors'][0]['row'] == 6
+        assert Service.objects.get(name='Shade 4').duration_minutes == 30
+
+    def test_jsonl_upload(self):
+        lines = [
+            json.dumps({'category_name': 'Spa', 'name': 'Facial', 'price': 800, 'duration': 45}),
+            '',
+            '{not json',
+        ]
+
+        response = self.upload('services.jsonl', '\n'.join(lines))
+
+        assert (response.data['created'], response.data['failed']) == (1, 1)
+        assert Service.objects.get(name='Facial').category.name == 'Spa'
+
+    def test_unknown_file_type(self):
+        assert self.upload('services.xlsx', 'x').status_code == 400
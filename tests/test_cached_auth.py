@@ -0,0 +1,114 @@
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.authentication import auth_user_cache_key
+from accounts.forms import CustomAdminPasswordChangeForm
+from accounts.tokens import HairwaysRefreshToken
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('user-profile')
+        self.user = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password",
+            role='CUSTOMER', is_email_verified=True
+        )
+
+    def authenticate(self, user):
+        token = HairwaysRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return token
+
+    def get_profile(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        return len(ctx), response
+
+    def test_cached_hit_does_no_queries(self):
+        self.authenticate(self.user)
+
+        first, _ = self.get_profile()
+        second, response = self.get_profile()
+
+        assert response.status_code == 200
+        assert first == 1
+        assert second == 0
+
+    def test_password_hash_is_not_cached(self):
+        self.authenticate(self.user)
+        self.get_profile()
+
+        cached = cache.get(auth_user_cache_key(self.user.pk))
+        assert cached.pk == self.user.pk
+        assert 'password' in cached.get_deferred_fields()
+        assert 'password' not in cached.__dict__
+
+    def test_token_carries_role_claims(self):
+        employee = User.objects.create_user(
+            email="employee@example.com", username="employee", password="password", role='EMPLOYEE'
+        )
+        token = self.authenticate(employee)
+
+        assert token['role'] == 'EMPLOYEE'
+        assert token['employee_profile_id'] == employee.employee_profile.id
+        assert token['ver'] == employee.token_version
+
+    def test_user_save_invalidates_cache(self):
+        self.authenticate(self.user)
+        self.get_profile()
+
+        self.client.patch(self.url, {'username': 'renamed'})
+        queries, response = self.get_profile()
+
+        assert queries == 1
+        assert response.data['username'] == 'renamed'
+
+    def test_password_change_revokes_tokens(self):
+        self.authenticate(self.user)
+        self.get_profile()
+
+        self.user.change_password("new-password")
+        _, response = self.get_profile()
+
+        assert response.status_code == 401
+
+        self.authenticate(self.user)
+        _, response = self.get_profile()
+        assert response.status_code == 200
+
+    def test_admin_password_reset_revokes_tokens(self):
+        self.authenticate(self.user)
+        self.get_profile()
+
+        form = CustomAdminPasswordChangeForm(self.user, {
+            'password1': 'another-password-42', 'password2': 'another-password-42', 'usable_password': 'true',
+        })
+        assert form.is_valid(), form.errors
+        form.save()
+        _, response = self.get_profile()
+
+        assert response.status_code == 401
+        assert User.objects.get(pk=self.user.pk).check_password('another-password-42')
+
+    def test_login_hash_upgrade_keeps_token_valid(self):
+        # An outdated hash is re-hashed by check_password during login
+        User.objects.filter(pk=self.user.pk).update(
+            password=PBKDF2PasswordHasher().encode('password', 'oldsalt', iterations=1000)
+        )
+
+        response = self.client.post(reverse('login'), {'email': self.user.email, 'password': 'password'})
+        assert response.status_code == 200
+        assert '$1000$' not in User.objects.get(pk=self.user.pk).password
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        _, response = self.get_profile()
+        assert response.status_code == 200
@@ -0,0 +1,70 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.backends.sqlite3 import base as sqlite_base
+from django.urls import reverse
+from rest_framework.test import APIClient
+from saloon_core.db_pool import InstrumentedConnectionMixin, pool_stats, reset_pool_stats
+
+User = get_user_model()
+
+class InstrumentedSQLite(InstrumentedConnectionMixin, sqlite_base.DatabaseWrapper):
+    pass
+
+def probe(name):
+    """A second, instrumented connection recorded under the 'default' alias."""
+    return InstrumentedSQLite({**connections['default'].settings_dict, 'NAME': str(name)}, alias='default')
+
+@pytest.mark.django_db
+class TestConnectionStats:
+    def test_acquire_and_release_are_counted(self, tmp_path):
+        reset_pool_stats()
+        before = pool_stats()['default']
+        wrapper = probe(tmp_path / 'probe.sqlite3')
+
+        wrapper.ensure_connection()
+        wrapper.ensure_connection()  # Reused, not acquired again
+        held = pool_stats()['default']
+        assert held['acquired'] == before['acquired'] + 1
+        assert held['in_use'] == before['in_use'] + 1
+        assert held['peak_in_use'] >= held['in_use']
+        assert held['acquire_ms']['mean'] is not None
+        assert held['acquire_ms']['p95'] <= held['acquire_ms']['max']
+
+        wrapper.close()
+        released = pool_stats()['default']
+        assert released['in_use'] == before['in_use']
+        assert released['waiting'] == 0
+
+    def test_failed_acquire(self):
+        reset_pool_stats()
+        wrapper = probe('/nonexistent/dir/db.sqlite3')
+        with pytest.raises(Exception):
+            wrapper.ensure_connection()
+        stats = pool_stats()['default']
+        assert stats['failed'] == 1
+        assert stats['waiting'] == 0
+
+@pytest.mark.django_db
+class TestDbPoolStatsApi:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('db-pool-stats')
+
+    def test_admin_only(self):
+        customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password", role='CUSTOMER'
+        )
+        self.client.force_authenticate(user=customer)
+        assert self.client.get(self.url).status_code == 403
+
+    def test_reports_every_alias(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(self.url)
+        assert response.status_code == 200
+        default = response.data['databases']['default']
+        assert default['mode'] in ('pooled', 'persistent', 'per-request')
+        assert {'in_use', 'waiting', 'acquire_ms'} <= set(default)
@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.models import OutboxEmail
+from accounts.outbox import queue_email, send_outbox_batch, MAX_ATTEMPTS
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_registration_only_queues_email(self):
+        payload = {
+            "email": "new@example.com",
+            "password": "strongpassword123",
+            "username": "new",
+            "phone_number": "5550001"
+        }
+        response = self.client.post(reverse('register'), payload)
+
+        assert response.status_code == 201
+        assert len(mail.outbox) == 0
+        queued = OutboxEmail.objects.get()
+        assert queued.to == ["new@example.com"]
+        assert queued.status == 'PENDING'
+
+    def test_worker_sends_batch(self):
+        for i in range(3):
+            queue_email("Hello", "Body", [f"user{i}@example.com"])
+
+        call_command('send_outbox', batch_size=2)
+
+        assert len(mail.outbox) == 3
+        assert OutboxEmail.objects.filter(status='SENT').count() == 3
+
+    def test_failure_is_retried_with_backoff(self):
+        queued = queue_email("Hello", "Body", ["user@example.com"])
+
+        with patch('accounts.outbox.EmailMessage.send', side_effect=OSError("SMTP down")):
+            assert send_outbox_batch() == (0, 1)
+
+        queued.refresh_from_db()
+        assert queued.status == 'PENDING'
+        assert queued.attempts == 1
+        assert queued.next_attempt_at > timezone.now()
+        # Not due yet, so the next batch skips it
+        assert send_outbox_batch() == (0, 0)
+
+    def test_gives_up_after_max_attempts(self):
+        queued = queue_email("Hello", "Body", ["user@example.com"])
+        OutboxEmail.objects.filter(pk=queued.pk).update(attempts=MAX_ATTEMPTS - 1)
+
+        with patch('accounts.outbox.EmailMessage.send', side_effect=OSError("SMTP down")):
+            send_outbox_batch()
+
+        queued.refresh_from_db()
+        assert queued.status == 'FAILED'
+
+    def test_otp_mail_expires_with_the_code(self):
+        self.client.post(reverse('register'), {
+            "email": "new@example.com", "password": "strongpassword123", "username": "new", "phone_number": "5550001"
+        })
+        queued = OutboxEmail.objects.get()
+        assert queued.expires_at is not None
+        OutboxEmail.objects.filter(pk=queued.pk).update(expires_at=timezone.now())
+
+        assert send_outbox_batch() == (0, 1)
+        assert len(mail.outbox) == 0
+        queued.refresh_from_db()
+        assert (queued.status, queued.last_error) == ('FAILED', "Expired before delivery")
+
+    def test_no_retry_past_expiry(self):
+        queued = queue_email("Code", "1234", ["user@example.com"], max_age=60)
+        OutboxEmail.objects.filter(pk=queued.pk).update(attempts=1)
+
+        # The next backoff (60s) would land after the code expired
+        with patch('accounts.outbox.EmailMessage.send', side_effect=OSError("SMTP down")):
+            send_outbox_batch()
+
+        queued.refresh_from_db()
+        assert queued.status == 'FAILED'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_sends_outside_the_claiming_transaction(self):
+        queued = queue_email("Hello", "Body", ["user@example.com"])
+        seen = []
+
+        def send(message):
+            seen.append((connection.in_atomic_block, OutboxEmail.objects.get(pk=queued.pk).status))
+            return 1
+
+        with patch('accounts.outbox.EmailMessage.send', autospec=True, side_effect=send):
+            assert send_outbox_batch() == (1, 0)
+
+        assert seen == [(False, 'SENDING')]
+        queued.refresh_from_db()
+        assert queued.status == 'SENT'
+
+    def test_lapsed_lease_is_reclaimed(self):
+        stuck = queue_email("Stuck", "Body", ["stuck@example.com"])
+        leased = queue_email("Leased", "Body", ["leased@example.com"])
+        OutboxEmail.objects.filter(pk=stuck.pk).update(status='SENDING', next_attempt_at=timezone.now() - timedelta(seconds=1))
+        OutboxEmail.objects.filter(pk=leased.pk).update(status='SENDING', next_attempt_at=timezone.now() + timedelta(minutes=5))
+
+        assert send_outbox_batch() == (1, 0)
+        assert [m.to for m in mail.outbox] == [["stuck@example.com"]]
+        assert OutboxEmail.objects.get(pk=leased.pk).status == 'SENDING'
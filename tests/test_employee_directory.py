@@ -0,0 +1,67 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestPublicDirectory:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('employee-list')
+        user = User.objects.create_user(
+            email="stylist@example.com", username="stylist", password="password", role='EMPLOYEE'
+        )
+        self.profile = user.employee_profile
+
+    def test_cached_hit_does_no_queries(self):
+        first = self.client.get(self.url)
+        assert first.status_code == 200
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.url)
+
+        assert len(ctx) == 0
+        assert second.content == first.content
+
+    def test_only_public_fields_are_exposed(self):
+        response = self.client.get(self.url)
+
+        entry = response.json()[0]
+        assert entry['username'] == 'stylist'
+        for private in ('wallet_balance', 'commission_rate', 'email', 'phone_number'):
+            assert private not in entry
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_profile_save_invalidates(self, django_capture_on_commit_callbacks):
+        etag = self.client.get(self.url)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.profile.job_title = "Master Barber"
+            self.profile.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()[0]['job_title'] == "Master Barber"
+
+    def test_detail_served_from_directory(self):
+        url = reverse('employee-detail', args=[self.profile.pk])
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+
+        assert len(ctx) == 0
+        assert response.json()['id'] == self.profile.pk
+        assert self.client.get(reverse('employee-detail', args=[999])).status_code == 404
@@ -0,0 +1,45 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.models import Attendance
+
+User = get_user_model()
+
+def with_attendance(profiles):
+    Attendance.objects.bulk_create(Attendance(employee=profile) for profile in profiles)
+
+@pytest.mark.django_db
+class TestEmployeeListQueries:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('employee-list')
+        # Staff see the live serializer (anonymous reads are cached)
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        assert response.status_code == 200
+        return ctx, response
+
+    def test_query_count_is_constant(self, create_employees):
+        with_attendance(create_employees(0, 2))
+        few, _ = self.count_queries()
+
+        with_attendance(create_employees(2, 8))
+        many, response = self.count_queries()
+
+        assert len(response.data) == 10
+        assert len(many) == len(few)
+
+    def test_attendance_today_is_serialized(self, create_employees):
+        with_attendance(create_employees(0, 1))
+        _, response = self.count_queries()
+
+        assert response.data[0]['attendance_today'] is not None
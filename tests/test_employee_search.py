@@ -0,0 +1,53 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.urls import reverse
+
+User = get_user_model()
+
+def create_stylist(username, **profile_fields):
+    user = User.objects.create_user(
+        email=f"{username}@example.com",
+        username=username,
+        password="password",
+        role='EMPLOYEE'
+    )
+    profile = user.employee_profile
+    for attr, value in profile_fields.items():
+        setattr(profile, attr, value)
+    profile.save()
+    return profile
+
+@pytest.mark.django_db
+class TestEmployeeSearch:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('employee-list')
+
+    def test_search_ranks_best_match_first(self):
+        create_stylist("alex", job_title="Colorist", expertise="Balayage")
+        create_stylist("sam", job_title="Barber", expertise="Skin fade", bio="Fade specialist")
+        create_stylist("ria", job_title="Barber", expertise="Fade")
+
+        response = self.client.get(self.url, {'search': 'fade specialist'})
+
+        assert response.status_code == 200
+        assert [e['username'] for e in response.data] == ['sam', 'ria']
+
+    def test_search_matches_username(self):
+        create_stylist("jordan")
+        create_stylist("casey")
+
+        response = self.client.get(self.url, {'search': 'jord'})
+
+        assert [e['username'] for e in response.data] == ['jordan']
+
+    def test_pagination_is_opt_in(self):
+        for i in range(3):
+            create_stylist(f"barber{i}", job_title="Barber")
+
+        response = self.client.get(self.url, {'search': 'barber', 'page_size': 2})
+
+        assert response.data['count'] == 3
+        assert len(response.data['results']) == 2
+        assert response.data['next'] is not None
@@ -0,0 +1,93 @@
+import time
+import datetime
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.core.cache import cache
+from google.auth import crypt, jwt
+from google.oauth2 import id_token
+from accounts.google_certs import GoogleCertCache, CachedCertsRequest, CERTS_CACHE_KEY, MIN_MAX_AGE
+
+AUDIENCE = 'test-client-id'
+
+def make_key_set():
+    """Local stand-in for Google's certs endpoint: one RSA key + self-signed cert."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'test')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    certs = {'kid1': cert.public_bytes(serialization.Encoding.PEM).decode()}
+    return crypt.RSASigner.from_string(key_pem, key_id='kid1'), certs
+
+def make_token(signer, email='googleuser@example.com'):
+    now = int(time.time())
+    payload = {'iss': 'accounts.google.com', 'aud': AUDIENCE, 'email': email, 'iat': now, 'exp': now + 300}
+    return jwt.encode(signer, payload)
+
+class CountingFetcher:
+    def __init__(self, certs, max_age=3600):
+        self.certs = certs
+        self.max_age = max_age
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        return self.certs, self.max_age
+
+class TestGoogleCertCache:
+    def setup_method(self):
+        cache.clear()
+        self.signer, certs = make_key_set()
+        self.fetcher = CountingFetcher(certs)
+        self.cert_cache = GoogleCertCache(fetcher=self.fetcher)
+        self.request = CachedCertsRequest(self.cert_cache)
+
+    def test_verifies_with_one_fetch(self):
+        for _ in range(3):
+            info = id_token.verify_oauth2_token(make_token(self.signer), self.request, AUDIENCE)
+            assert info['email'] == 'googleuser@example.com'
+
+        assert self.fetcher.calls == 1
+
+    def test_refetches_after_max_age(self):
+        self.cert_cache.get_certs()
+        entry = cache.get(CERTS_CACHE_KEY)
+        cache.set(CERTS_CACHE_KEY, {**entry, 'expires_at': time.time() - 1})
+
+        self.cert_cache.get_certs()
+
+        assert self.fetcher.calls == 2
+
+    def test_refreshes_in_background_before_expiry(self):
+        self.cert_cache.get_certs()
+        entry = cache.get(CERTS_CACHE_KEY)
+        cache.set(CERTS_CACHE_KEY, {**entry, 'expires_at': time.time() + 10})
+
+        assert self.cert_cache.get_certs() == self.fetcher.certs
+        self.cert_cache._refresh_thread.join(timeout=5)
+
+        assert self.fetcher.calls == 2
+        assert cache.get(CERTS_CACHE_KEY)['expires_at'] > time.time() + 3000
+
+    @pytest.mark.parametrize('max_age', [0, 60])
+    def test_short_max_age_is_floored(self, max_age):
+        self.fetcher.max_age = max_age
+
+        for _ in range(3):
+            self.cert_cache.get_certs()
+
+        assert self.fetcher.calls == 1
+        assert self.cert_cache._refresh_thread is None
+        assert cache.get(CERTS_CACHE_KEY)['expires_at'] > time.time() + MIN_MAX_AGE - 5
@@ -0,0 +1,133 @@
+import pytest
+from io import BytesIO
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.files.storage import default_storage
+from PIL import Image
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts import images
+from accounts.models import ImageVariantJob
+from services.models import Category, Service
+
+User = get_user_model()
+
+def upload(name='photo.png', size=(1600, 1200)):
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 40, 40)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+@pytest.mark.django_db
+class TestImageVariants:
+    def setup_method(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name="Hair")
+
+    def service(self):
+        return Service.objects.create(name="Haircut", price=300, duration_minutes=30, category=self.category, image=upload())
+
+    def detail(self, service):
+        return self.client.get(reverse('service-detail', args=[service.pk])).data
+
+    def test_upload_only_queues_a_job(self):
+        service = self.service()
+
+        job = ImageVariantJob.objects.get()
+        assert (job.model_label, job.object_id, job.field_name, job.source) == ('services.service', service.pk, 'image', service.image.name)
+        assert self.detail(service)['image_variants'] == {}
+
+    def test_worker_renders_variants(self):
+        service = self.service()
+
+        call_command('process_images')
+
+        service.refresh_from_db()
+        variants = self.detail(service)['image_variants']
+        assert set(variants) == {'thumb', 'small', 'medium'}
+        assert variants['thumb']['webp'].endswith('.webp')
+        assert ImageVariantJob.objects.get().status == 'DONE'
+        with default_storage.open(service.image_variants['thumb']['jpeg']) as f:
+            assert Image.open(f).size == (128, 128)
+        with default_storage.open(service.image_variants['medium']['webp']) as f:
+            assert Image.open(f).size == (800, 600)
+
+    def test_unrelated_saves_do_not_requeue(self):
+        service = self.service()
+        call_command('process_images')
+        service.refresh_from_db()
+
+        service.price = 350
+        service.save()
+
+        assert ImageVariantJob.objects.count() == 1
+
+    def test_reupload_hides_stale_variants(self):
+        service = self.service()
+        call_command('process_images')
+        service.refresh_from_db()
+
+        service.image = upload('new.png')
+        service.save()
+
+        assert self.detail(service)['image_variants'] == {}
+        assert ImageVariantJob.objects.filter(status='PENDING').count() == 1
+
+    def test_outdated_job_renders_nothing(self):
+        service = self.service()
+        service.image = upload('new.png')
+        service.save()
+
+        call_command('process_images')
+
+        assert not default_storage.exists(images.variant_name(ImageVariantJob.objects.first().source, 'thumb', 'webp'))
+        service.refresh_from_db()
+        assert service.image_variants['source'] == service.image.name
+
+    def test_files_rendered_for_a_replaced_image_are_deleted(self, monkeypatch):
+        service = self.service()
+        render_variants = images.render_variants
+        rendered = []
+
+        def replace_while_rendering(storage, source):
+            rendered.append(render_variants(storage, source))
+            Service.objects.filter(pk=service.pk).update(image='services/other.png')
+            return rendered[-1]
+
+        monkeypatch.setattr(images, 'render_variants', replace_while_rendering)
+        call_command('process_images')
+
+        names = [name for variant, files in rendered[0].items() if variant != 'source' for name in files.values()]
+        assert len(names) == 6
+        assert not any(default_storage.exists(name) for name in names)
+        service.refresh_from_db()
+        assert service.image_variants == {}
+
+    def test_broken_image_is_retried_later(self):
+        service = Service.objects.create(
+            name="Color", price=900, duration_minutes=60, category=self.category,
+            image=SimpleUploadedFile('broken.png', b'not an image'),
+        )
+
+        call_command('process_images')
+
+        job = ImageVariantJob.objects.get()
+        assert (job.status, job.attempts) == ('PENDING', 1)
+        assert job.next_attempt_at > job.created_at
+
+    def test_profile_picture_variants_in_user_serializer(self):
+        user = User.objects.create_user(
+            email="stylist@example.com", username="stylist", password="password", role='EMPLOYEE'
+        )
+        user.profile_picture = upload('me.png', size=(400, 400))
+        user.save()
+        call_command('process_images')
+
+        self.client.force_authenticate(user=User.objects.get(pk=user.pk))
+        response = self.client.get(reverse('user-profile'))
+
+        assert response.data['profile_picture_variants']['small']['jpeg'].endswith('/media/profile_pics/variants/me_small.jpeg')
@@ -0,0 +1,90 @@
+import pytest
+from datetime import date, time
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from bookings.inventory import consume_stock
+from bookings.models import Booking
+from services.models import Category, Product, Service, ServiceProduct, StockMovement
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestStockConsumption:
+    def setup_method(self):
+        self.client = APIClient()
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+        category = Category.objects.create(name="Hair")
+        self.wash = Service.objects.create(name="Hair Wash", price=100, duration_minutes=15, category=category)
+        self.color = Service.objects.create(name="Color", price=900, duration_minutes=60, category=category)
+        self.shampoo = Product.objects.create(name="Shampoo", price=50, stock_quantity=10, low_stock_threshold=3)
+        self.dye = Product.objects.create(name="Dye", price=200, stock_quantity=1, low_stock_threshold=2)
+        self.gloves = Product.objects.create(name="Gloves", price=5, stock_quantity=100, low_stock_threshold=10)
+        ServiceProduct.objects.create(service=self.wash, product=self.shampoo, quantity=1)
+        ServiceProduct.objects.create(service=self.color, product=self.shampoo, quantity=2)
+        ServiceProduct.objects.create(service=self.color, product=self.dye, quantity=2)
+
+    def booking(self, *services):
+        booking = Booking.objects.create(booking_date=date(2025, 1, 1), booking_time=time(10, 0), status='IN_PROGRESS')
+        for service in services:
+            booking.items.create(service=service, price=service.price)
+        return booking
+
+    def stock(self, product):
+        product.refresh_from_db()
+        return product.stock_quantity
+
+    def consume(self, booking):
+        with CaptureQueriesContext(connection) as ctx:
+            updated = consume_stock(booking)
+        return len(ctx), updated
+
+    def test_completion_decrements_set_based(self):
+        few, _ = self.consume(self.booking(self.wash))
+        self.shampoo.stock_quantity = 10
+        self.shampoo.save()
+
+        many, updated = self.consume(self.booking(self.wash, self.wash, self.color))
+
+        assert many == few
+        assert updated == 2
+        assert self.stock(self.shampoo) == 6  # 1 + 1 + 2
+        assert self.stock(self.dye) == 0  # Floored, not negative
+        assert self.stock(self.gloves) == 100
+
+    def test_finish_job_consumes_stock(self):
+        booking = self.booking(self.wash)
+
+        assert self.client.post(reverse('finish-job', args=[booking.pk])).status_code == 200
+
+        assert self.stock(self.shampoo) == 9
+
+    def test_booking_without_bom_is_a_no_op(self):
+        ServiceProduct.objects.all().delete()
+
+        assert consume_stock(self.booking(self.wash)) == 0
+
+    def test_consumption_is_logged(self):
+        booking = self.booking(self.wash, self.color)
+        consume_stock(booking)
+
+        movements = {m.product_id: (m.change, m.reason, m.reference) for m in StockMovement.objects.all()}
+        assert movements == {
+            self.shampoo.id: (-3, 'CONSUMPTION', f'booking:{booking.pk}'),
+            self.dye.id: (-1, 'CONSUMPTION', f'booking:{booking.pk}'),  # Only 1 in stock
+        }
+        # Starting stock plus the ledger gives the stock on hand
+        assert (self.stock(self.shampoo), self.stock(self.dye)) == (10 - 3, 1 - 1)
+
+    def test_low_stock_endpoint(self):
+        self.shampoo.stock_quantity = 3
+        self.shampoo.save()
+
+        response = self.client.get(reverse('product-low-stock'))
+
+        assert [p['name'] for p in response.data] == ['Dye', 'Shampoo']
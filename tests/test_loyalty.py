@@ -0,0 +1,72 @@
+import pytest
+from datetime import date, time
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.loyalty import POINTS_PER_VISIT, tier_for
+from accounts.models import CustomerProfile
+from bookings.models import Booking
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestLoyalty:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password", role='CUSTOMER'
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def book(self, status='IN_PROGRESS', hour=10, customer=None):
+        return Booking.objects.create(
+            customer=customer or self.customer, booking_date=date(2025, 1, 1),
+            booking_time=time(hour, 0), status=status
+        )
+
+    def profile(self):
+        return CustomerProfile.objects.get(user=self.customer)
+
+    def test_tier_thresholds(self):
+        assert [tier_for(p) for p in (0, 199, 200, 499, 500)] == ['Silver', 'Silver', 'Gold', 'Gold', 'Platinum']
+
+    def test_finish_job_awards_points(self):
+        booking = self.book()
+
+        response = self.client.post(reverse('finish-job', args=[booking.pk]))
+
+        assert response.status_code == 200
+        assert self.profile().points == POINTS_PER_VISIT
+        # Not in progress any more: no second award
+        self.client.post(reverse('finish-job', args=[booking.pk]))
+        assert self.profile().points == POINTS_PER_VISIT
+
+    def test_tier_crossing_on_completion(self):
+        CustomerProfile.objects.filter(user=self.customer).update(points=195)
+        booking = self.book(status='CONFIRMED')
+
+        self.client.patch(reverse('booking-detail', args=[booking.pk]), {'status': 'COMPLETED'}, format='json')
+        self.client.patch(reverse('booking-detail', args=[booking.pk]), {'status': 'COMPLETED'}, format='json')
+
+        profile = self.profile()
+        assert (profile.points, profile.tier) == (205, 'Gold')
+
+    def test_guest_bookings_are_ignored(self):
+        booking = Booking.objects.create(booking_date=date(2025, 1, 1), booking_time=time(10, 0), status='IN_PROGRESS')
+
+        assert self.client.post(reverse('finish-job', args=[booking.pk])).status_code == 200
+
+    def test_recompute_command(self):
+        for hour in range(9, 12):
+            self.book(status='COMPLETED', hour=hour)
+        self.book(status='CANCELLED', hour=13)
+        CustomerProfile.objects.filter(user=self.customer).update(points=999, tier='Platinum')
+
+        call_command('recompute_loyalty')
+
+        profile = self.profile()
+        assert (profile.points, profile.tier) == (3 * POINTS_PER_VISIT, 'Silver')
@@ -0,0 +1,101 @@
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts import payroll
+from accounts.models import Attendance, EmployeeProfile, Payroll, PayrollRun
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestGeneratePayroll:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('payroll-generate')
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+
+    def generate(self, month='2025-03-01'):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, {'month': month}, format='json')
+        return len(ctx), response
+
+    def test_components_and_wallet_payout(self, create_employees):
+        create_employees(0, 1)
+        profile = EmployeeProfile.objects.get()
+        Attendance.objects.create(employee=profile, date=date(2025, 3, 3), check_in=time(9, 30), is_late=True)
+        Attendance.objects.create(employee=profile, date=date(2025, 4, 1), check_in=time(9, 30), is_late=True)
+
+        _, response = self.generate()
+
+        assert response.status_code == 200
+        assert response.data['run']['status'] == 'COMPLETED'
+        payroll = Payroll.objects.get()
+        assert payroll.month == date(2025, 3, 1)
+        assert (payroll.commission_earned, payroll.deductions, payroll.total_salary) == (
+            Decimal('200.00'), Decimal('100.00'), Decimal('15100.00')
+        )
+        profile.refresh_from_db()
+        assert profile.wallet_balance == 0
+
+    def test_query_count_independent_of_staff_size(self, create_employees):
+        create_employees(0, 2)
+        few, _ = self.generate('2025-03-01')
+
+        create_employees(2, 8)
+        many, response = self.generate('2025-04-01')
+
+        assert response.data['run']['generated'] == 10
+        assert many == few
+
+    def test_rerun_is_a_no_op(self, create_employees):
+        create_employees(0, 2)
+        self.generate()
+        EmployeeProfile.objects.update(wallet_balance=Decimal('50.00'))
+
+        _, response = self.generate()
+
+        assert response.data['run']['generated'] == 0
+        assert Payroll.objects.count() == 2
+        assert all(p.wallet_balance == Decimal('50.00') for p in EmployeeProfile.objects.all())
+
+    def test_overlapping_insert_is_not_counted(self, monkeypatch, create_employees):
+        first, _ = create_employees(0, 2)
+        late_counts = payroll.late_counts
+
+        def insert_concurrently(month, ids):
+            # Another run inserts after this chunk checked for existing payrolls
+            Payroll.objects.create(employee=first, month=month, base_salary=0, commission_earned=0,
+                                   deductions=0, total_salary=0)
+            return late_counts(month, ids)
+
+        monkeypatch.setattr(payroll, 'late_counts', insert_concurrently)
+        _, response = self.generate()
+
+        assert response.data['run']['generated'] == 1
+        assert Payroll.objects.count() == 2
+        # Only the row this run inserted pays out its wallet
+        assert [p.wallet_balance for p in EmployeeProfile.objects.order_by('id')] == [Decimal('200.00'), 0]
+
+    def test_large_staff_is_queued_and_resumable(self, settings, create_employees):
+        settings.PAYROLL_INLINE_LIMIT = 2
+        settings.PAYROLL_CHUNK_SIZE = 2
+        create_employees(0, 5)
+
+        _, response = self.generate()
+        assert response.status_code == 202
+        run_id = response.data['run']['id']
+        assert Payroll.objects.count() == 0
+
+        call_command('process_payroll_runs')
+
+        status = self.client.get(reverse('payroll-run', args=[run_id])).data
+        assert (status['status'], status['processed'], status['generated'], status['progress']) == ('COMPLETED', 5, 5, 100)
+        assert PayrollRun.objects.get().last_employee_id == EmployeeProfile.objects.order_by('-id').first().id
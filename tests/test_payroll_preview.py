@@ -0,0 +1,96 @@
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.models import Attendance, EmployeeProfile, Payroll
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestPayrollPreview:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('payroll-preview')
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin)
+
+    def preview(self, month='2025-03'):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'month': month})
+        return len(ctx), response
+
+    def test_matches_generation_without_writing(self, create_employees):
+        create_employees(0, 1)
+        profile = EmployeeProfile.objects.get()
+        Attendance.objects.create(employee=profile, date=date(2025, 3, 3), check_in=time(9, 30), is_late=True)
+        Attendance.objects.create(employee=profile, date=date(2025, 4, 1), check_in=time(9, 30), is_late=True)
+
+        _, response = self.preview()
+
+        assert response.status_code == 200
+        row = response.data['employees'][0]
+        assert (row['late_count'], row['deductions'], row['total_salary']) == (1, Decimal('100'), Decimal('15100.00'))
+        assert row['already_generated'] is False
+        assert response.data['totals']['total_salary'] == Decimal('15100.00')
+        assert not Payroll.objects.exists()
+
+    def test_single_query_and_cached(self, create_employees):
+        create_employees(0, 2)
+        few, _ = self.preview()
+        cache.clear()
+        create_employees(2, 8)
+        many, response = self.preview()
+        cached, _ = self.preview()
+
+        assert len(response.data['employees']) == 10
+        assert many == few
+        assert cached < many
+
+    def test_attendance_change_invalidates(self, django_capture_on_commit_callbacks, create_employees):
+        create_employees(0, 1)
+        profile = EmployeeProfile.objects.get()
+        self.preview()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Attendance.objects.create(employee=profile, date=date(2025, 3, 4), check_in=time(9, 30), is_late=True)
+        _, response = self.preview()
+
+        assert response.data['employees'][0]['late_count'] == 1
+
+    def test_commission_change_invalidates(self, django_capture_on_commit_callbacks, create_employees):
+        create_employees(0, 1)
+        self.preview()
+
+        profile = EmployeeProfile.objects.get()
+        profile.wallet_balance = Decimal('500.00')
+        with django_capture_on_commit_callbacks(execute=True):
+            profile.save()
+        _, response = self.preview()
+
+        assert response.data['employees'][0]['commission'] == Decimal('500.00')
+
+    def test_generated_employees_excluded_from_totals(self, django_capture_on_commit_callbacks, create_employees):
+        create_employees(0, 2)
+        with django_capture_on_commit_callbacks(execute=True):
+            self.client.post(reverse('payroll-generate'), {'month': '2025-03-01'}, format='json')
+
+        _, response = self.preview()
+
+        assert all(row['already_generated'] for row in response.data['employees'])
+        assert response.data['totals']['total_salary'] == 0
+
+    def test_bad_month_and_non_admin(self):
+        assert self.preview('2025-13')[1].status_code == 400
+        customer = User.objects.create_user(
+            email="c@example.com", username="c", password="password", role='CUSTOMER'
+        )
+        self.client.force_authenticate(user=customer)
+        assert self.preview()[1].status_code == 403
@@ -0,0 +1,76 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+
+User = get_user_model()
+
+def profile_updates(ctx, table):
+    return [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(f'UPDATE "{table}"')]
+
+@pytest.mark.django_db
+class TestProfileWriteElision:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_last_login_does_not_touch_employee_profile(self):
+        user = User.objects.create_user(
+            email="employee@example.com", username="employee", password="password", role='EMPLOYEE'
+        )
+        user = User.objects.select_related('employee_profile').get(pk=user.pk)
+
+        with CaptureQueriesContext(connection) as ctx:
+            update_last_login(None, user)
+
+        assert len(ctx) == 1
+        assert profile_updates(ctx, 'accounts_employeeprofile') == []
+
+    def test_registration_verify_does_not_touch_customer_profile(self):
+        user = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password",
+            role='CUSTOMER', is_active=False
+        )
+        cache.set(f"reg_otp_{user.id}", "1234")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('register-verify'), {"email": user.email, "otp": "1234"})
+
+        assert response.status_code == 200
+        assert profile_updates(ctx, 'accounts_customerprofile') == []
+
+    def test_profile_patch_writes_only_changed_columns(self):
+        user = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password",
+            role='CUSTOMER', is_email_verified=True
+        )
+        self.client.force_authenticate(user=User.objects.select_related('customer_profile').get(pk=user.pk))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(reverse('user-profile'), {'username': 'renamed'})
+        assert response.status_code == 200
+        assert profile_updates(ctx, 'accounts_customerprofile') == []
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(reverse('user-profile'), {'bio': 'Likes fades'})
+        updates = profile_updates(ctx, 'accounts_customerprofile')
+        assert response.data['bio'] == 'Likes fades'
+        assert len(updates) == 1
+        assert '"bio"' in updates[0] and '"points"' not in updates[0]
+        assert profile_updates(ctx, 'accounts_user') == []
+
+    def test_edits_to_loaded_profile_are_still_persisted(self):
+        user = User.objects.create_user(
+            email="employee@example.com", username="employee", password="password", role='EMPLOYEE'
+        )
+        user = User.objects.get(pk=user.pk)
+        user.employee_profile.job_title = "Senior Stylist"
+
+        user.save()
+
+        user.employee_profile.refresh_from_db()
+        assert user.employee_profile.job_title == "Senior Stylist"
@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.tokens import HairwaysRefreshToken
+from django.urls import reverse
+from services.models import Category
+from saloon_core.db_router import REPLICA_DB_ALIAS
+
+User = get_user_model()
+
+@pytest.fixture(scope='module', autouse=True)
+def replica_alias(django_db_setup, django_db_blocker, tmp_path_factory):
+    """A second, empty SQLite database registered as the replica alias."""
+    config = connections.configure_settings({
+        'default': dict(connections.settings['default']),
+        REPLICA_DB_ALIAS: {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(tmp_path_factory.mktemp('replica') / 'replica.sqlite3'),
+        },
+    })
+    connections.settings[REPLICA_DB_ALIAS] = config[REPLICA_DB_ALIAS]
+    with django_db_blocker.unblock():
+        call_command('migrate', database=REPLICA_DB_ALIAS, verbosity=0)
+    yield
+    connections[REPLICA_DB_ALIAS].close()
+    del connections[REPLICA_DB_ALIAS]
+    del connections.settings[REPLICA_DB_ALIAS]
+
+@pytest.fixture
+def replica():
+    cache.clear()
+    return connections[REPLICA_DB_ALIAS]
+
+def bearer(user):
+    return f'Bearer {HairwaysRefreshToken.for_user(user).access_token}'
+
+@pytest.mark.django_db(transaction=True, databases=['default', REPLICA_DB_ALIAS])
+class TestReplicaRouting:
+    def detail(self, pk):
+        return reverse('category-detail', args=[pk])
+
+    def test_safe_reads_use_replica(self, replica):
+        category = Category.objects.create(name="Hair")
+        client = APIClient()
+
+        with CaptureQueriesContext(replica) as ctx:
+            response = client.get(self.detail(category.pk))
+
+        assert response.status_code == 404  # Not replicated yet
+        assert len(ctx) > 0
+
+    def test_writes_and_read_your_writes(self, replica):
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        other = User.objects.create_user(
+            email="other@example.com", username="other", password="password", role='CUSTOMER'
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=bearer(admin))
+
+        response = client.post(reverse('category-list'), {'name': 'Hair'}, format='json')
+        assert response.status_code == 201
+        assert not Category.objects.using(REPLICA_DB_ALIAS).exists()
+
+        # The writer is pinned to the primary; everyone else reads the replica
+        assert client.get(self.detail(response.data['id'])).status_code == 200
+        client.credentials(HTTP_AUTHORIZATION=bearer(other))
+        assert client.get(self.detail(response.data['id'])).status_code == 404
+
+    def test_pin_expires(self, replica):
+        admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=bearer(admin))
+        response = client.post(reverse('category-list'), {'name': 'Hair'}, format='json')
+        cache.clear()  # Same as the pin timing out
+
+        assert client.get(self.detail(response.data['id'])).status_code == 404
+
+    def test_view_opt_out(self, replica):
+        employee = User.objects.create_user(
+            email="stylist@example.com", username="stylist", password="password", role='EMPLOYEE'
+        )
+        client = APIClient()
+        client.force_authenticate(user=employee)
+
+        with CaptureQueriesContext(replica) as ctx:
+            response = client.get(reverse('employee-dashboard'))
+
+        assert response.status_code == 200
+        assert len(ctx) == 0
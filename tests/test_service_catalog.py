@@ -0,0 +1,80 @@
+import json
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from services.models import Category, Service
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestServiceCatalog:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.hair = Category.objects.create(name="Hair")
+        self.nails = Category.objects.create(name="Nails")
+        self.cut = Service.objects.create(name="Haircut", price=300, duration_minutes=30, category=self.hair)
+        Service.objects.create(name="Old Perm", price=900, duration_minutes=90, category=self.hair, is_active=False)
+        Service.objects.create(name="Manicure", price=400, duration_minutes=45, category=self.nails)
+
+    def get(self, name, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(name), params)
+        return len(ctx), response
+
+    def test_catalog_nests_active_services(self):
+        _, response = self.get('service-catalog')
+
+        catalog = json.loads(response.content)
+        assert [c['name'] for c in catalog] == ['Hair', 'Nails']
+        assert [s['name'] for s in catalog[0]['services']] == ['Haircut']
+        assert catalog[0]['services'][0]['category_name'] == 'Hair'
+
+    def test_list_shapes_unchanged(self):
+        _, categories = self.get('category-list')
+        _, services = self.get('service-list')
+
+        assert json.loads(categories.content) == [
+            {'id': self.hair.id, 'name': 'Hair', 'image': None, 'image_variants': {}},
+            {'id': self.nails.id, 'name': 'Nails', 'image': None, 'image_variants': {}},
+        ]
+        assert [s['name'] for s in json.loads(services.content)] == ['Haircut', 'Manicure']
+
+    def test_cached_reads_do_no_queries(self):
+        first, _ = self.get('service-catalog')
+        cached, _ = self.get('service-list', category=self.nails.id)
+
+        assert first > 0
+        assert cached == 0
+
+    def test_category_filter(self):
+        _, response = self.get('service-list', category=self.hair.id)
+        assert [s['name'] for s in json.loads(response.content)] == ['Haircut']
+
+        assert self.get('service-list', category=999)[1].data == []
+        assert self.get('service-list', category='hair')[1].status_code == 400
+
+    def test_conditional_get(self):
+        _, response = self.get('service-list')
+        etag = response['ETag']
+
+        response = self.client.get(reverse('service-list'), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_change_invalidates(self, django_capture_on_commit_callbacks):
+        _, response = self.get('service-list')
+        etag = response['ETag']
+
+        self.cut.price = 350
+        with django_capture_on_commit_callbacks(execute=True):
+            self.cut.save()
+        response = self.client.get(reverse('service-list'), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert json.loads(response.content)[0]['price'] == '350.00'
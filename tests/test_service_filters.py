@@ -0,0 +1,96 @@
+import json
+import pytest
+from datetime import date, time
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from django.urls import reverse
+from bookings.models import Booking
+from services.models import Category, Service
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestServiceFilters:
+    def setup_method(self):
+        self.client = APIClient()
+        self.hair = Category.objects.create(name="Hair")
+        nails = Category.objects.create(name="Nails")
+        self.cut = Service.objects.create(name="Haircut", price=300, duration_minutes=30, category=self.hair)
+        self.color = Service.objects.create(name="Hair Color", price=1200, duration_minutes=90, category=self.hair)
+        self.mani = Service.objects.create(name="Manicure", price=400, duration_minutes=45, category=nails)
+        Service.objects.create(name="Hair Spa", price=350, duration_minutes=30, category=self.hair, is_active=False)
+
+    def names(self, **params):
+        response = self.client.get(reverse('service-list'), params)
+        assert response.status_code == 200
+        return [s['name'] for s in json.loads(response.content)]
+
+    def complete(self, *services):
+        admin = User.objects.get_or_create(email="admin@example.com", defaults={'username': 'admin', 'role': 'ADMIN'})[0]
+        self.client.force_authenticate(user=admin)
+        booking = Booking.objects.create(booking_date=date(2025, 1, 1), booking_time=time(10, Booking.objects.count()), status='IN_PROGRESS')
+        for service in services:
+            booking.items.create(service=service, price=service.price)
+        assert self.client.post(reverse('finish-job', args=[booking.pk])).status_code == 200
+        self.client.force_authenticate(user=None)
+
+    def test_price_duration_and_search(self):
+        assert self.names(min_price=350, max_price=1500) == ['Hair Color', 'Manicure']
+        assert self.names(max_duration=45, category=self.hair.id) == ['Haircut']
+        assert self.names(search='hair') == ['Haircut', 'Hair Color']
+
+    def test_ordering(self):
+        assert self.names(ordering='-price') == ['Hair Color', 'Manicure', 'Haircut']
+        assert self.names(ordering='duration') == ['Haircut', 'Manicure', 'Hair Color']
+
+    def test_popularity_counter_and_sort(self):
+        self.complete(self.mani, self.mani)
+        self.complete(self.color)
+        self.complete(self.mani)
+
+        assert self.names(ordering='-popularity') == ['Manicure', 'Hair Color', 'Haircut']
+        self.mani.refresh_from_db()
+        assert self.mani.popularity == 3
+
+    def test_recompute_command(self):
+        self.complete(self.cut)
+        Service.objects.update(popularity=50)
+
+        call_command('recompute_service_popularity')
+
+        assert dict(Service.objects.values_list('name', 'popularity')) == {
+            'Haircut': 1, 'Hair Color': 0, 'Manicure': 0, 'Hair Spa': 0,
+        }
+
+    def test_invalid_values(self):
+        response = self.client.get(reverse('service-list'), {'min_price': 'cheap'})
+        assert response.status_code == 400
+        assert 'min_price' in response.data
+
+    def test_booking_completes_once(self):
+        self.complete(self.mani)
+        booking = Booking.objects.get()
+        admin = User.objects.get(email="admin@example.com")
+        self.client.force_authenticate(user=admin)
+
+        assert self.client.post(reverse('finish-job', args=[booking.pk])).status_code == 400
+        assert self.client.patch(reverse('booking-detail', args=[booking.pk]), {'status': 'COMPLETED'}).status_code == 200
+
+        self.mani.refresh_from_db()
+        assert self.mani.popularity == 1
+
+    def test_patch_completion_is_atomic(self, monkeypatch):
+        admin = User.objects.create_user(email="admin@example.com", username="admin", password="password", role='ADMIN')
+        booking = Booking.objects.create(booking_date=date(2025, 1, 1), booking_time=time(10, 0), status='IN_PROGRESS')
+        booking.items.create(service=self.cut, price=self.cut.price)
+
+        def fail(booking):
+            raise RuntimeError("side effect failed")
+        monkeypatch.setattr('bookings.views.on_booking_completed', fail)
+        self.client.force_authenticate(user=admin)
+        with pytest.raises(RuntimeError):
+            self.client.patch(reverse('booking-detail', args=[booking.pk]), {'status': 'COMPLETED'})
+
+        booking.refresh_from_db()
+        assert booking.status == 'IN_PROGRESS'
@@ -0,0 +1,72 @@
+import pytest
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.urls import reverse
+from services.models import Product, StockMovement
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestStockLedger:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def create_product(self, name, stock, threshold=5):
+        response = self.client.post(reverse('product-list'), {
+            'name': name, 'price': '50.00', 'stock_quantity': stock, 'low_stock_threshold': threshold,
+        }, format='json')
+        assert response.status_code == 201
+        return Product.objects.get(pk=response.data['id'])
+
+    def consume(self, product, quantity, days_ago):
+        movement = StockMovement.objects.create(product=product, change=-quantity, reason='CONSUMPTION')
+        StockMovement.objects.filter(pk=movement.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+
+    def test_api_changes_are_logged(self):
+        product = self.create_product("Shampoo", 10)
+        self.client.put(reverse('product-detail', args=[product.pk]), {
+            'name': 'Shampoo', 'price': '50.00', 'stock_quantity': 7, 'low_stock_threshold': 5,
+        }, format='json')
+        response = self.client.post(reverse('product-restock', args=[product.pk]), {'quantity': 20, 'reference': 'PO-1'}, format='json')
+
+        assert response.data['stock_quantity'] == 27
+        history = self.client.get(reverse('product-movements', args=[product.pk])).data
+        assert [(m['change'], m['reason']) for m in history] == [(20, 'RESTOCK'), (-3, 'ADJUSTMENT'), (10, 'INITIAL')]
+        assert history[0]['created_by_name'] == 'admin'
+
+    def test_ledger_is_append_only(self):
+        product = self.create_product("Shampoo", 10)
+        movement = StockMovement.objects.get()
+        movement.change = 99
+
+        with pytest.raises(ValueError):
+            movement.save()
+
+    def test_forecast(self):
+        shampoo = self.create_product("Shampoo", 30, threshold=10)
+        dye = self.create_product("Dye", 6, threshold=2)
+        idle = self.create_product("Gloves", 100)
+        self.consume(shampoo, 30, days_ago=5)
+        self.consume(shampoo, 500, days_ago=40)  # Outside the window
+        self.consume(dye, 60, days_ago=1)
+
+        response = self.client.get(reverse('product-forecast'), {'days': 30})
+
+        assert response.status_code == 200
+        rows = response.data['products']
+        assert [row['name'] for row in rows] == ['Dye', 'Shampoo', 'Gloves']
+        dye_row, shampoo_row, idle_row = rows
+        assert (shampoo_row['used'], shampoo_row['daily_usage'], shampoo_row['days_until_stockout']) == (30, 1, 30)
+        assert shampoo_row['reorder_by'] == timezone.localdate() + timedelta(days=20)
+        assert (dye_row['daily_usage'], dye_row['days_until_stockout']) == (2, 3)
+        assert idle_row['days_until_stockout'] is None
+
+    def test_forecast_window_validation(self):
+        assert self.client.get(reverse('product-forecast'), {'days': 0}).status_code == 400
+        assert self.client.get(reverse('product-forecast'), {'days': 'x'}).status_code == 400
@@ -0,0 +1,101 @@
+import pytest
+import threading
+import time
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from django.urls import reverse
+from accounts.throttling import IPBucketThrottle, TokenBucketThrottle, get_throttle_metrics
+
+User = get_user_model()
+
+@pytest.fixture(autouse=True)
+def tight_rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {
+            'auth_ip': '100/min',
+            'auth_email': '2/min',
+            'auth_endpoint': '100/min',
+        },
+    }
+    yield
+    cache.clear()  # Don't leave drained buckets for other modules' logins
+
+@pytest.mark.django_db
+class TestAuthThrottling:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.login_url = reverse('login')
+
+    def test_email_bucket_returns_429_with_retry_after(self):
+        payload = {"email": "victim@example.com", "password": "wrong"}
+        for _ in range(2):
+            assert self.client.post(self.login_url, payload).status_code == 401
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.login_url, payload)
+
+        assert response.status_code == 429
+        assert int(response['Retry-After']) > 0
+        assert len(ctx) == 0
+        assert get_throttle_metrics(['auth_email']) == {'auth_email': 1}
+
+    def test_other_emails_are_unaffected(self):
+        for _ in range(3):
+            self.client.post(self.login_url, {"email": "victim@example.com", "password": "wrong"})
+
+        response = self.client.post(self.login_url, {"email": "other@example.com", "password": "wrong"})
+
+        assert response.status_code == 401
+
+    def test_spoofed_forwarded_for_shares_the_ip_bucket(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'auth_ip': '2/min'},
+        }
+        for i in range(2):
+            self.client.post(self.login_url, {"email": "x@example.com", "password": "wrong"}, HTTP_X_FORWARDED_FOR=f"10.0.0.{i}")
+
+        response = self.client.post(self.login_url, {"email": "x@example.com", "password": "wrong"}, HTTP_X_FORWARDED_FOR="10.0.0.9")
+        assert response.status_code == 429
+
+class SlowCache:
+    """Widens the read-modify-write window so a racy bucket update would let every request through."""
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get(self, *args, **kwargs):
+        value = self.cache.get(*args, **kwargs)
+        time.sleep(0.02)
+        return value
+
+    def set(self, *args, **kwargs):
+        return self.cache.set(*args, **kwargs)
+
+def test_parallel_requests_share_one_bucket(monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(TokenBucketThrottle, 'cache', SlowCache(cache))
+    throttle = IPBucketThrottle()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def take():
+        barrier.wait()
+        results.append(throttle.take_token('throttle_bucket:test:ip', 2, 2 / 60, time.time()))
+
+    threads = [threading.Thread(target=take) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(allowed for allowed, _ in results) == 2
+
+def test_default_bucket_key_is_the_client_ip():
+    request = Request(APIRequestFactory().post('/', REMOTE_ADDR='10.1.2.3', HTTP_X_FORWARDED_FOR='1.1.1.1'))
+    assert TokenBucketThrottle().get_ident_key(request, None) == '10.1.2.3'
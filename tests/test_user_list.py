@@ -0,0 +1,63 @@
+import pytest
+from urllib.parse import urlparse, parse_qs
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestUserList:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('user-list')
+        self.admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin)
+        for i in range(12):
+            User.objects.create_user(
+                email=f"customer{i}@example.com",
+                username=f"customer{i}",
+                password="password",
+                role='CUSTOMER',
+                is_email_verified=i % 2 == 0
+            )
+
+    def count_queries(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, params)
+        assert response.status_code == 200
+        return len(ctx), response
+
+    def test_query_count_independent_of_page_size(self):
+        small, _ = self.count_queries({'page_size': 2})
+        large, response = self.count_queries({'page_size': 10})
+
+        assert large == small
+        assert len(response.data['results']) == 10
+
+    def test_cursor_walks_all_users_once(self):
+        seen = []
+        params = {'page_size': 5}
+        while True:
+            response = self.client.get(self.url, params)
+            seen += [u['id'] for u in response.data['results']]
+            if not response.data['next']:
+                break
+            params = {'page_size': 5, 'cursor': parse_qs(urlparse(response.data['next']).query)['cursor'][0]}
+
+        assert len(seen) == len(set(seen)) == 13
+
+    def test_filters(self):
+        response = self.client.get(self.url, {'role': 'CUSTOMER', 'verified': 'true'})
+
+        assert len(response.data) == 6
+        assert all(u['role'] == 'CUSTOMER' for u in response.data)
+
+    def test_invalid_filter_returns_400(self):
+        response = self.client.get(self.url, {'joined_after': 'not-a-date'})
+
+        assert response.status_code == 400
@@ -0,0 +1,111 @@
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from accounts.models import EmployeeProfile
+from bookings.models import Booking, CustomerVisitSummary
+from services.models import Category, Service
+
+User = get_user_model()
+
+@pytest.mark.django_db
+class TestVisitHistory:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="password", role='ADMIN'
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password", role='CUSTOMER'
+        )
+        self.stylists = [
+            User.objects.create_user(
+                email=f"stylist{i}@example.com", username=f"stylist{i}", password="password", role='EMPLOYEE'
+            ).employee_profile
+            for i in range(2)
+        ]
+        category = Category.objects.create(name="Hair")
+        self.cut = Service.objects.create(name="Haircut", price=300, duration_minutes=30, category=category)
+        self.color = Service.objects.create(name="Color", price=900, duration_minutes=60, category=category)
+
+    def visit(self, day, stylist, service, hour=10):
+        booking = Booking.objects.create(
+            customer=self.customer, employee=stylist, booking_date=date(2025, 1, day),
+            booking_time=time(hour, 0), status='IN_PROGRESS', total_price=service.price
+        )
+        booking.items.create(service=service, price=service.price)
+        self.client.force_authenticate(user=self.admin)
+        assert self.client.post(reverse('finish-job', args=[booking.pk])).status_code == 200
+        return booking
+
+    def history(self, **params):
+        self.client.force_authenticate(user=self.customer)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('customer-history'), params)
+        return len(ctx), response
+
+    def test_summary_kept_current_on_completion(self):
+        self.visit(3, self.stylists[0], self.cut)
+        self.visit(5, self.stylists[1], self.color)
+        self.visit(4, self.stylists[1], self.cut)
+
+        summary = CustomerVisitSummary.objects.get(customer=self.customer)
+        assert (summary.visit_count, summary.lifetime_spend, summary.last_visit) == (3, Decimal('1500.00'), date(2025, 1, 5))
+        assert (summary.favorite_stylist, summary.favorite_service) == (self.stylists[1], self.cut)
+
+    def test_history_page(self):
+        for day in range(1, 6):
+            self.visit(day, self.stylists[0], self.cut)
+
+        _, response = self.history(page_size=2)
+
+        assert response.status_code == 200
+        assert response.data['summary']['visit_count'] == 5
+        assert response.data['summary']['favorite_stylist_name'] == 'stylist0'
+        assert [b['booking_date'] for b in response.data['results']] == ['2025-01-05', '2025-01-04']
+        assert response.data['results'][0]['items'][0]['service_name'] == 'Haircut'
+        assert response.data['next']
+
+    def test_query_count_independent_of_history_size(self):
+        self.visit(1, self.stylists[0], self.cut)
+        few, _ = self.history()
+        for day in range(2, 8):
+            self.visit(day, self.stylists[day % 2], self.color)
+        many, response = self.history()
+
+        assert len(response.data['results']) == 7
+        assert many == few
+
+    def test_new_customer_gets_empty_summary(self):
+        _, response = self.history()
+
+        assert response.data['summary']['visit_count'] == 0
+        assert response.data['results'] == []
+
+    def test_other_customers_need_staff(self):
+        self.visit(1, self.stylists[0], self.cut)
+
+        _, response = self.history(customer=self.admin.id)
+        assert response.status_code == 403
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('customer-history'), {'customer': self.customer.id})
+        assert response.data['summary']['visit_count'] == 1
+
+        response = self.client.get(reverse('customer-history'), {'customer': 'abc'})
+        assert response.status_code == 400
+
+    def test_rebuild_command(self):
+        self.visit(1, self.stylists[0], self.cut)
+        self.visit(2, self.stylists[0], self.color)
+        CustomerVisitSummary.objects.all().delete()
+
+        call_command('rebuild_visit_summaries')
+
+        summary = CustomerVisitSummary.objects.get(customer=self.customer)
+        assert (summary.visit_count, summary.lifetime_spend, summary.favorite_stylist) == (2, Decimal('1200.00'), self.stylists[0])